@@ -38,6 +38,21 @@ __version__ = "1.0.0"
 __author__ = "Karabük Üniversitesi - Yapay Zeka Operatörlüğü"
 __license__ = "MIT"
 
+import importlib.util as _importlib_util
+import os as _os
+
+# `src` modülleri depo kökündeki güncel `gee` paketini kullanır. Arşivdeki eski
+# `archieve/gee` kopyası sys.path'te önce gelirse aşağıdaki ImportError
+# yakalaması yüzünden sorun sessizce "modül yüklenemedi" uyarısına dönüşürdü;
+# bu yüzden yol hatası burada, açık bir mesajla yükseltilir.
+_DEPO_KOKU = _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
+_gee_spec = _importlib_util.find_spec("gee")
+if _gee_spec is None or _importlib_util.find_spec("gee.results") is None:
+    raise ImportError(
+        f"'gee' paketi {getattr(_gee_spec, 'origin', None) or 'bulunamadı'}: depo kökündeki güncel "
+        f"paket gerekli. sys.path'te '{_DEPO_KOKU}' dizinini 'archieve/' dizininden önce ekleyin."
+    )
+
 try:
     from .config import (
         ILLER, YILLAR, IL_KOORDINATLARI,
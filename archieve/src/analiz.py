@@ -4,18 +4,20 @@ Analiz Modülü
 =============
 
 Mann-Kendall trend testi, Sen's Slope ve ΔNBR analizleri için fonksiyonlar.
+
+Analizler birim (il, ilçe, meşcere) × yıl tabloları üzerinde gruplanmış,
+vektörel işlemlerle yapılır. Ara toplamlar (birim başına kayıplar, ΔNBR
+ortalaması, trend tablosu) bir kez hesaplanıp önbellekte tutulur; il bazlı
+eski yöntemler bu tablolardan satır okur.
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
-try:
-    from scipy import stats
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
+from gee.results import ResultStore
+from gee.trend import mann_kendall_batch, sens_slope
 
 from .config import ILLER, YILLAR, MANN_KENDALL_ALPHA, NBR_ESIK_DEGERLERI
 
@@ -51,10 +53,57 @@ class NBRAnalizSonuc:
     etkilenen_alan_ha: Optional[float] = None
 
 
+KAYIP_SUTUNLARI = ["yangin_kaybi", "kesim_kaybi", "maden_kaybi"]
+
+
+def _sozlukten_tablo(veri: Dict) -> pd.DataFrame:
+    """{birim: {yil: {...}}} sözlüğünden (birim, yil) indeksli tablo."""
+    kayitlar = {
+        (birim, int(yil)): deger
+        for birim, yillar in veri.items()
+        for yil, deger in yillar.items()
+    }
+    index = pd.MultiIndex.from_tuples(list(kayitlar), names=["birim", "yil"])
+    return pd.DataFrame(list(kayitlar.values()), index=index)
+
+
+def _depodan_tablo(depo: ResultStore, veri_tipi: str, ilce_bazinda: bool) -> pd.DataFrame:
+    """Uzun biçimli depodan yıllık (ay = 0) (birim, yil) indeksli tablo."""
+    df = depo.wide(veri_tipi, index=("province", "district", "year", "month"))
+    if not len(df):
+        return pd.DataFrame(index=pd.MultiIndex.from_tuples([], names=["birim", "yil"]))
+    df = df[df["month"] == 0]
+    il = df["province"].astype(str)
+    ilce = df["district"].astype(str)
+    if ilce_bazinda:
+        df = df[ilce != ""]
+        birim = il[ilce != ""] + "/" + ilce[ilce != ""]
+    else:
+        df = df[ilce == ""]
+        birim = il[ilce == ""]
+    df = df.assign(birim=birim.to_numpy(), yil=df["year"].astype(int).to_numpy())
+    return df.drop(columns=["province", "district", "year", "month"]).set_index(["birim", "yil"])
+
+
 class OrmanAnalizi:
-    """Orman değişim analizi sınıfı"""
+    """Orman değişim analizi sınıfı
+    
+    Veriler eski sözlük biçiminde (`{il: {yil: {...}}}`) veya uzun biçimli
+    bir `ResultStore` (`depo`) olarak verilebilir. Depoda ilçe/meşcere
+    satırları varsa `ilce_bazinda=True` ile birimler "İl/İlçe" olur.
+    `self.iller` raporlanan birimleri seçer; önbellekteki tablolar tüm
+    birimleri kapsadığından seçimi değiştirmek yeniden hesaplama gerektirmez.
+    Kaynak veri değiştirilirse `yenile()` çağrılmalıdır.
+    """
     
-    def __init__(self, orman_verileri: Dict, nbr_verileri: Dict, maden_verileri: Dict):
+    def __init__(
+        self,
+        orman_verileri: Optional[Dict] = None,
+        nbr_verileri: Optional[Dict] = None,
+        maden_verileri: Optional[Dict] = None,
+        depo: Optional[ResultStore] = None,
+        ilce_bazinda: bool = False,
+    ):
         """
         Analiz sınıfını başlat.
         
@@ -62,49 +111,163 @@ class OrmanAnalizi:
             orman_verileri: İl ve yıl bazında orman verileri
             nbr_verileri: İl ve yıl bazında NBR verileri
             maden_verileri: İl bazında maden verileri
+            depo: Uzun biçimli sonuç deposu (verilirse sözlükler yerine kullanılır)
+            ilce_bazinda: Depodaki ilçe/meşcere satırlarını birim olarak kullan
         """
-        self.orman_verileri = orman_verileri
-        self.nbr_verileri = nbr_verileri
-        self.maden_verileri = maden_verileri
-        self.iller = ILLER
+        self.depo = depo
+        self.ilce_bazinda = ilce_bazinda
+        if depo is not None:
+            maden_verileri = depo.nested("maden")
+        self.orman_verileri = orman_verileri or {}
+        self.nbr_verileri = nbr_verileri or {}
+        self.maden_verileri = maden_verileri or {}
         self.yillar = YILLAR
+        self._onbellek: Dict[str, object] = {}
+        if depo is not None:
+            self.iller = list(dict.fromkeys(self._tablo("orman").index.get_level_values("birim")))
+        else:
+            self.iller = ILLER
+
+    # ---- Önbellekli ara tablolar ----
+
+    def yenile(self) -> None:
+        """Önbellekteki ara tabloları siler (kaynak veri değiştiğinde)."""
+        self._onbellek.clear()
+
+    def _onbellekli(self, anahtar: str, hesapla: Callable[[], object]):
+        if anahtar not in self._onbellek:
+            self._onbellek[anahtar] = hesapla()
+        return self._onbellek[anahtar]
+
+    def _tablo(self, veri_tipi: str) -> pd.DataFrame:
+        """Tüm birimler için (birim, yil) indeksli ham tablo."""
+        def hesapla() -> pd.DataFrame:
+            if self.depo is not None:
+                return _depodan_tablo(self.depo, veri_tipi, self.ilce_bazinda)
+            veri = self.orman_verileri if veri_tipi == "orman" else self.nbr_verileri
+            return _sozlukten_tablo(veri)
+        return self._onbellekli(f"tablo:{veri_tipi}", hesapla)
+
+    def _yillik(self, veri_tipi: str) -> pd.DataFrame:
+        """Analiz yıllarıyla sınırlı tablo (yıl sırasına dizili)."""
+        yillar = tuple(self.yillar)
+        def hesapla() -> pd.DataFrame:
+            df = self._tablo(veri_tipi)
+            df = df[df.index.get_level_values("yil").isin(yillar)]
+            return df.sort_index(level="yil", sort_remaining=False, kind="stable")
+        return self._onbellekli(f"yillik:{veri_tipi}:{yillar}", hesapla)
+
+    def _kayip_toplamlari(self) -> pd.DataFrame:
+        """Birim başına yuvarlanmamış kayıp / artış toplamları."""
+        def hesapla() -> pd.DataFrame:
+            df = self._yillik("orman")
+            toplam = df[KAYIP_SUTUNLARI + ["dogal_artis"]].groupby(level="birim", sort=False).sum()
+            toplam["toplam_kayip"] = toplam[KAYIP_SUTUNLARI].sum(axis=1)
+            toplam["net_degisim"] = toplam["dogal_artis"] - toplam["toplam_kayip"]
+            return toplam
+        return self._onbellekli(f"kayip_toplam:{tuple(self.yillar)}", hesapla)
+
+    def kayip_tablosu(self) -> pd.DataFrame:
+        """Tüm birimler için kayıp analizi tablosu (birim indeksli)."""
+        def hesapla() -> pd.DataFrame:
+            t = self._kayip_toplamlari()
+            oran = t[KAYIP_SUTUNLARI].div(t["toplam_kayip"], axis=0) * 100
+            out = t[["yangin_kaybi", "kesim_kaybi", "maden_kaybi", "dogal_artis", "toplam_kayip", "net_degisim"]].round(2)
+            out["yangin_orani"] = oran["yangin_kaybi"].round(1)
+            out["kesim_orani"] = oran["kesim_kaybi"].round(1)
+            out["maden_orani"] = oran["maden_kaybi"].round(1)
+            return out
+        return self._onbellekli(f"kayip:{tuple(self.yillar)}", hesapla)
+
+    def _maden_etkisi(self, birimler: pd.Index) -> np.ndarray:
+        """Birim başına maden etki alanı (ilçe birimlerinde il değeri kullanılır)."""
+        def etki(birim: str) -> float:
+            veri = self.maden_verileri.get(birim) or self.maden_verileri.get(birim.split("/")[0])
+            return float(veri["etki_alani_ha"]) if veri else np.nan
+        return np.array([etki(b) for b in birimler], dtype=float)
+
+    def risk_tablosu(self) -> pd.DataFrame:
+        """Tüm birimler için bileşik yangın riski tablosu (birim indeksli).
         
-    def mann_kendall_testi(self, veri_serisi: List[float], alpha: float = MANN_KENDALL_ALPHA) -> MannKendallSonuc:
+        Kayıp faktörü, toplam kaybın analiz döneminin ilk yılındaki orman
+        alanına oranıdır.
+        """
+        def hesapla() -> pd.DataFrame:
+            nbr = self._yillik("nbr")["delta_nbr"].groupby(level="birim", sort=False).mean()
+            kayip = self._kayip_toplamlari()
+            orman = self._yillik("orman")["toplam_alan"]
+            baz_alan = orman.xs(self.yillar[0], level="yil")
+            birimler = kayip.index
+            nbr = nbr.reindex(birimler).to_numpy()
+            kayip_orani = (kayip["toplam_kayip"] / baz_alan.reindex(birimler)).to_numpy()
+            maden = self._maden_etkisi(birimler) / 10000  # Normalize
+            
+            # Bileşik risk skoru (0-1 arası)
+            skor = (
+                0.4 * np.minimum(nbr / 0.66, 1) +        # NBR etkisi
+                0.4 * np.minimum(kayip_orani * 10, 1) +  # Kayıp etkisi
+                0.2 * np.minimum(maden, 1)               # Maden etkisi
+            )
+            seviye = np.select([skor > 0.7, skor > 0.5], ["YÜKSEK", "ORTA"], default="DÜŞÜK")
+            return pd.DataFrame(
+                {
+                    "risk_skoru": np.round(skor, 3),
+                    "risk_seviyesi": seviye,
+                    "nbr_faktoru": np.round(nbr, 4),
+                    "kayip_faktoru": np.round(kayip_orani, 4),
+                    "maden_faktoru": np.round(maden, 4),
+                },
+                index=birimler,
+            )
+        return self._onbellekli(f"risk:{tuple(self.yillar)}", hesapla)
+
+    def trend_tablosu(self, alpha: float = MANN_KENDALL_ALPHA, yontem: str = "tie") -> pd.DataFrame:
+        """Tüm birimlerin orman alanı serileri için tek çağrıda Mann-Kendall + Sen's slope."""
+        def hesapla() -> pd.DataFrame:
+            seriler = self._yillik("orman")["toplam_alan"].unstack("yil").reindex(columns=list(self.yillar))
+            sonuc = mann_kendall_batch(seriler.to_numpy(dtype=float), alpha=alpha, method=yontem)
+            z = sonuc["Z"]
+            return pd.DataFrame(
+                {
+                    "s_istatistik": sonuc["S"].astype(float),
+                    "z_istatistik": z,
+                    "p_degeri": sonuc["p"],
+                    "sens_slope": sonuc["slope"],
+                    "trend_yonu": np.select([z > 0, z < 0], ["Artış ↑", "Azalış ↓"], default="Değişim Yok"),
+                    "anlamli_mi": sonuc["p"] < alpha,
+                },
+                index=seriler.index,
+            )
+        return self._onbellekli(f"trend:{tuple(self.yillar)}:{alpha}:{yontem}", hesapla)
+
+    def _secili(self, tablo: pd.DataFrame) -> pd.DataFrame:
+        """Tablonun `self.iller` birimlerine ait satırları (bu sırayla)."""
+        return tablo.loc[list(self.iller)]
+
+    # ---- Testler ----
+        
+    def mann_kendall_testi(
+        self,
+        veri_serisi: List[float],
+        alpha: float = MANN_KENDALL_ALPHA,
+        yontem: str = "tie",
+    ) -> MannKendallSonuc:
         """
         Mann-Kendall trend testi uygula.
         
         Args:
             veri_serisi: Zaman serisi verileri
             alpha: Anlamlılık düzeyi
+            yontem: Varyans düzeltmesi ("original", "tie", "hamed_rao", "yue_wang")
             
         Returns:
             MannKendallSonuc: Test sonuçları
         """
-        n = len(veri_serisi)
-        
-        # S istatistiği hesapla
-        s = 0
-        for i in range(n - 1):
-            for j in range(i + 1, n):
-                s += np.sign(veri_serisi[j] - veri_serisi[i])
-        
-        # Varyans hesapla
-        var_s = n * (n - 1) * (2 * n + 5) / 18
-        
-        # Z istatistiği
-        if s > 0:
-            z = (s - 1) / np.sqrt(var_s)
-        elif s < 0:
-            z = (s + 1) / np.sqrt(var_s)
-        else:
-            z = 0
-        
-        # p-değeri
-        if SCIPY_AVAILABLE:
-            p_value = 2 * (1 - stats.norm.cdf(abs(z)))
-        else:
-            # Basit yaklaşım
-            p_value = 0.05 if abs(z) < 1.96 else 0.01
+        # S, bağ düzeltmeli varyans, Z ve p-değeri (SciPy gerektirmez)
+        sonuc = mann_kendall_batch(np.asarray(veri_serisi, dtype=float), alpha=alpha, method=yontem)
+        s = float(sonuc["S"])
+        z = float(sonuc["Z"])
+        p_value = float(sonuc["p"])
         
         # Sen's Slope
         sens_slope = self._sens_slope_hesapla(veri_serisi)
@@ -126,25 +289,18 @@ class OrmanAnalizi:
             anlamli_mi=p_value < alpha
         )
     
-    def _sens_slope_hesapla(self, veri_serisi: List[float]) -> float:
+    def _sens_slope_hesapla(self, veri_serisi: List[float], zamanlar: Optional[List] = None) -> float:
         """
         Sen's Slope tahminini hesapla.
         
         Args:
             veri_serisi: Zaman serisi verileri
+            zamanlar: Opsiyonel (düzensiz) zaman damgaları; verilmezse 0, 1, 2, ...
             
         Returns:
             float: Medyan eğim değeri
         """
-        n = len(veri_serisi)
-        slopes = []
-        
-        for i in range(n - 1):
-            for j in range(i + 1, n):
-                slope = (veri_serisi[j] - veri_serisi[i]) / (j - i)
-                slopes.append(slope)
-        
-        return np.median(slopes)
+        return sens_slope(veri_serisi, zamanlar)
     
     def il_trend_analizi(self, il: str) -> MannKendallSonuc:
         """
@@ -156,8 +312,15 @@ class OrmanAnalizi:
         Returns:
             MannKendallSonuc: Trend analiz sonucu
         """
-        alanlar = [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar]
-        return self.mann_kendall_testi(alanlar)
+        satir = self.trend_tablosu().loc[il]
+        return MannKendallSonuc(
+            s_istatistik=float(satir["s_istatistik"]),
+            z_istatistik=float(satir["z_istatistik"]),
+            p_degeri=float(satir["p_degeri"]),
+            sens_slope=float(satir["sens_slope"]),
+            trend_yonu=str(satir["trend_yonu"]),
+            anlamli_mi=bool(satir["anlamli_mi"]),
+        )
     
     def tum_iller_trend_analizi(self) -> Dict[str, MannKendallSonuc]:
         """
@@ -166,10 +329,7 @@ class OrmanAnalizi:
         Returns:
             Dict: İl bazında trend sonuçları
         """
-        sonuclar = {}
-        for il in self.iller:
-            sonuclar[il] = self.il_trend_analizi(il)
-        return sonuclar
+        return {il: self.il_trend_analizi(il) for il in self.iller}
     
     def nbr_analizi(self, il: str, yil: int) -> NBRAnalizSonuc:
         """
@@ -182,12 +342,12 @@ class OrmanAnalizi:
         Returns:
             NBRAnalizSonuc: NBR analiz sonucu
         """
-        veri = self.nbr_verileri[il][yil]
+        veri = self._tablo("nbr").loc[(il, yil)]
         
         return NBRAnalizSonuc(
-            nbr_oncesi=veri["nbr_oncesi"],
-            nbr_sonrasi=veri["nbr_sonrasi"],
-            delta_nbr=veri["delta_nbr"],
+            nbr_oncesi=float(veri["nbr_oncesi"]),
+            nbr_sonrasi=float(veri["nbr_sonrasi"]),
+            delta_nbr=float(veri["delta_nbr"]),
             yangin_siddeti=veri["yangin_siddeti"]
         )
     
@@ -198,20 +358,17 @@ class OrmanAnalizi:
         Returns:
             pd.DataFrame: NBR özet tablosu
         """
-        rows = []
-        for il in self.iller:
-            for yil in self.yillar:
-                sonuc = self.nbr_analizi(il, yil)
-                rows.append({
-                    "İl": il,
-                    "Yıl": yil,
-                    "NBR Öncesi": sonuc.nbr_oncesi,
-                    "NBR Sonrası": sonuc.nbr_sonrasi,
-                    "ΔNBR": sonuc.delta_nbr,
-                    "Yangın Şiddeti": sonuc.yangin_siddeti
-                })
-        
-        return pd.DataFrame(rows)
+        df = self._tablo("nbr")
+        index = pd.MultiIndex.from_product([list(self.iller), list(self.yillar)], names=["birim", "yil"])
+        df = df.loc[index, ["nbr_oncesi", "nbr_sonrasi", "delta_nbr", "yangin_siddeti"]].reset_index()
+        return df.rename(columns={
+            "birim": "İl",
+            "yil": "Yıl",
+            "nbr_oncesi": "NBR Öncesi",
+            "nbr_sonrasi": "NBR Sonrası",
+            "delta_nbr": "ΔNBR",
+            "yangin_siddeti": "Yangın Şiddeti",
+        })
     
     def kayip_analizi(self, il: str) -> Dict:
         """
@@ -223,25 +380,7 @@ class OrmanAnalizi:
         Returns:
             Dict: Kayıp analiz sonuçları
         """
-        toplam_yangin = sum(self.orman_verileri[il][y]["yangin_kaybi"] for y in self.yillar)
-        toplam_kesim = sum(self.orman_verileri[il][y]["kesim_kaybi"] for y in self.yillar)
-        toplam_maden = sum(self.orman_verileri[il][y]["maden_kaybi"] for y in self.yillar)
-        toplam_artis = sum(self.orman_verileri[il][y]["dogal_artis"] for y in self.yillar)
-        
-        toplam_kayip = toplam_yangin + toplam_kesim + toplam_maden
-        net_degisim = toplam_artis - toplam_kayip
-        
-        return {
-            "yangin_kaybi": round(toplam_yangin, 2),
-            "kesim_kaybi": round(toplam_kesim, 2),
-            "maden_kaybi": round(toplam_maden, 2),
-            "dogal_artis": round(toplam_artis, 2),
-            "toplam_kayip": round(toplam_kayip, 2),
-            "net_degisim": round(net_degisim, 2),
-            "yangin_orani": round(toplam_yangin / toplam_kayip * 100, 1),
-            "kesim_orani": round(toplam_kesim / toplam_kayip * 100, 1),
-            "maden_orani": round(toplam_maden / toplam_kayip * 100, 1)
-        }
+        return {k: float(v) for k, v in self.kayip_tablosu().loc[il].items()}
     
     def bolgesel_kayip_ozeti(self) -> pd.DataFrame:
         """
@@ -250,12 +389,8 @@ class OrmanAnalizi:
         Returns:
             pd.DataFrame: Kayıp özet tablosu
         """
-        rows = []
-        for il in self.iller:
-            analiz = self.kayip_analizi(il)
-            rows.append({"İl": il, **analiz})
-        
-        return pd.DataFrame(rows)
+        df = self._secili(self.kayip_tablosu()).reset_index()
+        return df.rename(columns={"birim": "İl"})
     
     def risk_skoru_hesapla(self, il: str) -> Dict:
         """
@@ -267,39 +402,8 @@ class OrmanAnalizi:
         Returns:
             Dict: Risk skoru ve detayları
         """
-        # NBR bazlı risk
-        nbr_degerleri = [self.nbr_verileri[il][y]["delta_nbr"] for y in self.yillar]
-        ortalama_nbr = np.mean(nbr_degerleri)
-        
-        # Kayıp bazlı risk
-        kayip = self.kayip_analizi(il)
-        kayip_orani = kayip["toplam_kayip"] / self.orman_verileri[il][2020]["toplam_alan"]
-        
-        # Maden etkisi
-        maden_etkisi = self.maden_verileri[il]["etki_alani_ha"] / 10000  # Normalize
-        
-        # Bileşik risk skoru (0-1 arası)
-        risk_skoru = (
-            0.4 * min(ortalama_nbr / 0.66, 1) +  # NBR etkisi
-            0.4 * min(kayip_orani * 10, 1) +      # Kayıp etkisi
-            0.2 * min(maden_etkisi, 1)             # Maden etkisi
-        )
-        
-        # Risk seviyesi
-        if risk_skoru > 0.7:
-            risk_seviyesi = "YÜKSEK"
-        elif risk_skoru > 0.5:
-            risk_seviyesi = "ORTA"
-        else:
-            risk_seviyesi = "DÜŞÜK"
-        
-        return {
-            "risk_skoru": round(risk_skoru, 3),
-            "risk_seviyesi": risk_seviyesi,
-            "nbr_faktoru": round(ortalama_nbr, 4),
-            "kayip_faktoru": round(kayip_orani, 4),
-            "maden_faktoru": round(maden_etkisi, 4)
-        }
+        satir = self.risk_tablosu().loc[il]
+        return {k: (v if isinstance(v, str) else float(v)) for k, v in satir.items()}
     
     def tum_iller_risk_analizi(self) -> pd.DataFrame:
         """
@@ -308,12 +412,8 @@ class OrmanAnalizi:
         Returns:
             pd.DataFrame: Risk analiz tablosu
         """
-        rows = []
-        for il in self.iller:
-            risk = self.risk_skoru_hesapla(il)
-            rows.append({"İl": il, **risk})
-        
-        return pd.DataFrame(rows)
+        df = self._secili(self.risk_tablosu()).reset_index()
+        return df.rename(columns={"birim": "İl"})
     
     def yillik_degisim_analizi(self) -> pd.DataFrame:
         """
@@ -322,26 +422,21 @@ class OrmanAnalizi:
         Returns:
             pd.DataFrame: Yıllık değişim tablosu
         """
-        rows = []
-        
-        for yil in self.yillar:
-            toplam_alan = sum(self.orman_verileri[il][yil]["toplam_alan"] for il in self.iller)
-            toplam_yangin = sum(self.orman_verileri[il][yil]["yangin_kaybi"] for il in self.iller)
-            toplam_kesim = sum(self.orman_verileri[il][yil]["kesim_kaybi"] for il in self.iller)
-            toplam_maden = sum(self.orman_verileri[il][yil]["maden_kaybi"] for il in self.iller)
-            toplam_artis = sum(self.orman_verileri[il][yil]["dogal_artis"] for il in self.iller)
-            
-            rows.append({
-                "Yıl": yil,
-                "Toplam Alan (ha)": round(toplam_alan, 0),
-                "Yangın Kaybı (ha)": round(toplam_yangin, 0),
-                "Kesim Kaybı (ha)": round(toplam_kesim, 0),
-                "Maden Kaybı (ha)": round(toplam_maden, 0),
-                "Doğal Artış (ha)": round(toplam_artis, 0),
-                "Net Değişim (ha)": round(toplam_artis - toplam_yangin - toplam_kesim - toplam_maden, 0)
-            })
-        
-        return pd.DataFrame(rows)
+        df = self._yillik("orman")
+        df = df[df.index.get_level_values("birim").isin(list(self.iller))]
+        toplam = df[["toplam_alan"] + KAYIP_SUTUNLARI + ["dogal_artis"]].groupby(level="yil").sum()
+        toplam = toplam.reindex(list(self.yillar))
+        net = toplam["dogal_artis"] - toplam[KAYIP_SUTUNLARI].sum(axis=1)
+        
+        return pd.DataFrame({
+            "Yıl": toplam.index.to_numpy(),
+            "Toplam Alan (ha)": toplam["toplam_alan"].round(0).to_numpy(),
+            "Yangın Kaybı (ha)": toplam["yangin_kaybi"].round(0).to_numpy(),
+            "Kesim Kaybı (ha)": toplam["kesim_kaybi"].round(0).to_numpy(),
+            "Maden Kaybı (ha)": toplam["maden_kaybi"].round(0).to_numpy(),
+            "Doğal Artış (ha)": toplam["dogal_artis"].round(0).to_numpy(),
+            "Net Değişim (ha)": net.round(0).to_numpy(),
+        })
     
     def karsilastirmali_analiz(self) -> Dict:
         """
@@ -350,33 +445,15 @@ class OrmanAnalizi:
         Returns:
             Dict: Karşılaştırma sonuçları
         """
-        sonuclar = {
-            "en_cok_kayip_il": None,
-            "en_az_kayip_il": None,
-            "en_yuksek_risk_il": None,
-            "bolgesel_toplam_kayip": 0,
-            "bolgesel_ortalama_nbr": 0
-        }
+        kayiplar = self._secili(self.kayip_tablosu())["toplam_kayip"]
+        riskler = self._secili(self.risk_tablosu())["risk_skoru"]
+        nbr = self._yillik("nbr")["delta_nbr"]
+        nbr = nbr[nbr.index.get_level_values("birim").isin(list(self.iller))]
         
-        kayiplar = {}
-        riskler = {}
-        nbr_toplamlari = []
-        
-        for il in self.iller:
-            kayip = self.kayip_analizi(il)
-            kayiplar[il] = kayip["toplam_kayip"]
-            sonuclar["bolgesel_toplam_kayip"] += kayip["toplam_kayip"]
-            
-            risk = self.risk_skoru_hesapla(il)
-            riskler[il] = risk["risk_skoru"]
-            
-            for yil in self.yillar:
-                nbr_toplamlari.append(self.nbr_verileri[il][yil]["delta_nbr"])
-        
-        sonuclar["en_cok_kayip_il"] = max(kayiplar, key=kayiplar.get)
-        sonuclar["en_az_kayip_il"] = min(kayiplar, key=kayiplar.get)
-        sonuclar["en_yuksek_risk_il"] = max(riskler, key=riskler.get)
-        sonuclar["bolgesel_ortalama_nbr"] = round(np.mean(nbr_toplamlari), 4)
-        sonuclar["bolgesel_toplam_kayip"] = round(sonuclar["bolgesel_toplam_kayip"], 2)
-        
-        return sonuclar
+        return {
+            "en_cok_kayip_il": kayiplar.idxmax(),
+            "en_az_kayip_il": kayiplar.idxmin(),
+            "en_yuksek_risk_il": riskler.idxmax(),
+            "bolgesel_toplam_kayip": round(float(kayiplar.sum()), 2),
+            "bolgesel_ortalama_nbr": round(float(nbr.mean()), 4),
+        }
@@ -63,3 +63,12 @@ MANN_KENDALL_ALPHA = 0.05
 VERI_KLASORU = "data"
 CIKTI_KLASORU = "outputs"
 HARITA_KLASORU = "maps"
+
+# GEE zaman serisi sahne önbelleği (bkz. GEEYorumcusu.zaman_serisi_analizi)
+ZAMAN_SERISI_ONBELLEK = f"{VERI_KLASORU}/zaman_serisi_cache"
+
+# FAO GAUL il/ilçe sınırları yerel deposu (bkz. gee.boundaries)
+SINIR_ONBELLEK = f"{VERI_KLASORU}/sinirlar"
+
+# Parquet sonuç deposu klasörü (bkz. VeriYoneticisi, gee.results); klasör adı veri klasörüne görelidir
+SONUC_DEPOSU = "sonuclar"
@@ -14,6 +14,16 @@ from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import warnings
 
+from gee.boundaries import default_store
+from gee.change import classify_image
+from gee.client import default_layer, get_info, get_thumb_url, start_task
+from gee.indices import ee_index
+from gee.raster import encoding_for
+from gee.timeseries import extract_time_series
+from gee.visualize import RegionStats, region_stats
+
+from .config import SINIR_ONBELLEK, ZAMAN_SERISI_ONBELLEK
+
 try:
     import geemap
     GEEMAP_AVAILABLE = True
@@ -34,6 +44,13 @@ class GEEYorumcusu:
             project: Google Cloud projesi adı (opsiyonel)
         """
         self.authenticated = False
+        kaset = default_layer().cassette
+        if kaset is not None and kaset.replaying:
+            # Kayıttan yanıt (gee.cassette): ağ ve kimlik bilgisi olmadan
+            kaset.init_ee()
+            self.authenticated = True
+            print("✅ Google Earth Engine kasetten yanıtlanıyor (çevrimdışı)")
+            return
         try:
             # Önce mevcut kimlik bilgilerini dene
             if project:
@@ -85,26 +102,23 @@ class GEEYorumcusu:
             komsuluk["kuzey"]
         ])
 
-    def il_siniri_getir(self, il_adi: str) -> ee.Geometry:
+    def il_siniri_getir(self, il_adi: str, sadelestirme: Optional[str] = None) -> ee.Geometry:
         """
-        FAO GAUL veri setinden il sınırlarını getirir.
+        FAO GAUL il sınırlarını yerel sınır deposundan getirir.
+
+        Sınırlar ilk çağrıda bir kez indirilip `SINIR_ONBELLEK` altına yazılır;
+        Türkçe karakterli adlar ("Bartın", "KARABÜK") doğrudan eşlenir.
+        `sadelestirme` verilmezse geometri sunucudaki GAUL biriminden kodla
+        alınır (istek yalnızca il kodunu taşır); verilirse o düzeydeki yerel
+        koordinatlar kullanılır.
         """
         if not self.authenticated: return None
-        
-        # Türkçe karakter düzeltmesi
-        tr_map = {"ı": "i", "ğ": "g", "ü": "u", "ş": "s", "ö": "o", "ç": "c", 
-                  "İ": "I", "Ğ": "G", "Ü": "U", "Ş": "S", "Ö": "O", "Ç": "C"}
-        
-        gaul_adi = il_adi
-        for tr, eng in tr_map.items():
-            gaul_adi = gaul_adi.replace(tr, eng)
-            
+
         try:
-            # FAO GAUL Level 1: İl sınırları
-            turkiye = ee.FeatureCollection("FAO/GAUL/2015/level1").filter(ee.Filter.eq('ADM0_NAME', 'Turkey'))
-            il_siniri = turkiye.filter(ee.Filter.eq('ADM1_NAME', gaul_adi))
-            
-            return il_siniri.geometry()
+            depo = default_store(SINIR_ONBELLEK)
+            if sadelestirme is None:
+                return depo.ee_collection(il_adi).geometry()
+            return depo.ee_geometry(il_adi, simplify=sadelestirme)
         except Exception as e:
             print(f"Sınır getirme hatası ({il_adi}): {e}")
             return None
@@ -195,15 +209,11 @@ class GEEYorumcusu:
         if not self.authenticated:
             return None
         
-        nir = image.select('B8A').divide(10000)
-        swir = image.select('B11').divide(10000)
-        green = image.select('B3').divide(10000)
-        
-        # NDWI: Nem indeksi (Normalized Difference Water Index)
-        ndwi = nir.subtract(swir).divide(nir.add(swir)).rename('NDWI')
+        # NDWI: Nem indeksi (B8A/B11, kayıtta NDMI olarak tanımlı)
+        ndwi = ee_index(image, 'NDMI').rename('NDWI')
         
         # MNDWI: Değiştirilmiş su indeksi (Modified NDWI) - Yeşil band kullanarak kıyı maskeleme
-        mndwi = green.subtract(swir).divide(green.add(swir)).rename('MNDWI')
+        mndwi = ee_index(image, 'MNDWI')
         
         # Su maskesi: NDWI > esik VEYA MNDWI > esik olan alanları maskeleyerek çıkar
         water_mask = ndwi.lt(ndwi_esik).And(mndwi.lt(mndwi_esik))
@@ -227,12 +237,7 @@ class GEEYorumcusu:
         if not self.authenticated:
             return None
         
-        nir = image.select('B8').divide(10000)
-        swir = image.select('B12').divide(10000)
-        
-        nbr = nir.subtract(swir).divide(nir.add(swir)).rename('NBR')
-        
-        return nbr
+        return ee_index(image, 'NBR')
     
     def ndvi_hesapla(self, image: ee.Image) -> ee.Image:
         """
@@ -249,12 +254,7 @@ class GEEYorumcusu:
         if not self.authenticated:
             return None
         
-        nir = image.select('B8').divide(10000)
-        red = image.select('B4').divide(10000)
-        
-        ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-        
-        return ndvi
+        return ee_index(image, 'NDVI')
     
     def ndmi_hesapla(self, image: ee.Image) -> ee.Image:
         """
@@ -271,12 +271,7 @@ class GEEYorumcusu:
         if not self.authenticated:
             return None
         
-        nir = image.select('B8A').divide(10000)
-        swir = image.select('B11').divide(10000)
-        
-        ndmi = nir.subtract(swir).divide(nir.add(swir)).rename('NDMI')
-        
-        return ndmi
+        return ee_index(image, 'NDMI')
     
     def delta_nbr_hesapla(
         self,
@@ -367,52 +362,37 @@ class GEEYorumcusu:
         if not self.authenticated:
             return None
         
-        sinifli = delta_nbr.where(delta_nbr.lt(0.1), 0)
-        sinifli = sinifli.where(delta_nbr.gte(0.1).And(delta_nbr.lt(0.27)), 1)
-        sinifli = sinifli.where(delta_nbr.gte(0.27).And(delta_nbr.lt(0.44)), 2)
-        sinifli = sinifli.where(delta_nbr.gte(0.44).And(delta_nbr.lt(0.66)), 3)
-        sinifli = sinifli.where(delta_nbr.gte(0.66), 4)
-        
-        return sinifli.rename('YANGIN_SINIFI')
+        # Tek geçişli sınıflandırma (USGS dNBR şeması)
+        return classify_image(delta_nbr, 'dNBR_USGS', name='YANGIN_SINIFI')
     
     def istatistik_hesapla(
         self,
         image: ee.Image,
         bolge: ee.Geometry,
         scale: int = 30
-    ) -> Dict:
+    ) -> RegionStats:
         """
         Görüntü istatistiklerini hesapla.
         
+        Tüm bantların ortalama, min, maks, std ve piksel sayısı tek sunucu
+        isteğinde (birleşik indirgeyici) hesaplanır; bkz. `gee.visualize.region_stats`.
+        
         Args:
             image: Analiz yapılacak görüntü
             bolge: Çalışma bölgesi
             scale: Piksel ölçeği (metre)
             
         Returns:
-            Dict: İstatistikler
+            RegionStats: Band bazında istatistikler (`.errors`: band bazında hatalar,
+            `.as_dict()`: düz `{band}_{istatistik}` sözlüğü)
         """
         if not self.authenticated:
-            return {}
+            return RegionStats()
         
-        stats_dict = {}
-        
-        # Bandları al
-        bands = image.bandNames().getInfo()
-        
-        for band in bands:
-            try:
-                reduced = image.select(band).reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=bolge,
-                    scale=scale,
-                    maxPixels=1e9
-                )
-                stats_dict[f"{band}_mean"] = reduced.getInfo()
-            except:
-                pass
-        
-        return stats_dict
+        sonuc = region_stats(image, bolge, scale=scale)
+        for band, hata in sonuc.errors.items():
+            print(f"⚠️ İstatistik hesaplanamadı ({band}): {hata}")
+        return sonuc
 
     def orman_alani_hesapla(self, image: ee.Image, bolge: ee.Geometry, scale: int = 100) -> float:
         """
@@ -429,7 +409,7 @@ class GEEYorumcusu:
         if not self.authenticated: return 0.0
         
         try:
-            ndvi = image.normalizedDifference(['B8', 'B4'])
+            ndvi = ee_index(image, 'NDVI')
             orman_maskesi = ndvi.gt(0.3)
             
             pixel_area = ee.Image.pixelArea()
@@ -447,7 +427,7 @@ class GEEYorumcusu:
                 return 0.0
             
             # Metrekareden hektara çevir
-            return ee.Number(orman_alani).divide(10000).getInfo()
+            return get_info(ee.Number(orman_alani).divide(10000), op="forest_area")
         except Exception as e:
             print(f"Orman alanı hesaplama hatası: {e}")
             return 0.0
@@ -459,7 +439,7 @@ class GEEYorumcusu:
         if not self.authenticated: return 0.0
         
         try:
-            nbr = image.normalizedDifference(['B8', 'B12'])
+            nbr = ee_index(image, 'NBR')
             stats = nbr.reduceRegion(
                 reducer=ee.Reducer.mean(),
                 geometry=bolge,
@@ -467,12 +447,12 @@ class GEEYorumcusu:
                 maxPixels=1e9
             )
             
-            mean_nbr = stats.get('nd')
+            mean_nbr = stats.get('NBR')
             
             if mean_nbr is None:
                 return 0.0
                 
-            return ee.Number(mean_nbr).getInfo()
+            return get_info(ee.Number(mean_nbr), op="mean_nbr")
         except:
             return 0.0
 
@@ -494,7 +474,7 @@ class GEEYorumcusu:
         }
         
         try:
-            return image.getThumbURL(vis_params)
+            return get_thumb_url(image, vis_params)
         except Exception as e:
             print(f"Thumbnail URL hatası: {e}")
             return ""
@@ -504,7 +484,8 @@ class GEEYorumcusu:
         image: ee.Image,
         bolge: ee.Geometry,
         dosya_adi: str,
-        scale: int = 30
+        scale: int = 30,
+        urun: Optional[str] = None
     ) -> Dict:
         """
         İşlenmiş görüntüyü indir.
@@ -514,6 +495,8 @@ class GEEYorumcusu:
             bolge: Çalışma bölgesi
             dosya_adi: Çıktı dosya adı
             scale: Piksel ölçeği
+            urun: Ürün adı (örn: "dNBR", "severity"). Verilirse görüntü
+                ölçeklenmiş int16/uint8 olarak kodlanıp dışa aktarılır.
             
         Returns:
             Dict: İndirme URL ve bilgileri
@@ -521,6 +504,9 @@ class GEEYorumcusu:
         if not self.authenticated:
             return {}
         
+        if urun:
+            image = encoding_for(urun).ee_encode(image)
+        
         try:
             task = ee.batch.Export.image.toDrive(
                 image=image,
@@ -530,7 +516,7 @@ class GEEYorumcusu:
                 region=bolge,
                 maxPixels=1e9
             )
-            task.start()
+            start_task(task, op="export_drive")
             
             return {
                 "status": "başlatıldı",
@@ -544,15 +530,29 @@ class GEEYorumcusu:
         self,
         koleksiyon: ee.ImageCollection,
         bolge: ee.Geometry,
-        scale: int = 30
+        scale: int = 30,
+        sayfa_gun: int = 31,
+        es_zamanli: int = 4,
+        onbellek_klasoru: Optional[str] = ZAMAN_SERISI_ONBELLEK,
+        onbellek_anahtari: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Zaman serisi analizini gerçekleştir.
         
+        Koleksiyon tarih aralığı sayfalarıyla ve en fazla `es_zamanli` eşzamanlı
+        istekle çekilir; sahne sonuçları önbelleğe alınır ve sonraki çağrılarda
+        yalnızca önbellekte olmayan sahneler istenir.
+        
         Args:
             koleksiyon: Görüntü koleksiyonu
             bolge: Çalışma bölgesi
             scale: Piksel ölçeği
+            sayfa_gun: Bir istekteki tarih aralığı (gün)
+            es_zamanli: Eşzamanlı istek sayısı üst sınırı
+            onbellek_klasoru: Sahne önbelleği klasörü (None: önbellek yok)
+            onbellek_anahtari: Koleksiyonun sabit kimliği (ön işleme değişince
+                değiştirin); verilmezse koleksiyonun tarih filtresi çıkarılmış
+                ifade grafiği kullanılır (tarih aralığını uzatmak önbelleği korur)
             
         Returns:
             pd.DataFrame: Tarih ve indeks değerleri
@@ -560,32 +560,23 @@ class GEEYorumcusu:
         if not self.authenticated:
             return pd.DataFrame()
         
-        def add_date_and_stats(image):
-            date = image.date().format('YYYY-MM-DD')
-            reduced = (
-                image.select('NDVI', 'NBR', 'NDMI')
-                .reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=bolge,
-                    scale=scale,
-                    maxPixels=1e9
-                )
-                .set('date', date)
-            )
-            return reduced
-        
         try:
-            time_series = koleksiyon.map(add_date_and_stats).getInfo()
+            rows = extract_time_series(
+                koleksiyon,
+                bolge,
+                bands=("NDVI", "NBR", "NDMI"),
+                scale=scale,
+                page_days=sayfa_gun,
+                workers=es_zamanli,
+                cache_dir=onbellek_klasoru,
+                collection_key=onbellek_anahtari,
+            )
             
             # Pandas DataFrame'e dönüştür
-            rows = []
-            for feature in time_series['features']:
-                rows.append(feature['properties'])
-            
-            df = pd.DataFrame(rows)
-            df['date'] = pd.to_datetime(df['date'])
+            df = pd.DataFrame(rows, columns=["scene_id", "time_start", "NDVI", "NBR", "NDMI"])
+            df.insert(0, "date", pd.to_datetime(df["time_start"], unit="ms").dt.normalize())
             
-            return df
+            return df.drop(columns="time_start")
         except Exception as e:
             print(f"Zaman serisi analiz hatası: {str(e)}")
             return pd.DataFrame()
@@ -654,7 +645,7 @@ class Goruntu_Isleme_Pipeline:
                 "delta_nbr": delta_nbr,
                 "yangin_sinifi": yangin_sinifi,
                 "istatistikler": istatistikler,
-                "koleksiyon_boyutu": koleksiyon.size().getInfo()
+                "koleksiyon_boyutu": get_info(koleksiyon.size(), op="collection_size")
             }
             
         except Exception as e:
@@ -698,7 +689,7 @@ class Goruntu_Isleme_Pipeline:
             return {
                 "status": "başarılı",
                 "zaman_serisi": zaman_serisi,
-                "koleksiyon_boyutu": koleksiyon.size().getInfo()
+                "koleksiyon_boyutu": get_info(koleksiyon.size(), op="collection_size")
             }
             
         except Exception as e:
@@ -4,17 +4,31 @@ Görselleştirme Modülü
 =====================
 
 Grafik ve harita oluşturma fonksiyonları.
+
+Çizim mantığı eksen alan modül düzeyindeki `_ciz_*` fonksiyonlarındadır;
+etkileşimli yöntemler (pyplot) ve toplu rapor üretimi (`rapor_paketi`:
+Agg arka ucu, yeniden kullanılan şekil şablonları, süreç havuzu) aynı
+fonksiyonları kullanır. Stil ayarları genel rcParams'a yazılmaz, yalnızca
+çizim süresince uygulanır.
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+import os
+import re
 import warnings
 
 try:
+    import matplotlib
     import matplotlib.pyplot as plt
     import matplotlib.patches as mpatches
     from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -28,8 +42,219 @@ try:
 except ImportError:
     PLOTLY_AVAILABLE = False
 
+from .analiz import OrmanAnalizi
 from .config import ILLER, YILLAR, RENKLER, IL_KOORDINATLARI, GRAFIK_AYARLARI
 
+_STIL_RC = {"font.family": "DejaVu Sans", "axes.unicode_minus": False}
+NBR_ESIKLERI = ((0.27, "yellow", "Düşük-Orta Eşiği (0.27)"),
+                (0.44, "orange", "Orta-Yüksek Eşiği (0.44)"),
+                (0.66, "red", "Yüksek Şiddet Eşiği (0.66)"))
+RAPOR_GRAFIKLERI = ("orman_alani", "kayip_pasta", "nbr_serisi", "trend")
+
+
+@contextmanager
+def _stil():
+    """Grafik stilini yalnızca blok süresince uygular."""
+    with matplotlib.style.context(GRAFIK_AYARLARI["style"]), matplotlib.rc_context(_STIL_RC):
+        yield
+
+
+def _stilli(yontem):
+    @wraps(yontem)
+    def sarmal(*args, **kwargs):
+        if not MATPLOTLIB_AVAILABLE:
+            return yontem(*args, **kwargs)
+        with _stil():
+            return yontem(*args, **kwargs)
+    return sarmal
+
+
+def _eksen_susle(ax, renkler: Dict, grid_axis: str = "both") -> None:
+    ax.tick_params(colors="white")
+    ax.grid(True, alpha=0.3, axis=grid_axis, color="white")
+    for spine in ax.spines.values():
+        spine.set_color("white")
+        spine.set_alpha(0.3)
+
+
+def _ciz_orman_alani(ax, renkler: Dict, yillar: Sequence[int], seriler: Dict[str, Sequence[float]],
+                     baslik: str = "Batı Karadeniz Bölgesi Orman Alanı Değişimi (2020-2025)") -> None:
+    ax.set_facecolor(renkler["panel"])
+    renkler_liste = [renkler["yesil"], renkler["mavi"], renkler["turuncu"]]
+    for idx, (ad, alanlar) in enumerate(seriler.items()):
+        ax.plot(yillar, alanlar, marker='o', linewidth=2.5,
+                label=ad, color=renkler_liste[idx % 3], markersize=8)
+    ax.set_xlabel("Yıl", color="white", fontsize=12)
+    ax.set_ylabel("Orman Alanı (ha)", color="white", fontsize=12)
+    ax.set_title(baslik, color="white", fontsize=14, fontweight="bold", pad=15)
+    ax.legend(facecolor=renkler["panel"], labelcolor="white", fontsize=10)
+    _eksen_susle(ax, renkler)
+
+
+def _ciz_kayip_pasta(ax, renkler: Dict, yangin: float, kesim: float, maden: float,
+                     baslik: str = "Orman Kaybı Nedenlerinin Dağılımı (2020-2025)") -> None:
+    etiketler = [
+        f"Yangın\n{yangin:,.0f} ha",
+        f"Kesim\n{kesim:,.0f} ha",
+        f"Madencilik\n{maden:,.0f} ha"
+    ]
+    renkler_pasta = [renkler["kirmizi"], renkler["turuncu"], renkler["sari"]]
+    if yangin + kesim + maden > 0:
+        wedges, texts, autotexts = ax.pie(
+            [yangin, kesim, maden],
+            labels=etiketler,
+            autopct='%1.1f%%',
+            colors=renkler_pasta,
+            explode=(0.05, 0.03, 0.03),
+            shadow=True,
+            startangle=90
+        )
+        for text in texts + autotexts:
+            text.set_color("white")
+            text.set_fontsize(11)
+    else:
+        ax.text(0.5, 0.5, "Kayıp yok", ha="center", va="center", color="white", fontsize=12)
+        ax.set_axis_off()
+    ax.set_title(baslik, color="white", fontsize=14, fontweight="bold", pad=20)
+
+
+def _ciz_nbr_serisi(ax, renkler: Dict, yillar: Sequence[int], seriler: Dict[str, Sequence[float]],
+                    baslik: str = "ΔNBR Zaman Serisi Analizi") -> None:
+    ax.set_facecolor(renkler["panel"])
+    renkler_liste = [renkler["kirmizi"], renkler["turuncu"], renkler["sari"]]
+    for idx, (ad, degerler) in enumerate(seriler.items()):
+        ax.plot(yillar, degerler, marker='s', linewidth=2.5,
+                label=ad, color=renkler_liste[idx % 3], markersize=8)
+    # Eşik çizgileri
+    for esik, renk, etiket in NBR_ESIKLERI:
+        ax.axhline(y=esik, color=renk, linestyle='--', alpha=0.7, label=etiket)
+    ax.set_xlabel("Yıl", color="white", fontsize=12)
+    ax.set_ylabel("ΔNBR Değeri", color="white", fontsize=12)
+    ax.set_title(baslik, color="white", fontsize=14, fontweight="bold", pad=15)
+    ax.legend(facecolor=renkler["panel"], labelcolor="white", fontsize=9, loc='upper right')
+    _eksen_susle(ax, renkler)
+
+
+def _ciz_risk_haritasi(ax, renkler: Dict, noktalar: Dict[str, Tuple[float, float, float, str]],
+                       xlim: Tuple[float, float] = (31.0, 33.5), ylim: Tuple[float, float] = (40.8, 42.0),
+                       baslik: str = "Batı Karadeniz Bölgesi - Orman Yangını Risk Haritası",
+                       yaricap: float = 0.18, yazi_boyutu: float = 11) -> None:
+    """`noktalar`: {birim: (boylam, enlem, risk skoru, risk seviyesi)}"""
+    ax.set_facecolor(renkler["panel"])
+    seviye_renkleri = {"YÜKSEK": renkler["kirmizi"], "ORTA": renkler["turuncu"]}
+    for ad, (lon, lat, risk, seviye) in noktalar.items():
+        # Daire çiz
+        ax.add_patch(mpatches.Circle((lon, lat), yaricap, color=seviye_renkleri.get(seviye, renkler["yesil"]), alpha=0.7))
+        # İsim ve risk bilgisi
+        ax.annotate(f"{ad}\n{seviye}\n({risk:.0%})", (lon, lat), ha='center', va='center',
+                    fontsize=yazi_boyutu, fontweight='bold', color='white')
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.set_xlabel("Boylam", color="white", fontsize=12)
+    ax.set_ylabel("Enlem", color="white", fontsize=12)
+    ax.set_title(baslik, color="white", fontsize=14, fontweight="bold", pad=15)
+    _eksen_susle(ax, renkler)
+    # Legend
+    yuksek = mpatches.Patch(color=renkler["kirmizi"], label='Yüksek Risk (>70%)')
+    orta = mpatches.Patch(color=renkler["turuncu"], label='Orta Risk (50-70%)')
+    dusuk = mpatches.Patch(color=renkler["yesil"], label='Düşük Risk (<50%)')
+    ax.legend(handles=[yuksek, orta, dusuk], loc='lower right',
+              facecolor=renkler["panel"], labelcolor='white', fontsize=10)
+
+
+def _ciz_trend(ax, renkler: Dict, ad: str, yillar: Sequence[int], alanlar: Sequence[float],
+               sens_slope: float, p_degeri: float, anlamli_mi: bool, renk: Optional[str] = None) -> None:
+    ax.set_facecolor(renkler["panel"])
+    # Veri noktaları
+    ax.scatter(yillar, alanlar, color=renk or renkler["yesil"], s=100, zorder=3, label='Gerçek Veri')
+    # Trend çizgisi (Sen's Slope ile)
+    x_trend = np.array(yillar)
+    y_trend = alanlar[0] + sens_slope * (x_trend - x_trend[0])
+    ax.plot(x_trend, y_trend, '--', color='white', linewidth=2,
+            alpha=0.8, label=f"Trend: {sens_slope:.1f} ha/yıl")
+    ax.set_xlabel("Yıl", color="white", fontsize=10)
+    ax.set_ylabel("Orman Alanı (ha)", color="white", fontsize=10)
+    anlamli = "✓" if anlamli_mi else "✗"
+    ax.set_title(f"{ad}\np={p_degeri:.4f} {anlamli}", color="white", fontsize=12, fontweight="bold")
+    ax.legend(facecolor=renkler["panel"], labelcolor="white", fontsize=9)
+    _eksen_susle(ax, renkler)
+
+
+_CIZICILER = {
+    "orman_alani": _ciz_orman_alani,
+    "kayip_pasta": _ciz_kayip_pasta,
+    "nbr_serisi": _ciz_nbr_serisi,
+    "risk_haritasi": _ciz_risk_haritasi,
+    "trend": _ciz_trend,
+}
+
+
+@dataclass(frozen=True)
+class GrafikIsi:
+    """Toplu üretimde tek bir grafik: çizici adı, çizici argümanları ve çıktı yolları."""
+    tur: str
+    veri: dict
+    yollar: Tuple[str, ...]
+    figsize: Tuple[float, float] = (12, 6)
+    dpi: int = 150
+
+
+# Süreç başına yeniden kullanılan şablonlar: (tür, boyut) -> [şekil, eksen, yerleşim hazır mı]
+_SABLONLAR: Dict[tuple, list] = {}
+# Toplu üretimde PNG sıkıştırması: varsayılan (6) çizim süresi kadar sürer, boyut farkı küçüktür
+_PNG_SIKISTIRMA = 1
+
+
+def _sablon(tur: str, figsize: Tuple[float, float], renkler: Dict) -> list:
+    anahtar = (tur, tuple(figsize))
+    if anahtar not in _SABLONLAR:
+        # pyplot dışı şekil: pencere yöneticisi yok, Agg tuvaliyle doğrudan dosyaya yazılır
+        fig = Figure(figsize=figsize, facecolor=renkler["arkaplan"])
+        FigureCanvasAgg(fig)
+        _SABLONLAR[anahtar] = [fig, fig.add_subplot(), False]
+    sablon = _SABLONLAR[anahtar]
+    sablon[1].cla()
+    return sablon
+
+
+def _grafik_isi_ciz(is_: GrafikIsi, renkler: Dict = RENKLER) -> Tuple[str, ...]:
+    """Grafiği şablon şekle çizer ve tüm yollara yazar.
+    
+    Kenar boşlukları (tight_layout) şablonun ilk grafiğinde hesaplanır ve
+    aynı türdeki sonraki grafiklerde yeniden kullanılır.
+    """
+    sablon = _sablon(is_.tur, is_.figsize, renkler)
+    fig, ax, hazir = sablon
+    _CIZICILER[is_.tur](ax, renkler, **is_.veri)
+    if not hazir:
+        fig.tight_layout(pad=1.5)
+        sablon[2] = True
+    for yol in is_.yollar:
+        ek = {"pil_kwargs": {"compress_level": _PNG_SIKISTIRMA}} if yol.endswith(".png") else {}
+        fig.savefig(yol, dpi=is_.dpi, facecolor=renkler["arkaplan"], **ek)
+    return is_.yollar
+
+
+def _isci_baslat() -> None:
+    """Havuz süreçleri: Agg arka ucu ve stil süreç başına bir kez."""
+    matplotlib.use("Agg")
+    matplotlib.style.use(GRAFIK_AYARLARI["style"])
+    matplotlib.rcParams.update(_STIL_RC)
+
+
+def _isleri_ciz(isler: List[GrafikIsi], isci: int) -> List[Tuple[str, ...]]:
+    if isci <= 1 or len(isler) <= 1:
+        with _stil():
+            return [_grafik_isi_ciz(is_) for is_ in isler]
+    with ProcessPoolExecutor(max_workers=isci, initializer=_isci_baslat) as havuz:
+        # Küçük işler için süreçler arası gidiş-dönüşü azalt
+        parca = max(1, len(isler) // (isci * 4))
+        return list(havuz.map(_grafik_isi_ciz, isler, chunksize=parca))
+
+
+def _dosya_adi(ad: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", str(ad)).strip("_") or "birim"
+
 
 class Gorsellestiric:
     """Görselleştirme sınıfı"""
@@ -49,12 +274,20 @@ class Gorsellestiric:
         self.iller = ILLER
         self.yillar = YILLAR
         self.renkler = RENKLER
-        
-        if MATPLOTLIB_AVAILABLE:
-            plt.style.use('seaborn-v0_8-darkgrid')
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-            plt.rcParams['axes.unicode_minus'] = False
     
+    def _kaydet(self, fig, kaydet: Optional[str]) -> None:
+        fig.tight_layout()
+        if kaydet:
+            fig.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
+                        bbox_inches='tight')
+    
+    def _kayip_toplamlari(self, iller: Sequence[str], yillar: Sequence[int]) -> Tuple[float, float, float]:
+        return tuple(
+            sum(self.orman_verileri[il][y][anahtar] for il in iller for y in yillar)
+            for anahtar in ("yangin_kaybi", "kesim_kaybi", "maden_kaybi")
+        )
+    
+    @_stilli
     def orman_alani_grafigi(self, figsize: Tuple = (12, 6), kaydet: Optional[str] = None) -> Optional[Figure]:
         """
         Orman alanı değişim grafiği oluştur.
@@ -71,35 +304,12 @@ class Gorsellestiric:
             return None
         
         fig, ax = plt.subplots(figsize=figsize, facecolor=self.renkler["arkaplan"])
-        ax.set_facecolor(self.renkler["panel"])
-        
-        renkler_liste = [self.renkler["yesil"], self.renkler["mavi"], self.renkler["turuncu"]]
-        
-        for idx, il in enumerate(self.iller):
-            alanlar = [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar]
-            ax.plot(self.yillar, alanlar, marker='o', linewidth=2.5, 
-                   label=il, color=renkler_liste[idx], markersize=8)
-        
-        ax.set_xlabel("Yıl", color="white", fontsize=12)
-        ax.set_ylabel("Orman Alanı (ha)", color="white", fontsize=12)
-        ax.set_title("Batı Karadeniz Bölgesi Orman Alanı Değişimi (2020-2025)", 
-                    color="white", fontsize=14, fontweight="bold", pad=15)
-        ax.legend(facecolor=self.renkler["panel"], labelcolor="white", fontsize=10)
-        ax.tick_params(colors="white")
-        ax.grid(True, alpha=0.3, color="white")
-        
-        for spine in ax.spines.values():
-            spine.set_color("white")
-            spine.set_alpha(0.3)
-        
-        plt.tight_layout()
-        
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
-        
+        seriler = {il: [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar] for il in self.iller}
+        _ciz_orman_alani(ax, self.renkler, self.yillar, seriler)
+        self._kaydet(fig, kaydet)
         return fig
     
+    @_stilli
     def kayip_dagilim_pasta(self, figsize: Tuple = (10, 8), kaydet: Optional[str] = None) -> Optional[Figure]:
         """
         Orman kaybı dağılım pasta grafiği.
@@ -115,53 +325,11 @@ class Gorsellestiric:
             return None
         
         fig, ax = plt.subplots(figsize=figsize, facecolor=self.renkler["arkaplan"])
-        
-        toplam_yangin = sum(
-            self.orman_verileri[il][y]["yangin_kaybi"] 
-            for il in self.iller for y in self.yillar
-        )
-        toplam_kesim = sum(
-            self.orman_verileri[il][y]["kesim_kaybi"] 
-            for il in self.iller for y in self.yillar
-        )
-        toplam_maden = sum(
-            self.orman_verileri[il][y]["maden_kaybi"] 
-            for il in self.iller for y in self.yillar
-        )
-        
-        veriler = [toplam_yangin, toplam_kesim, toplam_maden]
-        etiketler = [
-            f"Yangın\n{toplam_yangin:,.0f} ha",
-            f"Kesim\n{toplam_kesim:,.0f} ha",
-            f"Madencilik\n{toplam_maden:,.0f} ha"
-        ]
-        renkler_pasta = [self.renkler["kirmizi"], self.renkler["turuncu"], self.renkler["sari"]]
-        
-        wedges, texts, autotexts = ax.pie(
-            veriler, 
-            labels=etiketler, 
-            autopct='%1.1f%%',
-            colors=renkler_pasta,
-            explode=(0.05, 0.03, 0.03),
-            shadow=True,
-            startangle=90
-        )
-        
-        for text in texts + autotexts:
-            text.set_color("white")
-            text.set_fontsize(11)
-        
-        ax.set_title("Orman Kaybı Nedenlerinin Dağılımı (2020-2025)", 
-                    color="white", fontsize=14, fontweight="bold", pad=20)
-        
-        plt.tight_layout()
-        
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
-        
+        _ciz_kayip_pasta(ax, self.renkler, *self._kayip_toplamlari(self.iller, self.yillar))
+        self._kaydet(fig, kaydet)
         return fig
     
+    @_stilli
     def nbr_zaman_serisi(self, il: Optional[str] = None, figsize: Tuple = (12, 6), 
                          kaydet: Optional[str] = None) -> Optional[Figure]:
         """
@@ -179,45 +347,13 @@ class Gorsellestiric:
             return None
         
         fig, ax = plt.subplots(figsize=figsize, facecolor=self.renkler["arkaplan"])
-        ax.set_facecolor(self.renkler["panel"])
-        
         iller_goster = [il] if il else self.iller
-        renkler_liste = [self.renkler["kirmizi"], self.renkler["turuncu"], self.renkler["sari"]]
-        
-        for idx, i in enumerate(iller_goster):
-            degerler = [self.nbr_verileri[i][y]["delta_nbr"] for y in self.yillar]
-            ax.plot(self.yillar, degerler, marker='s', linewidth=2.5, 
-                   label=i, color=renkler_liste[idx % 3], markersize=8)
-        
-        # Eşik çizgileri
-        ax.axhline(y=0.27, color='yellow', linestyle='--', alpha=0.7, 
-                  label='Düşük-Orta Eşiği (0.27)')
-        ax.axhline(y=0.44, color='orange', linestyle='--', alpha=0.7, 
-                  label='Orta-Yüksek Eşiği (0.44)')
-        ax.axhline(y=0.66, color='red', linestyle='--', alpha=0.7, 
-                  label='Yüksek Şiddet Eşiği (0.66)')
-        
-        ax.set_xlabel("Yıl", color="white", fontsize=12)
-        ax.set_ylabel("ΔNBR Değeri", color="white", fontsize=12)
-        ax.set_title("ΔNBR Zaman Serisi Analizi", color="white", 
-                    fontsize=14, fontweight="bold", pad=15)
-        ax.legend(facecolor=self.renkler["panel"], labelcolor="white", 
-                 fontsize=9, loc='upper right')
-        ax.tick_params(colors="white")
-        ax.grid(True, alpha=0.3, color="white")
-        
-        for spine in ax.spines.values():
-            spine.set_color("white")
-            spine.set_alpha(0.3)
-        
-        plt.tight_layout()
-        
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
-        
+        seriler = {i: [self.nbr_verileri[i][y]["delta_nbr"] for y in self.yillar] for i in iller_goster}
+        _ciz_nbr_serisi(ax, self.renkler, self.yillar, seriler)
+        self._kaydet(fig, kaydet)
         return fig
     
+    @_stilli
     def yillik_kayip_bar(self, figsize: Tuple = (14, 7), kaydet: Optional[str] = None) -> Optional[Figure]:
         """
         Yıllık orman kaybı çubuk grafiği.
@@ -248,7 +384,7 @@ class Gorsellestiric:
                 for y in self.yillar
             ]
             ax.bar(x + idx * width, kayiplar, width, label=il, 
-                  color=renkler_liste[idx], alpha=0.8)
+                  color=renkler_liste[idx % 3], alpha=0.8)
         
         ax.set_xlabel("Yıl", color="white", fontsize=12)
         ax.set_ylabel("Toplam Kayıp (ha)", color="white", fontsize=12)
@@ -257,21 +393,12 @@ class Gorsellestiric:
         ax.set_xticks(x + width)
         ax.set_xticklabels(self.yillar)
         ax.legend(facecolor=self.renkler["panel"], labelcolor="white", fontsize=10)
-        ax.tick_params(colors="white")
-        ax.grid(True, alpha=0.3, axis='y', color="white")
-        
-        for spine in ax.spines.values():
-            spine.set_color("white")
-            spine.set_alpha(0.3)
-        
-        plt.tight_layout()
-        
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
+        _eksen_susle(ax, self.renkler, grid_axis="y")
         
+        self._kaydet(fig, kaydet)
         return fig
     
+    @_stilli
     def risk_haritasi(self, risk_verileri: Dict, figsize: Tuple = (12, 10), 
                       kaydet: Optional[str] = None) -> Optional[Figure]:
         """
@@ -289,62 +416,16 @@ class Gorsellestiric:
             return None
         
         fig, ax = plt.subplots(figsize=figsize, facecolor=self.renkler["arkaplan"])
-        ax.set_facecolor(self.renkler["panel"])
-        
-        for il in self.iller:
-            koord = IL_KOORDINATLARI[il]
-            risk = risk_verileri[il]["risk_skoru"]
-            seviye = risk_verileri[il]["risk_seviyesi"]
-            
-            if seviye == "YÜKSEK":
-                renk = self.renkler["kirmizi"]
-            elif seviye == "ORTA":
-                renk = self.renkler["turuncu"]
-            else:
-                renk = self.renkler["yesil"]
-            
-            # Daire çiz
-            circle = plt.Circle((koord["lon"], koord["lat"]), 0.18, 
-                               color=renk, alpha=0.7)
-            ax.add_patch(circle)
-            
-            # İsim ve risk bilgisi
-            ax.annotate(
-                f"{il}\n{seviye}\n({risk:.0%})",
-                (koord["lon"], koord["lat"]),
-                ha='center', va='center',
-                fontsize=11, fontweight='bold',
-                color='white'
-            )
-        
-        ax.set_xlim(31.0, 33.5)
-        ax.set_ylim(40.8, 42.0)
-        ax.set_xlabel("Boylam", color="white", fontsize=12)
-        ax.set_ylabel("Enlem", color="white", fontsize=12)
-        ax.set_title("Batı Karadeniz Bölgesi - Orman Yangını Risk Haritası", 
-                    color="white", fontsize=14, fontweight="bold", pad=15)
-        ax.tick_params(colors="white")
-        ax.grid(True, alpha=0.3, color="white")
-        
-        for spine in ax.spines.values():
-            spine.set_color("white")
-            spine.set_alpha(0.3)
-        
-        # Legend
-        yuksek = mpatches.Patch(color=self.renkler["kirmizi"], label='Yüksek Risk (>70%)')
-        orta = mpatches.Patch(color=self.renkler["turuncu"], label='Orta Risk (50-70%)')
-        dusuk = mpatches.Patch(color=self.renkler["yesil"], label='Düşük Risk (<50%)')
-        ax.legend(handles=[yuksek, orta, dusuk], loc='lower right', 
-                 facecolor=self.renkler["panel"], labelcolor='white', fontsize=10)
-        
-        plt.tight_layout()
-        
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
-        
+        noktalar = {
+            il: (IL_KOORDINATLARI[il]["lon"], IL_KOORDINATLARI[il]["lat"],
+                 risk_verileri[il]["risk_skoru"], risk_verileri[il]["risk_seviyesi"])
+            for il in self.iller
+        }
+        _ciz_risk_haritasi(ax, self.renkler, noktalar)
+        self._kaydet(fig, kaydet)
         return fig
     
+    @_stilli
     def trend_grafigi(self, trend_sonuclari: Dict, figsize: Tuple = (14, 6), 
                       kaydet: Optional[str] = None) -> Optional[Figure]:
         """
@@ -365,45 +446,145 @@ class Gorsellestiric:
         
         renkler_liste = [self.renkler["yesil"], self.renkler["mavi"], self.renkler["turuncu"]]
         
-        for idx, (il, ax) in enumerate(zip(self.iller, axes)):
-            ax.set_facecolor(self.renkler["panel"])
-            
-            alanlar = [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar]
+        for idx, (il, ax) in enumerate(zip(self.iller, np.atleast_1d(axes))):
             sonuc = trend_sonuclari[il]
-            
-            # Veri noktaları
-            ax.scatter(self.yillar, alanlar, color=renkler_liste[idx], 
-                      s=100, zorder=3, label='Gerçek Veri')
-            
-            # Trend çizgisi (Sen's Slope ile)
-            x_trend = np.array(self.yillar)
-            y_trend = alanlar[0] + sonuc.sens_slope * (x_trend - x_trend[0])
-            ax.plot(x_trend, y_trend, '--', color='white', linewidth=2, 
-                   alpha=0.8, label=f"Trend: {sonuc.sens_slope:.1f} ha/yıl")
-            
-            ax.set_xlabel("Yıl", color="white", fontsize=10)
-            ax.set_ylabel("Orman Alanı (ha)", color="white", fontsize=10)
-            
-            anlamli = "✓" if sonuc.anlamli_mi else "✗"
-            ax.set_title(f"{il}\np={sonuc.p_degeri:.4f} {anlamli}", 
-                        color="white", fontsize=12, fontweight="bold")
-            ax.legend(facecolor=self.renkler["panel"], labelcolor="white", fontsize=9)
-            ax.tick_params(colors="white")
-            ax.grid(True, alpha=0.3, color="white")
-            
-            for spine in ax.spines.values():
-                spine.set_color("white")
-                spine.set_alpha(0.3)
+            _ciz_trend(
+                ax, self.renkler, il, self.yillar,
+                [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar],
+                sonuc.sens_slope, sonuc.p_degeri, sonuc.anlamli_mi, renk=renkler_liste[idx % 3],
+            )
         
-        plt.suptitle("Mann-Kendall Trend Analizi ve Sen's Slope", 
-                    color="white", fontsize=14, fontweight="bold", y=1.02)
-        plt.tight_layout()
+        fig.suptitle("Mann-Kendall Trend Analizi ve Sen's Slope", 
+                     color="white", fontsize=14, fontweight="bold", y=1.02)
+        self._kaydet(fig, kaydet)
+        return fig
+    
+    # Toplu rapor üretimi
+    def rapor_isleri(
+        self,
+        klasor: str,
+        birimler: Optional[Sequence[str]] = None,
+        bicimler: Sequence[str] = ("png",),
+        grafikler: Sequence[str] = RAPOR_GRAFIKLERI,
+        yillik: bool = True,
+        koordinatlar: Optional[Dict[str, Dict[str, float]]] = None,
+        dpi: int = 150,
+    ) -> List[GrafikIsi]:
+        """
+        Rapor paketinin grafik işlerini (çizilmeden) hazırlar.
         
-        if kaydet:
-            plt.savefig(kaydet, dpi=150, facecolor=self.renkler["arkaplan"], 
-                       bbox_inches='tight')
+        Birim başına `grafikler` (orman alanı, kayıp pastası, ΔNBR serisi,
+        trend), `yillik` ise yıl başına bölgesel kayıp pastası ve koordinatı
+        bilinen birimler için tek bir risk haritası üretilir. Trend ve risk
+        değerleri `OrmanAnalizi` ile tek geçişte hesaplanır.
+        """
+        birimler = list(birimler or self.iller)
+        koordinatlar = IL_KOORDINATLARI if koordinatlar is None else koordinatlar
+        os.makedirs(klasor, exist_ok=True)
+        
+        def yollar(ad: str) -> Tuple[str, ...]:
+            return tuple(os.path.join(klasor, f"{ad}.{b}") for b in bicimler)
+        
+        analiz = OrmanAnalizi(self.orman_verileri, self.nbr_verileri, self.maden_verileri)
+        analiz.yillar = self.yillar
+        trend = analiz.trend_tablosu()
+        yillar = list(self.yillar)
+        
+        isler: List[GrafikIsi] = []
+        for birim in birimler:
+            ad = _dosya_adi(birim)
+            orman = self.orman_verileri[birim]
+            alanlar = [orman[y]["toplam_alan"] for y in yillar]
+            if "orman_alani" in grafikler:
+                isler.append(GrafikIsi("orman_alani", {
+                    "yillar": yillar, "seriler": {birim: alanlar},
+                    "baslik": f"{birim} - Orman Alanı Değişimi",
+                }, yollar(f"{ad}_orman_alani"), dpi=dpi))
+            if "kayip_pasta" in grafikler:
+                yangin, kesim, maden = self._kayip_toplamlari([birim], yillar)
+                isler.append(GrafikIsi("kayip_pasta", {
+                    "yangin": yangin, "kesim": kesim, "maden": maden,
+                    "baslik": f"{birim} - Orman Kaybı Nedenleri",
+                }, yollar(f"{ad}_kayip_pasta"), figsize=(10, 8), dpi=dpi))
+            if "nbr_serisi" in grafikler:
+                isler.append(GrafikIsi("nbr_serisi", {
+                    "yillar": yillar,
+                    "seriler": {birim: [self.nbr_verileri[birim][y]["delta_nbr"] for y in yillar]},
+                    "baslik": f"{birim} - ΔNBR Zaman Serisi",
+                }, yollar(f"{ad}_nbr_serisi"), dpi=dpi))
+            if "trend" in grafikler:
+                satir = trend.loc[birim]
+                isler.append(GrafikIsi("trend", {
+                    "ad": birim, "yillar": yillar, "alanlar": alanlar,
+                    "sens_slope": float(satir["sens_slope"]), "p_degeri": float(satir["p_degeri"]),
+                    "anlamli_mi": bool(satir["anlamli_mi"]),
+                }, yollar(f"{ad}_trend"), figsize=(8, 6), dpi=dpi))
+        
+        if yillik:
+            for yil in yillar:
+                yangin, kesim, maden = self._kayip_toplamlari(birimler, [yil])
+                isler.append(GrafikIsi("kayip_pasta", {
+                    "yangin": yangin, "kesim": kesim, "maden": maden,
+                    "baslik": f"Orman Kaybı Nedenleri ({yil})",
+                }, yollar(f"yil_{yil}_kayip_pasta"), figsize=(10, 8), dpi=dpi))
+            
+            konumlu = [b for b in birimler if b in koordinatlar]
+            if konumlu and self.maden_verileri:
+                risk = analiz.risk_tablosu()
+                noktalar = {
+                    b: (koordinatlar[b]["lon"], koordinatlar[b]["lat"],
+                        float(risk.at[b, "risk_skoru"]), str(risk.at[b, "risk_seviyesi"]))
+                    for b in konumlu
+                }
+                konum = np.array([p[:2] for p in noktalar.values()])
+                # Daireler en yakın iki birim arasındaki mesafeye göre küçülür
+                aralik = np.inf
+                if len(konum) > 1:
+                    uzaklik = np.hypot(*(konum[:, None, :] - konum[None, :, :]).transpose(2, 0, 1))
+                    np.fill_diagonal(uzaklik, np.inf)
+                    aralik = uzaklik.min()
+                yaricap = float(min(0.18, aralik / 2.2))
+                isler.append(GrafikIsi("risk_haritasi", {
+                    "noktalar": noktalar,
+                    "xlim": (konum[:, 0].min() - 0.5, konum[:, 0].max() + 0.5),
+                    "ylim": (konum[:, 1].min() - 0.4, konum[:, 1].max() + 0.4),
+                    "yaricap": yaricap,
+                    "yazi_boyutu": 11 if yaricap >= 0.18 else max(5, round(yaricap / 0.18 * 11)),
+                }, yollar("risk_haritasi"), figsize=(12, 10), dpi=dpi))
+        return isler
+    
+    def rapor_paketi(
+        self,
+        klasor: str,
+        birimler: Optional[Sequence[str]] = None,
+        bicimler: Sequence[str] = ("png",),
+        isci: Optional[int] = None,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Birim ve yıl bazlı rapor paketini doğrudan PNG/SVG dosyalarına yazar.
         
-        return fig
+        Grafikler Agg arka ucuyla, süreç başına yeniden kullanılan şekil
+        şablonlarına çizilir ve `isci` süreçlik bir havuza dağıtılır
+        (varsayılan: CPU sayısı; 1 ise aynı süreçte sırayla). Etkileşimli
+        pyplot durumu ve genel rcParams değişmez.
+        
+        Args:
+            klasor: Çıktı klasörü
+            birimler: İl / ilçe / meşcere adları (varsayılan: self.iller)
+            bicimler: Dosya biçimleri ("png", "svg", ...)
+            isci: Süreç sayısı
+            **kwargs: `rapor_isleri` seçenekleri (grafikler, yillik, koordinatlar, dpi)
+            
+        Returns:
+            List[str]: Yazılan dosyalar
+        """
+        if not MATPLOTLIB_AVAILABLE:
+            print("matplotlib yüklü değil!")
+            return []
+        isler = self.rapor_isleri(klasor, birimler, bicimler, **kwargs)
+        isci = (os.cpu_count() or 1) if isci is None else isci
+        return [yol for yollar in _isleri_ciz(isler, isci) for yol in yollar]
     
     # Plotly interaktif grafikler
     def interaktif_orman_grafigi(self) -> Optional['go.Figure']:
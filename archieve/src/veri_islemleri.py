@@ -13,21 +13,30 @@ from typing import Dict, List, Optional, Tuple
 import json
 import os
 
+from gee.results import ResultStore
+
 from .config import (
     ILLER, YILLAR, 
-    IL_KOORDINATLARI, NBR_ESIK_DEGERLERI
+    IL_KOORDINATLARI, NBR_ESIK_DEGERLERI, SONUC_DEPOSU
 )
 
 
 class VeriYoneticisi:
-    """Orman verileri yönetim sınıfı"""
+    """Orman verileri yönetim sınıfı
+
+    Veriler `gee.results.ResultStore` içinde uzun biçimli, tipli sütunlarla
+    (il, ilçe, yıl, ay, ölçüm, değer) tutulur. `orman_verileri`,
+    `nbr_verileri` ve `maden_verileri` sözlükleri geriye dönük uyumluluk
+    için depodan türetilen görünümlerdir.
+    """
     
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, depo_klasoru: Optional[str] = None):
         """
         Veri yöneticisini başlat.
         
         Args:
             seed: Rastgele sayı üreteci tohumu (tekrarlanabilirlik için)
+            depo_klasoru: Parquet sonuç deposu klasörü (varsa mevcut parçalar yüklenir)
         """
         self.seed = seed
         np.random.seed(seed)
@@ -35,17 +44,56 @@ class VeriYoneticisi:
         self.iller = ILLER
         self.yillar = YILLAR
         
-        # Veri depoları
-        self.orman_verileri: Dict = {}
-        self.nbr_verileri: Dict = {}
-        self.maden_verileri: Dict = {}
-        
-        # Veri yapılarını başlat
-        for il in self.iller:
-            self.orman_verileri[il] = {}
-            self.nbr_verileri[il] = {}
+        # Veri deposu ve sözlük görünümlerinin önbelleği
+        self.depo = ResultStore(depo_klasoru)
+        self._gorunumler: Dict[str, Dict] = {}
+
+    def _gorunum(self, veri_tipi: str) -> Dict:
+        if veri_tipi not in self._gorunumler:
+            veri = self.depo.nested(veri_tipi)
+            if veri_tipi != "maden":
+                veri = {**{il: {} for il in self.iller}, **veri}
+            self._gorunumler[veri_tipi] = veri
+        return self._gorunumler[veri_tipi]
+
+    def _sozluk_yukle(self, veri_tipi: str, veri: Dict) -> None:
+        self.depo.drop(veri_tipi)
+        for il, il_verisi in veri.items():
+            if veri_tipi == "maden":
+                self.depo.append("maden", il, il_verisi)
+            else:
+                for yil, deger in il_verisi.items():
+                    self.depo.append(veri_tipi, il, deger, year=int(yil))
+        self._gorunumler.pop(veri_tipi, None)
+
+    @property
+    def orman_verileri(self) -> Dict:
+        """{il: {yil: {...}}} görünümü"""
+        return self._gorunum("orman")
+
+    @orman_verileri.setter
+    def orman_verileri(self, veri: Dict) -> None:
+        self._sozluk_yukle("orman", veri)
+
+    @property
+    def nbr_verileri(self) -> Dict:
+        """{il: {yil: {...}}} görünümü"""
+        return self._gorunum("nbr")
+
+    @nbr_verileri.setter
+    def nbr_verileri(self, veri: Dict) -> None:
+        self._sozluk_yukle("nbr", veri)
+
+    @property
+    def maden_verileri(self) -> Dict:
+        """{il: {...}} görünümü"""
+        return self._gorunum("maden")
+
+    @maden_verileri.setter
+    def maden_verileri(self, veri: Dict) -> None:
+        self._sozluk_yukle("maden", veri)
             
-    def veri_ekle(self, il: str, yil: int, veri_tipi: str, veri: Dict) -> None:
+    def veri_ekle(self, il: str, yil: int, veri_tipi: str, veri: Dict, ilce: str = "", ay: int = 0) -> None:
         """
         Dışarıdan hesaplanan gerçek veriyi ekle.
         
@@ -54,15 +102,12 @@ class VeriYoneticisi:
             yil: Yıl
             veri_tipi: "orman" veya "nbr"
             veri: Veri sözlüğü
+            ilce: İlçe / meşcere adı (boş: il geneli)
+            ay: Ay (0: yıllık)
         """
-        if veri_tipi == "orman":
-            if il not in self.orman_verileri:
-                self.orman_verileri[il] = {}
-            self.orman_verileri[il][yil] = veri
-        elif veri_tipi == "nbr":
-            if il not in self.nbr_verileri:
-                self.nbr_verileri[il] = {}
-            self.nbr_verileri[il][yil] = veri
+        if veri_tipi in ("orman", "nbr"):
+            self.depo.append(veri_tipi, il, veri, year=yil, month=ay, district=ilce)
+            self._gorunumler.pop(veri_tipi, None)
             
     def maden_verisi_ekle(self, il: str, veri: Dict) -> None:
         """
@@ -72,7 +117,8 @@ class VeriYoneticisi:
             il: İl adı
             veri: Maden veri sözlüğü
         """
-        self.maden_verileri[il] = veri
+        self.depo.append("maden", il, veri)
+        self._gorunumler.pop("maden", None)
 
     def _yangin_siddeti_sinifla(self, delta_nbr: float) -> str:
         """
@@ -103,43 +149,13 @@ class VeriYoneticisi:
             veri_tipi: "orman", "nbr" veya "maden"
             
         Returns:
-            pd.DataFrame: Tablo formatında veri
-        """
-        if veri_tipi == "orman":
-            rows = []
-            for il in self.iller:
-                for yil in self.yillar:
-                    veri = self.orman_verileri[il][yil]
-                    rows.append({
-                        "il": il,
-                        "yil": yil,
-                        **veri
-                    })
-            return pd.DataFrame(rows)
-        
-        elif veri_tipi == "nbr":
-            rows = []
-            for il in self.iller:
-                for yil in self.yillar:
-                    veri = self.nbr_verileri[il][yil]
-                    rows.append({
-                        "il": il,
-                        "yil": yil,
-                        **veri
-                    })
-            return pd.DataFrame(rows)
-        
-        elif veri_tipi == "maden":
-            rows = []
-            for il, veri in self.maden_verileri.items():
-                rows.append({
-                    "il": il,
-                    **{k: v if not isinstance(v, list) else ", ".join(v) for k, v in veri.items()}
-                })
-            return pd.DataFrame(rows)
-        
-        else:
+            pd.DataFrame: Tablo formatında veri (il, yil, ölçüm sütunları)
+        """
+        if veri_tipi not in ("orman", "nbr", "maden"):
             raise ValueError(f"Geçersiz veri tipi: {veri_tipi}")
+        index = ("province",) if veri_tipi == "maden" else ("province", "year")
+        df = self.depo.wide(veri_tipi, index=index)
+        return df.rename(columns={"province": "il", "year": "yil"})
     
     def veriyi_json_kaydet(self, dosya_yolu: str, veri_tipi: str = "orman") -> None:
         """
@@ -149,14 +165,8 @@ class VeriYoneticisi:
             dosya_yolu: Kaydedilecek dosya yolu
             veri_tipi: "orman", "nbr" veya "maden"
         """
-        veri_haritasi = {
-            "orman": self.orman_verileri,
-            "nbr": self.nbr_verileri,
-            "maden": self.maden_verileri
-        }
-        
         with open(dosya_yolu, "w", encoding="utf-8") as f:
-            json.dump(veri_haritasi[veri_tipi], f, ensure_ascii=False, indent=2)
+            json.dump(self._gorunum(veri_tipi), f, ensure_ascii=False, indent=2)
     
     def veriyi_json_yukle(self, dosya_yolu: str, veri_tipi: str = "orman") -> Dict:
         """
@@ -172,22 +182,20 @@ class VeriYoneticisi:
         with open(dosya_yolu, "r", encoding="utf-8") as f:
             veri = json.load(f)
         
-        if veri_tipi == "orman":
-            # JSON'dan yüklerken yıl anahtarlarını integer yap
-            self.orman_verileri = {
-                il: {int(yil): deger for yil, deger in yil_verileri.items()}
-                for il, yil_verileri in veri.items()
-            }
-            return self.orman_verileri
-        elif veri_tipi == "nbr":
-            self.nbr_verileri = {
-                il: {int(yil): deger for yil, deger in yil_verileri.items()}
-                for il, yil_verileri in veri.items()
-            }
-            return self.nbr_verileri
-        else:
-            self.maden_verileri = veri
-            return self.maden_verileri
+        if veri_tipi not in ("orman", "nbr"):
+            veri_tipi = "maden"
+        self._sozluk_yukle(veri_tipi, veri)
+        return self._gorunum(veri_tipi)
+
+    def parquet_kaydet(self) -> Optional[str]:
+        """
+        Bu çalıştırmada eklenen verileri depo klasörüne yeni bir Parquet
+        parçası olarak ekler (eski parçalar değişmez).
+        
+        Returns:
+            Optional[str]: Yazılan parça dosyası (depo klasörü yoksa None)
+        """
+        return self.depo.flush()
     
     def ozet_istatistikler(self) -> Dict:
         """
@@ -196,43 +204,46 @@ class VeriYoneticisi:
         Returns:
             Dict: Özet istatistikler
         """
-        ozet = {}
+        df = self.depo.frame("orman")
+        df = df[df["province"].isin(self.iller) & df["year"].isin(self.yillar) & (df["district"] == "")]
+        tablo = df.pivot_table(index=["province", "year"], columns="metric", values="value", observed=True)
+        tablo = tablo.sort_index()
+        kayip = tablo[["yangin_kaybi", "kesim_kaybi", "maden_kaybi"]].sum(axis=1)
+        alan = tablo["toplam_alan"].groupby(level="province", observed=True)
+        kayip = kayip.groupby(level="province", observed=True)
         
-        for il in self.iller:
-            alanlar = [self.orman_verileri[il][y]["toplam_alan"] for y in self.yillar]
-            kayiplar = [
-                self.orman_verileri[il][y]["yangin_kaybi"] + 
-                self.orman_verileri[il][y]["kesim_kaybi"] + 
-                self.orman_verileri[il][y]["maden_kaybi"]
-                for y in self.yillar
-            ]
-            
-            ozet[il] = {
-                "ortalama_alan": round(np.mean(alanlar), 2),
-                "std_alan": round(np.std(alanlar), 2),
-                "min_alan": round(np.min(alanlar), 2),
-                "max_alan": round(np.max(alanlar), 2),
-                "toplam_kayip": round(np.sum(kayiplar), 2),
-                "ortalama_yillik_kayip": round(np.mean(kayiplar), 2),
-                "degisim_yuzdesi": round(
-                    (alanlar[-1] - alanlar[0]) / alanlar[0] * 100, 2
-                )
-            }
+        sonuc = pd.DataFrame({
+            "ortalama_alan": alan.mean(),
+            "std_alan": alan.std(ddof=0),
+            "min_alan": alan.min(),
+            "max_alan": alan.max(),
+            "toplam_kayip": kayip.sum(),
+            "ortalama_yillik_kayip": kayip.mean(),
+            "degisim_yuzdesi": (alan.last() - alan.first()) / alan.first() * 100,
+        }).round(2)
         
-        return ozet
+        return {
+            il: {k: float(v) for k, v in sonuc.loc[il].items()}
+            for il in self.iller if il in sonuc.index
+        }
 
 
 def veri_yukle_veya_olustur(veri_klasoru: str = "data") -> VeriYoneticisi:
     """
     Veri dosyaları varsa yükle, yoksa oluştur.
     
+    Önce `<veri_klasoru>/sonuclar` Parquet deposuna bakılır; depo boşsa eski
+    JSON dosyaları okunur (sonraki `parquet_kaydet` çağrısı bunları depoya taşır).
+    
     Args:
         veri_klasoru: Veri dosyalarının bulunduğu klasör
         
     Returns:
         VeriYoneticisi: Verilerle doldurulmuş yönetici
     """
-    yonetici = VeriYoneticisi()
+    yonetici = VeriYoneticisi(depo_klasoru=os.path.join(veri_klasoru, SONUC_DEPOSU))
+    if yonetici.depo.datasets():
+        return yonetici
     
     orman_dosya = os.path.join(veri_klasoru, "orman_verileri.json")
     nbr_dosya = os.path.join(veri_klasoru, "nbr_verileri.json")
@@ -0,0 +1,71 @@
+"""Şiddet sınıflandırma kıyaslaması: maske-topla yöntemi vs aralık indeksi + LUT.
+
+Eski `classify_metric` mantığının (her sınıf için boolean maske, kodla çarp,
+topla) NumPy karşılığı ile `gee.change.classify_array(_multi)` karşılaştırılır.
+
+Kullanım:
+    python benchmarks/bench_classify.py --size 4096 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gee.change import SEVERITY_SCHEMES, classify_array, classify_array_multi  # noqa: E402
+
+
+def masks_and_add(x: np.ndarray, t0: float, t1: float, t2: float) -> np.ndarray:
+    """Eski yaklaşım: c0*0 + c1*2 + c2*3 + c3*4."""
+    c0 = x < t0
+    c1 = (x >= t0) & (x < t1)
+    c2 = (x >= t1) & (x < t2)
+    c3 = x >= t2
+    return (c0 * 0 + c1 * 2 + c2 * 3 + c3 * 4).astype(np.uint8)
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=4096)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-0.5, 1.5, (args.size, args.size)).astype(np.float32)
+    rbr = SEVERITY_SCHEMES["RBR"]
+
+    ref = masks_and_add(x, *rbr.thresholds)
+    assert np.array_equal(ref, classify_array(x, "RBR")), "Sonuçlar farklı!"
+
+    t_old = _best(lambda: masks_and_add(x, *rbr.thresholds), args.repeat)
+    t_lut = _best(lambda: classify_array(x, "RBR"), args.repeat)
+    t_old2 = _best(
+        lambda: (masks_and_add(x, *rbr.thresholds), masks_and_add(x, 0.10, 0.27, 0.44)), args.repeat
+    )
+    t_multi = _best(lambda: classify_array_multi(x, ("RBR", "dNBR_USGS")), args.repeat)
+
+    mpx = x.size / 1e6
+    print(f"Raster: {args.size}x{args.size} ({mpx:.1f} Mpx)")
+    print(f"masks-and-add (1 şema) : {t_old * 1e3:8.1f} ms")
+    print(f"LUT           (1 şema) : {t_lut * 1e3:8.1f} ms  (x{t_old / t_lut:.1f})")
+    print(f"masks-and-add (2 şema) : {t_old2 * 1e3:8.1f} ms")
+    print(f"LUT           (2 şema) : {t_multi * 1e3:8.1f} ms  (x{t_old2 / t_multi:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""İçe aktarma süresi kıyaslaması: `gee.*` modüllerinin soğuk başlangıç maliyeti.
+
+Her modül ayrı, temiz bir Python sürecinde `-X importtime` ile içe aktarılır;
+modülün kümülatif süresi ve süreç içinde gerçekten yüklenen ağır
+bağımlılıklar (ee, folium, scipy, rasterio, ...) raporlanır. Yalnızca yerel
+istatistik hesaplayan modüller ağır bağımlılık yüklememelidir.
+
+Kullanım:
+    python benchmarks/bench_import.py --repeat 5
+    python benchmarks/bench_import.py --modules gee.trend gee.pipeline
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = (
+    "gee.raster",
+    "gee.trend",
+    "gee.change",
+    "gee.disturbance",
+    "gee.patches",
+    "gee.polygonize",
+    "gee.aoi",
+    "gee.timeseries",
+    "gee.visualize",
+    "gee.pipeline",
+)
+HEAVY = ("ee", "folium", "branca", "requests", "scipy", "rasterio", "shapely", "pandas")
+
+_SNIPPET = "import sys, {mod}; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+
+
+def _import_once(module: str) -> tuple:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SNIPPET.format(mod=module, heavy=HEAVY)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "?"
+        return None, last
+    # Satır biçimi: "import time: self [us] | cumulative | imported package"
+    pattern = re.compile(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*" + re.escape(module) + r"\s*$")
+    for line in proc.stderr.splitlines():
+        m = pattern.search(line)
+        if m:
+            return int(m.group(1)) / 1000.0, proc.stdout.strip()
+    return None, proc.stdout.strip()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modules", nargs="*", default=list(DEFAULT_MODULES))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'module':<18} {'import ms':>10}  loaded heavy deps")
+    for module in args.modules:
+        best, info = None, ""
+        for _ in range(args.repeat):
+            ms, info = _import_once(module)
+            if ms is None:
+                break
+            best = ms if best is None else min(best, ms)
+        if best is None:
+            print(f"{module:<18} {'hata':>10}  {info}")
+        else:
+            print(f"{module:<18} {best:>10.1f}  {info or '-'}")
+
+
+if __name__ == "__main__":
+    main()
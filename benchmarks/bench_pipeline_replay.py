@@ -0,0 +1,62 @@
+"""`run_pipeline` kıyaslaması: kaydedilmiş bir EE kasetiyle ağsız çalıştırma.
+
+Varsayılan kaset, replay testlerinin kullandığı `tests/cassettes/karabuk.json.gz`
+(senaryo: `tests/replay_scenarios.karabuk_pipeline`). `--record --project`
+aynı senaryoyu canlı hesapla yeniden kaydeder. `--latency-scale 1` kayıttaki
+sunucu sürelerini (istek katmanının eşzamanlılık sınırı altında) yeniden
+oynatır; 0 yalnızca istemci tarafı maliyeti (ifade grafiği kurma,
+serileştirme, yerel işlemler, dosya yazımı) ölçer.
+
+Kullanım:
+    python benchmarks/bench_pipeline_replay.py --repeat 3 --latency-scale 1
+    python benchmarks/bench_pipeline_replay.py --cassette my.json.gz --record --project my-proj
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+sys.path.insert(0, ROOT)
+
+import replay_scenarios as sc  # noqa: E402
+from gee import client  # noqa: E402
+from gee.cassette import use_cassette  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cassette", default=sc.KARABUK_CASSETTE)
+    ap.add_argument("--record", action="store_true", help="Canlı hesapla kaseti (yeniden) kaydet")
+    ap.add_argument("--project", default=None)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--latency-scale", type=float, default=0.0)
+    args = ap.parse_args()
+    if args.record and os.path.abspath(args.cassette) == sc.KARABUK_CASSETTE:
+        ap.error("Test kaseti tests/record_cassettes.py ile kaydedilir; --cassette ile başka bir yol verin.")
+
+    mode = "record" if args.record else "replay"
+    repeat = 1 if args.record else args.repeat
+    times = []
+    for _ in range(repeat):
+        client.default_layer().metrics.reset()
+        with tempfile.TemporaryDirectory() as out_dir:
+            with use_cassette(args.cassette, mode=mode, latency=args.latency, latency_scale=args.latency_scale) as cas:
+                t0 = time.perf_counter()
+                sc.karabuk_pipeline(out_dir, project=args.project)
+                times.append(time.perf_counter() - t0)
+    print(f"mode={mode} requests={len(cas)} hits={cas.hits} recorded={cas.recorded}")
+    print(f"run_pipeline: best {min(times):.2f}s  mean {sum(times) / len(times):.2f}s  ({len(times)} runs)")
+    print(f"{'op':<20} {'calls':>6} {'mean s':>8}")
+    for op, row in sorted(client.metrics().items()):
+        print(f"{op:<20} {row['calls']:>6} {row['mean_seconds']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Birim bazlı rapor paketi kıyaslaması (arşivdeki `Gorsellestiric`).
+
+Eski yol: grafik başına `plt.subplots` + `tight_layout` + `savefig(bbox_inches="tight")`
++ `plt.close`, tek süreçte sırayla. Yeni yol: `Gorsellestiric.rapor_paketi`
+(Agg, süreç başına yeniden kullanılan şekil şablonları, süreç havuzu).
+
+Kullanım:
+    python benchmarks/bench_report.py --units 50 --formats png svg --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "archieve"))
+sys.path.insert(0, ROOT)
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from src import gorsellestirme as g  # noqa: E402
+from src.config import RENKLER, YILLAR  # noqa: E402
+
+
+def synthetic(units: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    orman, nbr, maden, koord = {}, {}, {}, {}
+    for i in range(units):
+        ad = f"Ilce_{i:03d}"
+        baz = rng.uniform(5e3, 5e4)
+        orman[ad] = {
+            y: {
+                "toplam_alan": baz - k * rng.uniform(0, 200),
+                "yangin_kaybi": rng.uniform(0, 80),
+                "kesim_kaybi": rng.uniform(0, 120),
+                "maden_kaybi": rng.uniform(0, 40),
+                "dogal_artis": rng.uniform(0, 60),
+            }
+            for k, y in enumerate(YILLAR)
+        }
+        nbr[ad] = {y: {"delta_nbr": rng.uniform(0, 0.7)} for y in YILLAR}
+        maden[ad] = {"etki_alani_ha": rng.uniform(0, 8000)}
+        koord[ad] = {"lon": 31.0 + (i % 10) * 0.25, "lat": 40.9 + (i // 10) * 0.2}
+    return orman, nbr, maden, koord
+
+
+def legacy(isler) -> None:
+    """Eski yol: her grafik için yeni pyplot şekli."""
+    with g._stil():
+        for is_ in isler:
+            fig, ax = plt.subplots(figsize=is_.figsize, facecolor=RENKLER["arkaplan"])
+            g._CIZICILER[is_.tur](ax, RENKLER, **is_.veri)
+            fig.tight_layout()
+            for yol in is_.yollar:
+                fig.savefig(yol, dpi=is_.dpi, facecolor=RENKLER["arkaplan"], bbox_inches="tight")
+            plt.close(fig)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--units", type=int, default=50)
+    ap.add_argument("--formats", nargs="+", default=["png"])
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--dpi", type=int, default=150)
+    args = ap.parse_args()
+
+    orman, nbr, maden, koord = synthetic(args.units)
+    gorsel = g.Gorsellestiric(orman, nbr, maden)
+    birimler = list(orman)
+
+    with tempfile.TemporaryDirectory() as d:
+        isler = gorsel.rapor_isleri(d, birimler, args.formats, koordinatlar=koord, dpi=args.dpi)
+        t = time.perf_counter()
+        legacy(isler)
+        t_legacy = time.perf_counter() - t
+
+    with tempfile.TemporaryDirectory() as d:
+        t = time.perf_counter()
+        yazilan = gorsel.rapor_paketi(d, birimler, args.formats, isci=args.workers, koordinatlar=koord, dpi=args.dpi)
+        t_new = time.perf_counter() - t
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"units={args.units} charts={len(isler)} files={len(yazilan)} workers={workers}")
+    print(f"legacy pyplot : {t_legacy:7.2f}s  ({t_legacy / len(isler) * 1e3:.0f} ms/chart)")
+    print(f"rapor_paketi  : {t_new:7.2f}s  ({t_new / len(isler) * 1e3:.0f} ms/chart)  x{t_legacy / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
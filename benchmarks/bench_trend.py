@@ -0,0 +1,101 @@
+"""Piksel bazında Mann-Kendall + Sen's slope kıyaslaması.
+
+Eski `OrmanAnalizi.mann_kendall_testi` mantığı (seri başına iç içe Python
+döngüleri) ile `gee.trend.mann_kendall_stack` / `trend_local` karşılaştırılır.
+Önce uzun serilerdeki `sens_slope` seçim yolu, sırasız ve tekrarlı zaman
+damgalarında tüm ikili eğimlerin medyanıyla doğrulanır.
+
+Kullanım:
+    python benchmarks/bench_trend.py --size 2048 --years 6 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gee.raster import save_raster  # noqa: E402
+from gee.trend import SEN_DIRECT_MAX, mann_kendall_stack, sens_slope, trend_local  # noqa: E402
+
+
+def loop_mk(series: np.ndarray) -> tuple:
+    """Eski yaklaşım: tek seri, iç içe döngüler."""
+    n = len(series)
+    s = 0
+    slopes = []
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            s += np.sign(series[j] - series[i])
+            slopes.append((series[j] - series[i]) / (j - i))
+    return s, np.median(slopes)
+
+
+def brute_sens(y: np.ndarray, t: np.ndarray) -> float:
+    """Tüm ikili eğimlerin medyanı (aynı zamanlı çiftler hariç)."""
+    i, j = np.triu_indices(len(y), 1)
+    ok = t[i] != t[j]
+    return float(np.median((y[j] - y[i])[ok] / (t[j] - t[i])[ok]))
+
+
+def check_sens_slope(trials: int = 20, seed: int = 0) -> None:
+    """Seçim yolu (n > SEN_DIRECT_MAX) için kaba kuvvet karşılaştırması."""
+    rng = np.random.default_rng(seed)
+    for _ in range(trials):
+        n = int(rng.integers(SEN_DIRECT_MAX + 1, 4 * SEN_DIRECT_MAX))
+        cases = {
+            "sırasız": rng.permutation(n).astype(float),
+            "tekrarlı": rng.integers(0, max(2, n // 4), n).astype(float),
+        }
+        for name, t in cases.items():
+            for y in (0.3 * t + rng.normal(0, 5, n), rng.integers(0, 4, n).astype(float)):
+                got, want = sens_slope(y, t), brute_sens(y, t)
+                assert np.isclose(got, want), f"sens_slope ({name}, n={n}): {got} != {want}"
+    print(f"sens_slope doğrulaması: {trials * 4} seri, kaba kuvvetle aynı")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=2048)
+    ap.add_argument("--years", type=int, default=6)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--loop-pixels", type=int, default=20000)
+    args = ap.parse_args()
+
+    check_sens_slope()
+
+    rng = np.random.default_rng(0)
+    shape = (args.years, args.size, args.size)
+    x = (rng.uniform(0.2, 0.8, shape) + rng.normal(0, 0.02, shape).cumsum(axis=0)).astype(np.float32)
+    mpx = args.size * args.size / 1e6
+
+    flat = x.reshape(args.years, -1)[:, : args.loop_pixels]
+    t = time.perf_counter()
+    for k in range(flat.shape[1]):
+        loop_mk(flat[:, k])
+    t_loop = (time.perf_counter() - t) / flat.shape[1] * args.size * args.size
+
+    t = time.perf_counter()
+    mann_kendall_stack(x[:, :1024, :1024])
+    t_vec = (time.perf_counter() - t) * args.size * args.size / (1024 * 1024)
+
+    with tempfile.TemporaryDirectory() as d:
+        path = save_raster(os.path.join(d, "nbr.npy"), x, "NBR")
+        t = time.perf_counter()
+        trend_local(path, os.path.join(d, "trend"), workers=args.workers)
+        t_par = time.perf_counter() - t
+
+    print(f"Yığın: {shape} ({mpx:.1f} Mpx, {args.years} yıl)")
+    print(f"Python döngüsü (tahmini): {t_loop:10.1f} s")
+    print(f"Vektörize (tek süreç)   : {t_vec:10.1f} s  (x{t_loop / t_vec:.0f})")
+    print(f"trend_local (paralel)   : {t_par:10.1f} s  ({mpx / t_par:.2f} Mpx/s)")
+
+
+if __name__ == "__main__":
+    main()
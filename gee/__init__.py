@@ -2,19 +2,45 @@
 
 Modules:
 - gee.utils: ee_init, ensure_dir, load_aoi_geojson
-- gee.aoi: get_aoi from optional GeoJSON path
-- gee.preprocess: Sentinel-2 composite preparation
-- gee.indices: NDVI, NBR band helpers
-- gee.change: dNDVI/dNBR and severity classification
-- gee.visualize: vis params, folium save, basic stats/CSV
+- gee.client: single EE request layer (error classes, backoff + jitter, global concurrency cap, metrics)
+- gee.cassette: record/replay cassettes for EE requests (offline CI runs and benchmarks)
+- gee.aoi: get_aoi / resolve_aoi (work geometry + exact mask), forest-weighted quadtree tiling and map_tiles
+- gee.boundaries: local FAO GAUL province/district store (name normalization, simplification levels)
+- gee.preprocess: Sentinel-2 composite preparation (single period + shared annual set)
+- gee.indices: spectral index registry (EE expression + NumPy kernels)
+- gee.change: dNDVI/dNBR (pairwise + annual stack) and severity classification
+- gee.patches: burn patch labelling and min_patch_ha filtering (EE + tiled local)
+- gee.fire_zones: largest burn cluster bounding boxes (EE + local)
+- gee.trend: batch/pixel-wise Mann-Kendall (tie + autocorrelation corrected) and Sen's slope
+- gee.disturbance: vectorized abrupt-loss breakpoints (year, magnitude, post-event slope)
+- gee.timeseries: paged, concurrent, scene-cached regional time series extraction
+- gee.vectors: streaming GeoJSON/GPKG reader, geometry cleaning, STRtree layers, bounded EE chunks
+- gee.attribution: STRtree-indexed loss cause attribution (fire / mining / logging)
+- gee.polygonize: streaming burn patch polygons with per-patch stats (GeoJSON/GPKG)
+- gee.results: columnar (long format) results store with typed columns and append-only Parquet parts
+- gee.raster: scaled int16/uint8 raster encoding, .npy cache/export format
+- gee.visualize: vis params, folium save, single-request region stats (typed, per-band errors), CSV
 """
 
 __all__ = [
     "utils",
+    "client",
+    "cassette",
     "aoi",
+    "boundaries",
     "preprocess",
     "indices",
     "change",
+    "patches",
+    "fire_zones",
+    "polygonize",
+    "vectors",
+    "attribution",
+    "trend",
+    "disturbance",
+    "timeseries",
+    "results",
+    "raster",
     "visualize",
 ]
 
@@ -0,0 +1,55 @@
+"""Ağır bağımlılıkların (ee, folium, scipy, rasterio, ...) gecikmeli içe aktarılması.
+
+`ee = lazy_import("ee")` modül düzeyinde bir vekil oluşturur; gerçek modül
+ilk öznitelik erişiminde (örn. `ee.Image(...)`) yüklenir. Böylece yalnızca
+yerel istatistik hesaplayan bir süreç `gee.*` modüllerini içe aktarırken
+Earth Engine, harita ve GDAL yığınlarının başlangıç maliyetini ödemez.
+Tip açıklamaları `from __future__ import annotations` sayesinde hiç
+değerlendirilmediği için vekili tetiklemez.
+"""
+
+from __future__ import annotations
+
+from types import ModuleType
+from typing import Optional, Union
+import importlib
+import sys
+
+
+class LazyModule:
+    """İlk öznitelik erişiminde `importlib.import_module(name)` çağıran vekil."""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> Union[ModuleType, LazyModule]:
+    """Modül zaten yüklüyse kendisini, değilse gecikmeli vekilini döndürür."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def is_loaded(module: Union[ModuleType, LazyModule]) -> bool:
+    """Vekilin (veya modülün) gerçekten içe aktarılıp aktarılmadığı.
+
+    Modül süreçte başka bir yoldan (örn. doğrudan `import ee`) yüklenmişse
+    vekil henüz hiç kullanılmamış olsa da yüklü sayılır.
+    """
+    if not isinstance(module, LazyModule):
+        return True
+    return module._module is not None or module._name in sys.modules
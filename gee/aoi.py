@@ -1,26 +1,67 @@
 from __future__ import annotations
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+import json
+import os
 
-import ee
+from ._lazy import lazy_import
+from .boundaries import SIMPLIFY_LEVELS, BoundaryStore, default_store
+from .client import get_info
+from .utils import LARGE_GEOJSON_BYTES, load_aoi_geojson
+from .vectors import load_union
 
-from .utils import load_aoi_geojson
+ee = lazy_import("ee")
+np = lazy_import("numpy")
+shapely = lazy_import("shapely")
 
+# Batı Karadeniz çalışma alanını oluşturan iller
+WESTERN_BLACK_SEA_PROVINCES = ("Karabük", "Bartın", "Zonguldak")
 
-def get_karabuk_province() -> ee.Geometry:
-    """Karabük il sınırlarını FAO/GAUL verisetinden getir."""
-    dataset = ee.FeatureCollection("FAO/GAUL/2015/level1")
-    karabuk = dataset.filter(ee.Filter.eq("ADM1_NAME", "Karabuk"))
-    return karabuk.geometry()
+# `get_aoi` / `resolve_aoi` için adlandırılmış il AOI'leri
+NAMED_AOIS = {
+    "KARABUK_PROVINCE": ("Karabük",),
+    "WESTERN_BLACK_SEA": WESTERN_BLACK_SEA_PROVINCES,
+}
 
+WORK_MODES = ("bbox", "simplified", "exact")
 
+# Karo yükü için orman sayılan ESA WorldCover sınıfları (10: ağaç, 20: çalı)
+FOREST_CLASSES = (10, 20)
 
-def get_western_black_sea_region() -> ee.Geometry:
+BBox = Tuple[float, float, float, float]
+T = TypeVar("T")
+
+def get_provinces(
+    names,
+    level: int = 1,
+    simplify: Optional[str] = None,
+    store: Optional[BoundaryStore] = None,
+) -> ee.Geometry:
+    """İl (level=1) veya ilçe (level=2) sınırlarının birleşimini yerel depodan getir.
+
+    İlk çağrıda sınırlar FAO/GAUL'dan bir kez çekilip diske yazılır;
+    sonraki çağrılarda isimler yerelde çözülür (bkz. `gee.boundaries`).
+    `simplify` verilmezse geometri sunucudaki GAUL birimlerinden kodla
+    süzülür; istek grafiği yalnızca birim kodlarını taşır. Bir
+    `SIMPLIFY_LEVELS` düzeyi verilirse o düzeydeki yerel koordinatlar
+    isteğe gömülür.
+    """
+    store = store or default_store()
+    if simplify is None:
+        return store.ee_collection(names, level=level).geometry()
+    return store.ee_geometry(names, level=level, simplify=simplify)
+
+
+def get_karabuk_province(store: Optional[BoundaryStore] = None) -> ee.Geometry:
+    """Karabük il sınırlarını FAO/GAUL verisetinden (yerel önbellek) getir."""
+    return get_provinces("Karabük", store=store)
+
+
+def get_western_black_sea_region(store: Optional[BoundaryStore] = None) -> ee.Geometry:
     """Karabük, Bartın ve Zonguldak il sınırlarını birleştirerek getir."""
-    dataset = ee.FeatureCollection("FAO/GAUL/2015/level1")
-    # FAO/GAUL isimleri genelde ASCII karakterlerdir.
-    region = dataset.filter(ee.Filter.inList("ADM1_NAME", ["Karabuk", "Bartin", "Zonguldak"]))
-    return region.geometry()
+    return get_provinces(WESTERN_BLACK_SEA_PROVINCES, store=store)
 
 
 def get_aoi(path: Optional[str] = None) -> ee.Geometry:
@@ -43,3 +84,246 @@ def get_aoi(path: Optional[str] = None) -> ee.Geometry:
     # Fallback: approx Karabük bbox
     # Karabük ili yaklaşık sınırlar: 32.3E–33.2E, 41.0N–41.7N
     return ee.Geometry.BBox(32.3, 41.0, 33.2, 41.7)
+
+
+@dataclass
+class AOI:
+    """Hafif çalışma geometrisi + yalnızca son maskede kullanılan kesin sınır.
+
+    `work` koleksiyon filtreleme, kırpma, indirgeme ve küçük resim/harita
+    isteklerinde kullanılır. Bu bir dikdörtgen ya da kesin sınırı kapsayan
+    sadeleştirilmiş bir poligondur. Kesin sınır (`boundary`) yalnızca
+    `mask()` / `apply()` ile raster maske olarak uygulanır. Böylece AOI
+    içindeki sonuçlar değişmez; istekler küçülür ve sunucudaki kırpma ucuzlar.
+    """
+
+    work: ee.Geometry
+    boundary: ee.FeatureCollection
+
+    @property
+    def exact(self) -> ee.Geometry:
+        """Kesin sınır geometrisi (örn. harita üzerindeki sınır çizgisi için)."""
+        return self.boundary.geometry()
+
+    def mask(self) -> ee.Image:
+        """Kesin sınırın 0/1 raster maskesi (poligon boyama, kırpma yok)."""
+        return ee.Image(0).byte().paint(self.boundary, 1).rename("aoi")
+
+    def apply(self, image: ee.Image) -> ee.Image:
+        """Görüntüyü kesin sınırın dışında maskeler."""
+        return image.updateMask(self.mask())
+
+
+def _planar(geom) -> ee.Geometry:
+    # Çalışma geometrisi düzlemsel kenarlı olmalı; jeodezik kenarlar kutudan taşar
+    return ee.Geometry(shapely.geometry.mapping(geom), None, False)
+
+
+def _read_geojson_shape(path: str):
+    """GeoJSON dosyasını (Feature / FeatureCollection / geometri / bbox) shapely olarak okur.
+
+    `LARGE_GEOJSON_BYTES`'tan büyük dosyalar `load_aoi_geojson` ile aynı
+    şekilde akışla okunup birleştirilir (tek `json.load` yok).
+    """
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.getsize(path) > LARGE_GEOJSON_BYTES:
+        return load_union(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            gj = json.load(f)
+        t = gj.get("type")
+        if t == "FeatureCollection" or isinstance(gj.get("features"), list):
+            geoms = [shapely.geometry.shape(f["geometry"]) for f in gj["features"] if f.get("geometry")]
+            return shapely.union_all(geoms) if geoms else None
+        if t == "Feature":
+            gj = gj.get("geometry") or {"bbox": gj.get("bbox")}
+        if gj.get("type"):
+            return shapely.geometry.shape(gj)
+        if gj.get("bbox"):
+            return shapely.box(*gj["bbox"])
+    except Exception:
+        return None
+    return None
+
+
+def _work_shape(geom, work: str, simplify: str):
+    if work == "bbox":
+        return shapely.box(*geom.bounds)
+    if work == "simplified":
+        return _covering(geom.simplify(SIMPLIFY_LEVELS[simplify], preserve_topology=True), simplify)
+    return geom
+
+
+def _covering(simplified, simplify: str):
+    # Sadeleştirme sapması ~`tol` (kapalı halkalarda biraz aşabilir); 2*tol tampon
+    # kesin sınırı kapsar. Fazlalık önemsizdir, kesin sınır zaten maskeyle uygulanır.
+    return simplified.buffer(2 * SIMPLIFY_LEVELS[simplify], join_style="mitre")
+
+
+def resolve_aoi(
+    path: Optional[str] = None,
+    work: str = "bbox",
+    simplify: str = "medium",
+    store: Optional[BoundaryStore] = None,
+) -> AOI:
+    """`get_aoi` ile aynı girdilerden iki katmanlı `AOI` üretir.
+
+    Args:
+        path: GeoJSON yolu veya "KARABUK_PROVINCE" / "WESTERN_BLACK_SEA"
+        work: Çalışma geometrisi: "bbox" (dikdörtgen), "simplified"
+            (`simplify` toleransıyla sadeleştirilip tamponlanmış poligon) veya
+            "exact" (kesin sınırın kendisi)
+        simplify: `gee.boundaries.SIMPLIFY_LEVELS` anahtarı
+
+    Adlandırılmış il AOI'lerinde kesin sınır sunucudaki GAUL koleksiyonundan
+    kodla süzülür; istek yalnızca birkaç sayı taşır.
+    """
+    if work not in WORK_MODES:
+        raise ValueError(f"Bilinmeyen çalışma geometrisi: {work} ({', '.join(WORK_MODES)})")
+
+    names = NAMED_AOIS.get(path) if path else None
+    if names:
+        store = store or default_store()
+        if work == "bbox":
+            geom = shapely.box(*store.bounds(names))
+        elif work == "simplified":
+            geom = _covering(store.geometry(names, simplify=simplify), simplify)
+        else:
+            geom = store.geometry(names)
+        return AOI(_planar(geom), store.ee_collection(names))
+
+    geom = _read_geojson_shape(path) if path else None
+    if geom is None:
+        g = get_aoi(path)
+        return AOI(g, ee.FeatureCollection([ee.Feature(g)]))
+    exact = ee.Geometry(shapely.geometry.mapping(geom))
+    return AOI(_planar(_work_shape(geom, work, simplify)), ee.FeatureCollection([ee.Feature(exact)]))
+
+
+@dataclass
+class Tile:
+    """Dörtlü ağaç karosu: (xmin, ymin, xmax, ymax) kutusu, derinlik ve orman yükü (ha)."""
+
+    bbox: BBox
+    depth: int
+    forest_ha: float
+
+    def to_ee(self) -> ee.Geometry:
+        return ee.Geometry.Rectangle(list(self.bbox), None, False)
+
+
+def quadtree_tiles(
+    weights: np.ndarray,
+    bbox: BBox,
+    max_weight: float,
+    max_depth: int = 6,
+    drop_empty: bool = True,
+) -> List[Tile]:
+    """Ağırlık ızgarasını (satır 0 = kuzey) toplam ağırlığa göre dörtlü ağaca böler.
+
+    Ağırlığı `max_weight` üzerindeki karolar `max_depth`e kadar dörde bölünür;
+    ormanın seyrek olduğu (deniz, yerleşim) yerlerde karolar büyük kalır.
+    `drop_empty` ise ağırlığı sıfır olan karolar atlanır. Karolar üst üste
+    binmez ve birleşimleri (atılanlar dahil) `bbox`'ı tam kaplar.
+    """
+    w = np.nan_to_num(np.asarray(weights, dtype=np.float64))
+    rows, cols = w.shape
+    # 2B önek toplamı: herhangi bir dikdörtgenin ağırlığı O(1)
+    csum = np.zeros((rows + 1, cols + 1))
+    csum[1:, 1:] = w.cumsum(0).cumsum(1)
+    xmin, ymin, xmax, ymax = bbox
+    dx, dy = (xmax - xmin) / cols, (ymax - ymin) / rows
+
+    tiles: List[Tile] = []
+    stack = [(0, rows, 0, cols, 0)]
+    while stack:
+        r0, r1, c0, c1, depth = stack.pop()
+        total = csum[r1, c1] - csum[r0, c1] - csum[r1, c0] + csum[r0, c0]
+        if drop_empty and total <= 0:
+            continue
+        if total > max_weight and depth < max_depth and (r1 - r0 > 1 or c1 - c0 > 1):
+            rm, cm = (r0 + r1 + 1) // 2, (c0 + c1 + 1) // 2
+            for a, b in ((r0, rm), (rm, r1)):
+                for c, d in ((c0, cm), (cm, c1)):
+                    if b > a and d > c:
+                        stack.append((a, b, c, d, depth + 1))
+            continue
+        box_ = (xmin + c0 * dx, ymax - r1 * dy, xmin + c1 * dx, ymax - r0 * dy)
+        tiles.append(Tile(box_, depth, float(total)))
+    # Kuzeybatıdan güneydoğuya kararlı sıra
+    return sorted(tiles, key=lambda t: (-t.bbox[3], t.bbox[0]))
+
+
+def forest_density_grid(
+    aoi: Union[AOI, ee.Geometry],
+    scale: float = 1000,
+    classes: Sequence[int] = FOREST_CLASSES,
+) -> Tuple[np.ndarray, BBox]:
+    """AOI içindeki orman alanının (ha) kaba ızgarasını ve kutusunu tek istekle döndürür."""
+    region = aoi.work if isinstance(aoi, AOI) else aoi
+    wc = ee.ImageCollection("ESA/WorldCover/v200").first()
+    forest = wc.remap(list(classes), [1] * len(classes), 0)
+    if isinstance(aoi, AOI):
+        forest = forest.multiply(aoi.mask())
+    grid = (
+        forest.multiply(ee.Image.pixelArea()).divide(10000.0)
+        .reduceResolution(ee.Reducer.sum(), maxPixels=65535)
+        .reproject(ee.Projection("EPSG:4326").atScale(scale))
+        .rename("forest_ha")
+    )
+    bounds = region.bounds(1)
+    info = get_info(ee.Dictionary({
+        "bounds": bounds.coordinates(),
+        "grid": grid.sampleRectangle(region=bounds, defaultValue=0).get("forest_ha"),
+    }), op="forest_grid")
+    ring = info["bounds"][0]
+    xs, ys = [p[0] for p in ring], [p[1] for p in ring]
+    return np.asarray(info["grid"], dtype=np.float64), (min(xs), min(ys), max(xs), max(ys))
+
+
+def tile_aoi(
+    aoi: Union[AOI, ee.Geometry],
+    max_forest_ha: float = 50000,
+    max_depth: int = 6,
+    scale: float = 1000,
+    drop_empty: bool = True,
+) -> List[Tile]:
+    """AOI'yi orman yüküne göre uyarlamalı karolara böler.
+
+    Her karoda en fazla ~`max_forest_ha` orman/çalı (WorldCover 10/20) kalacak
+    şekilde yoğun ormanlık yerler inceltilir. Böylece her isteğin yükü
+    öngörülebilir olur ve `map_tiles` ile paralel işlenebilir.
+    """
+    grid, bbox = forest_density_grid(aoi, scale=scale)
+    if drop_empty:
+        # Izgara hizası kaba olduğundan komşu hücreye taşan ormanı kaybetmemek için
+        # ağırlıklar bir hücre genişletilerek sıfır testi yapılır
+        padded = np.pad(grid, 1)
+        near = np.max([padded[i:i + grid.shape[0], j:j + grid.shape[1]] for i in range(3) for j in range(3)], axis=0)
+        grid = np.where((grid <= 0) & (near > 0), 1e-9, grid)
+    return quadtree_tiles(grid, bbox, max_forest_ha, max_depth=max_depth, drop_empty=drop_empty)
+
+
+def map_tiles(
+    fn: Callable[[Tile], T],
+    tiles: Sequence[Tile],
+    workers: int = 4,
+    merge: Optional[Callable[[List[T]], Any]] = None,
+):
+    """`fn`'i karolar üzerinde sınırlı eşzamanlılıkla çalıştırır (EE istekleri G/Ç beklemesidir).
+
+    Sonuçlar karo sırasıyla döner; `merge` verilirse birleştirilmiş sonuç döner.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(fn, tiles))
+    return merge(results) if merge is not None else results
+
+
+def merge_sums(results: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """Karo sonuçlarındaki (örn. sınıf alanları) sayısal değerleri anahtar bazında toplar."""
+    out: Dict[str, float] = {}
+    for res in results:
+        for k, v in (res or {}).items():
+            out[k] = out.get(k, 0.0) + v
+    return out
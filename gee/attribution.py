@@ -0,0 +1,173 @@
+"""Orman kaybı yamalarının nedene (yangın / kesim / maden) göre ayrıştırılması.
+
+Kayıp yamaları (örn. `gee.polygonize` çıktısı) yardımcı vektör katmanlarıyla
+karşılaştırılır:
+- MTA maden ruhsat poligonları
+- yangın sıcak noktaları (FIRMS/VIIRS noktaları)
+- meşcere poligonları (opsiyonel filtre ile, örn. kesim planlananlar)
+
+Katmanlar `gee.vectors.VectorLayer` olarak (akışla) yüklenir. Aday
+eşleşmeler `shapely.STRtree` ile toplu sorgulanır. Kesişim alanları yalnızca
+bu aday çiftler için vektörize hesaplanır; tüm yama x poligon çiftleri
+hiçbir zaman denenmez. Her yama `AttributionRules` sırasıyla
+(yangın > maden > kesim > bilinmiyor) etiketlenir ve örtüşme oranları
+özelliklerine eklenir.
+
+Tüm katmanlar aynı, metrik (projeksiyonlu) CRS'te olmalıdır; mesafe ve
+alanlar bu CRS biriminde hesaplanır.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+from ._lazy import lazy_import
+from .vectors import VectorLayer
+
+shapely = lazy_import("shapely")
+
+CAUSES = ("fire", "mining", "logging", "unknown")
+
+# attribute_patches'in eklediği alanların GPKG tipleri
+ATTRIBUTION_FIELDS = {
+    "cause": "str",
+    "fire_hotspots": "int",
+    "mining_overlap": "float",
+    "logging_overlap": "float",
+    "mining_index": "int",
+    "stand_index": "int",
+}
+
+
+@dataclass
+class AttributionRules:
+    """Neden atama kuralları (sıra: yangın > maden > kesim).
+
+    hotspot_distance: Yamaya bu mesafedeki sıcak noktalar sayılır (CRS birimi)
+    min_hotspots: Yangın için gereken en az sıcak nokta
+    fire_dnbr: Verilirse, yama `mean_dNBR` değeri bu eşiği aşınca sıcak nokta
+        olmadan da yangın sayılır
+    min_mining_overlap: Ruhsat poligonlarıyla örtüşen en küçük yama oranı
+    min_logging_overlap: (Süzülmüş) meşcerelerle örtüşen en küçük yama oranı
+    """
+
+    hotspot_distance: float = 375.0
+    min_hotspots: int = 1
+    fire_dnbr: Optional[float] = None
+    min_mining_overlap: float = 0.2
+    min_logging_overlap: float = 0.5
+
+
+def _overlap_fraction(patches: np.ndarray, areas: np.ndarray, layer: Optional[VectorLayer]):
+    """Her yama için katmanla örtüşen alan oranı ve en çok örtüşen öğe indeksi."""
+    n = len(patches)
+    frac = np.zeros(n)
+    best = np.full(n, -1, dtype=np.int64)
+    if layer is None or not len(layer) or not n:
+        return frac, best
+    pi, li = layer.tree.query(patches, predicate="intersects")
+    if not len(pi):
+        return frac, best
+    inter = shapely.area(shapely.intersection(patches[pi], layer.geoms[li]))
+    # Çakışan poligonlar çift sayılabilir; oran 1 ile sınırlanır
+    frac = np.minimum(np.bincount(pi, weights=inter, minlength=n) / np.where(areas > 0, areas, 1.0), 1.0)
+    order = np.lexsort((-inter, pi))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = pi[order][1:] != pi[order][:-1]
+    best[pi[order][first]] = li[order][first]
+    return frac, best
+
+
+def attribute_patches(
+    patches: Iterable[dict],
+    mining: Optional[VectorLayer] = None,
+    hotspots: Optional[VectorLayer] = None,
+    stands: Optional[VectorLayer] = None,
+    rules: Optional[AttributionRules] = None,
+) -> Iterator[dict]:
+    """Kayıp yamalarını (GeoJSON Feature) nedenleriyle etiketleyerek döndürür.
+
+    Eklenen özellikler: `cause`, `fire_hotspots`, `mining_overlap`,
+    `logging_overlap`, `mining_index` / `stand_index` (en çok örtüşen öğe,
+    yoksa -1).
+    """
+    rules = rules or AttributionRules()
+    feats = [f for f in patches if f.get("geometry") is not None]
+    geoms = np.asarray([shapely.geometry.shape(f["geometry"]) for f in feats], dtype=object)
+    areas = shapely.area(geoms) if len(geoms) else np.zeros(0)
+
+    n_hot = np.zeros(len(feats), dtype=np.int64)
+    if hotspots is not None and len(hotspots) and len(feats):
+        pi, _ = hotspots.tree.query(geoms, predicate="dwithin", distance=rules.hotspot_distance)
+        n_hot = np.bincount(pi, minlength=len(feats))
+    mine_frac, mine_idx = _overlap_fraction(geoms, areas, mining)
+    log_frac, stand_idx = _overlap_fraction(geoms, areas, stands)
+
+    fire = n_hot >= rules.min_hotspots
+    if rules.fire_dnbr is not None:
+        dnbr = np.asarray([(f.get("properties") or {}).get("mean_dNBR") for f in feats], dtype=float)
+        fire |= np.nan_to_num(dnbr, nan=-np.inf) >= rules.fire_dnbr
+    cause = np.select(
+        [fire, mine_frac >= rules.min_mining_overlap, log_frac >= rules.min_logging_overlap],
+        ["fire", "mining", "logging"],
+        default="unknown",
+    )
+
+    for k, feat in enumerate(feats):
+        props = dict(feat.get("properties") or {})
+        props.update(
+            cause=str(cause[k]),
+            fire_hotspots=int(n_hot[k]),
+            mining_overlap=round(float(mine_frac[k]), 4),
+            logging_overlap=round(float(log_frac[k]), 4),
+            mining_index=int(mine_idx[k]),
+            stand_index=int(stand_idx[k]),
+        )
+        yield {"type": "Feature", "geometry": feat["geometry"], "properties": props}
+
+
+def attribution_summary(features: Iterable[dict], area_field: str = "area_ha") -> Dict[str, float]:
+    """Nedene göre toplam alan (`area_field` yoksa geometri alanı, CRS biriminde)."""
+    out = {c: 0.0 for c in CAUSES}
+    for feat in features:
+        p = feat["properties"]
+        area = p.get(area_field)
+        if area is None:
+            area = shapely.geometry.shape(feat["geometry"]).area
+        out[p["cause"]] = out.get(p["cause"], 0.0) + float(area)
+    return out
+
+
+def write_attributed(
+    features: Iterable[dict],
+    out_path: str,
+    crs: Optional[str] = None,
+    driver: Optional[str] = None,
+) -> int:
+    """Etiketlenmiş yamaları GeoJSON/GPKG olarak akışla yazar; yazılan sayıyı döndürür.
+
+    GPKG şeması ilk özellikten türetilir: yama alanları `GPKG_SCHEMA`'daki,
+    neden alanları `ATTRIBUTION_FIELDS`'taki tiplerle yazılır.
+    """
+    from .polygonize import GPKG_SCHEMA, feature_schema, open_writer
+
+    features = iter(features)
+    first = next(features, None)
+    schema = None
+    if first is not None:
+        schema = feature_schema(first, {**GPKG_SCHEMA["properties"], **ATTRIBUTION_FIELDS})
+    writer = open_writer(out_path, crs, driver, schema=schema)
+    count = 0
+    try:
+        if first is not None:
+            writer.write(first)
+            count += 1
+        for feat in features:
+            writer.write(feat)
+            count += 1
+    finally:
+        writer.close()
+    return count
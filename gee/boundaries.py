@@ -0,0 +1,252 @@
+"""FAO GAUL il / ilçe sınırları için yerel sınır deposu.
+
+Sınırlar sunucudan ülke (veya il) başına tek bir `getInfo` ile bir kez
+çekilir ve `<root>/gaul_<ülke>_l<düzey>_full.geojson` altında saklanır.
+Sadeleştirilmiş sürümler (bkz. `SIMPLIFY_LEVELS`) ilk istendiklerinde
+yerelde üretilip aynı klasöre yazılır. Sonraki çalışmalarda AOI çözümü
+sunucuya hiç gitmez. İstemciye her seferinde dev il geometrisi de indirilmez.
+
+İsimler Türkçe karakterlerden arındırılarak eşlenir: "Karabük", "KARABÜK"
+ve "karabuk" aynı ili verir. İlçeler için "İl/İlçe" biçimi kullanılabilir
+(örn. "Karabük/Safranbolu").
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import re
+import unicodedata
+
+from ._lazy import lazy_import
+from .client import get_info
+from .utils import ensure_dir
+
+ee = lazy_import("ee")
+shapely = lazy_import("shapely")
+
+DEFAULT_ROOT = os.path.join("data", "boundaries")
+GAUL_COLLECTION = "FAO/GAUL/2015/level{level}"
+
+# Sadeleştirme toleransları (derece): ~55 m, ~220 m, ~1.1 km
+SIMPLIFY_LEVELS: Dict[str, float] = {"full": 0.0, "fine": 0.0005, "medium": 0.002, "coarse": 0.01}
+
+_PROPERTIES = {
+    1: ("ADM0_NAME", "ADM1_CODE", "ADM1_NAME"),
+    2: ("ADM0_NAME", "ADM1_CODE", "ADM1_NAME", "ADM2_CODE", "ADM2_NAME"),
+}
+_TR = str.maketrans("ıİğĞüÜşŞöÖçÇâÂîÎûÛ", "iIgGuUsSoOcCaAiIuU")
+
+Names = Union[str, Sequence[str]]
+BBox = Tuple[float, float, float, float]
+
+
+def normalize_name(name: str) -> str:
+    """Türkçe karakterleri ASCII'ye indirger, küçük harfe çevirir ve boşluk/noktalamayı atar."""
+    s = unicodedata.normalize("NFKD", str(name).translate(_TR))
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    return re.sub(r"[^a-z0-9]+", "", s)
+
+
+def _unit_key(props: dict, level: int) -> str:
+    if level == 1:
+        return normalize_name(props["ADM1_NAME"])
+    return f"{normalize_name(props['ADM1_NAME'])}/{normalize_name(props['ADM2_NAME'])}"
+
+
+class BoundaryStore:
+    """GAUL il (düzey 1) ve ilçe (düzey 2) sınırlarının yerel önbelleği."""
+
+    def __init__(self, root: str = DEFAULT_ROOT, country: str = "Turkey"):
+        self.root = root
+        self.country = country
+        self._features: Dict[int, Dict[str, dict]] = {}
+        self._shapes: Dict[Tuple[int, str], Dict[str, object]] = {}
+
+    # ---- Depolama ----
+
+    def _path(self, level: int, simplify: str = "full") -> str:
+        return os.path.join(self.root, f"gaul_{normalize_name(self.country)}_l{level}_{simplify}.geojson")
+
+    def _units(self, level: int) -> Dict[str, dict]:
+        if level not in _PROPERTIES:
+            raise ValueError(f"Desteklenmeyen GAUL düzeyi: {level} (1 veya 2)")
+        if level not in self._features:
+            units: Dict[str, dict] = {}
+            path = self._path(level)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    for feat in json.load(f).get("features", []):
+                        units[_unit_key(feat["properties"], level)] = feat
+            self._features[level] = units
+        return self._features[level]
+
+    def _save(self, level: int) -> None:
+        ensure_dir(self.root)
+        fc = {"type": "FeatureCollection", "features": list(self._units(level).values())}
+        with open(self._path(level), "w", encoding="utf-8") as f:
+            json.dump(fc, f, ensure_ascii=False)
+        # Sadeleştirilmiş sürümler tam çözünürlükten yeniden üretilecek
+        for name in SIMPLIFY_LEVELS:
+            if name != "full" and os.path.exists(self._path(level, name)):
+                os.remove(self._path(level, name))
+        self._shapes = {k: v for k, v in self._shapes.items() if k[0] != level}
+
+    def sync(self, level: int = 1, provinces: Optional[Sequence[str]] = None, max_error: float = 0) -> int:
+        """Sınırları sunucudan tek istekle çekip yerel depoya ekler.
+
+        Args:
+            level: 1 (il) veya 2 (ilçe)
+            provinces: Verilirse yalnızca bu illerin (GAUL `ADM1_NAME`) birimleri çekilir
+            max_error: > 0 ise geometriler sunucuda bu hatayla (m) sadeleştirilir
+
+        Returns:
+            Çekilen birim sayısı
+        """
+        fc = ee.FeatureCollection(GAUL_COLLECTION.format(level=level)).filter(
+            ee.Filter.eq("ADM0_NAME", self.country)
+        )
+        if provinces:
+            fc = fc.filter(ee.Filter.inList("ADM1_NAME", list(provinces)))
+        fc = fc.select(list(_PROPERTIES[level]))
+        if max_error:
+            fc = fc.map(lambda f: f.simplify(max_error))
+
+        units = self._units(level)
+        fetched = get_info(fc, op="gaul_sync").get("features", [])
+        for feat in fetched:
+            props = {k: feat["properties"].get(k) for k in _PROPERTIES[level]}
+            units[_unit_key(props, level)] = {"type": "Feature", "geometry": feat["geometry"], "properties": props}
+        self._save(level)
+        return len(fetched)
+
+    # ---- Eşleme ----
+
+    def _match(self, name: str, level: int) -> List[str]:
+        units = self._units(level)
+        if level == 1:
+            key = normalize_name(name)
+            return [key] if key in units else []
+        province, _, district = name.rpartition("/")
+        district = normalize_name(district)
+        province = normalize_name(province) if province else None
+        return [
+            k for k in units
+            if k.split("/")[1] == district and (province is None or k.split("/")[0] == province)
+        ]
+
+    def find(self, names: Names, level: int = 1) -> List[dict]:
+        """İsimlere karşılık gelen GAUL birimlerini (GeoJSON Feature) döndürür.
+
+        Depoda olmayan isimler için sunucudan bir kez eşitleme yapılır.
+        """
+        names = [names] if isinstance(names, str) else list(names)
+        missing = [n for n in names if not self._match(n, level)]
+        if missing:
+            self._fetch_missing(missing, level)
+
+        keys: List[str] = []
+        for name in names:
+            found = self._match(name, level)
+            if not found:
+                raise KeyError(f"Sınır bulunamadı: '{name}' (GAUL düzey {level}, {self.country})")
+            if len(found) > 1:
+                raise ValueError(f"'{name}' birden çok ilde var; 'İl/İlçe' biçimini kullanın: {found}")
+            keys.extend(found)
+        units = self._units(level)
+        return [units[k] for k in dict.fromkeys(keys)]
+
+    def _fetch_missing(self, names: Sequence[str], level: int) -> None:
+        if level == 1:
+            self.sync(1)
+            return
+        provinces = [n.rpartition("/")[0] for n in names]
+        if all(provinces):
+            # İlçeler yalnızca ilgili iller için çekilir (GAUL'daki il adlarıyla)
+            self.sync(2, provinces=[f["properties"]["ADM1_NAME"] for f in self.find(provinces, level=1)])
+        else:
+            self.sync(2)
+
+    # ---- Geometriler ----
+
+    def _shape(self, key: str, level: int, simplify: str):
+        if simplify not in SIMPLIFY_LEVELS:
+            raise ValueError(f"Bilinmeyen sadeleştirme düzeyi: {simplify} ({', '.join(SIMPLIFY_LEVELS)})")
+        cache = self._shapes.get((level, simplify))
+        if cache is None or key not in cache:
+            cache = self._load_shapes(level, simplify)
+        return cache[key]
+
+    def _load_shapes(self, level: int, simplify: str) -> Dict[str, object]:
+        units = self._units(level)
+        path = self._path(level, simplify)
+        shapes: Dict[str, object] = {}
+        if simplify != "full" and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for feat in json.load(f).get("features", []):
+                    shapes[_unit_key(feat["properties"], level)] = shapely.geometry.shape(feat["geometry"])
+        if set(shapes) != set(units):
+            shapes = {k: shapely.geometry.shape(f["geometry"]) for k, f in units.items()}
+            tol = SIMPLIFY_LEVELS[simplify]
+            if tol:
+                keys = list(shapes)
+                simplified = shapely.simplify(list(shapes.values()), tol, preserve_topology=True)
+                shapes = dict(zip(keys, simplified))
+                ensure_dir(self.root)
+                fc = {"type": "FeatureCollection", "features": [
+                    {"type": "Feature", "geometry": shapely.geometry.mapping(shapes[k]), "properties": units[k]["properties"]}
+                    for k in keys
+                ]}
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(fc, f, ensure_ascii=False)
+        self._shapes[(level, simplify)] = shapes
+        return shapes
+
+    def geometry(self, names: Names, level: int = 1, simplify: str = "full"):
+        """İsimlerdeki birimlerin birleşimini shapely geometrisi olarak döndürür."""
+        feats = self.find(names, level)
+        geoms = [self._shape(_unit_key(f["properties"], level), level, simplify) for f in feats]
+        return geoms[0] if len(geoms) == 1 else shapely.union_all(geoms)
+
+    def geojson(self, names: Names, level: int = 1, simplify: str = "full") -> dict:
+        """Birleşik sınırı GeoJSON Feature olarak döndürür."""
+        names = [names] if isinstance(names, str) else list(names)
+        return {
+            "type": "Feature",
+            "properties": {"names": names, "level": level, "simplify": simplify},
+            "geometry": shapely.geometry.mapping(self.geometry(names, level, simplify)),
+        }
+
+    def ee_geometry(self, names: Names, level: int = 1, simplify: str = "full") -> ee.Geometry:
+        """Birleşik sınırı `ee.Geometry` olarak döndürür (GAUL gibi düzlemsel kenarlı)."""
+        return ee.Geometry(shapely.geometry.mapping(self.geometry(names, level, simplify)), None, False)
+
+    def ee_collection(self, names: Names, level: int = 1) -> ee.FeatureCollection:
+        """Birimleri sunucudaki GAUL koleksiyonundan kodla süzer.
+
+        İstek yalnızca birim kodlarını taşır; geometri sunucuda kalır. Bu yüzden
+        kesin sınır maskesi için `ee_geometry`'den çok daha küçük bir istek üretir.
+        """
+        codes = [f["properties"][f"ADM{level}_CODE"] for f in self.find(names, level)]
+        return ee.FeatureCollection(GAUL_COLLECTION.format(level=level)).filter(
+            ee.Filter.inList(f"ADM{level}_CODE", codes)
+        )
+
+    def bounds(self, names: Names, level: int = 1) -> BBox:
+        """Birleşik sınırın (xmin, ymin, xmax, ymax) kutusu."""
+        return tuple(float(v) for v in self.geometry(names, level).bounds)
+
+    def write_geojson(self, names: Names, path: str, level: int = 1, simplify: str = "full") -> str:
+        """Birleşik sınırı GeoJSON dosyasına yazar (örn. `run_pipeline(aoi_geojson=...)` için)."""
+        ensure_dir(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.geojson(names, level, simplify), f, ensure_ascii=False)
+        return path
+
+
+@lru_cache(maxsize=None)
+def default_store(root: str = DEFAULT_ROOT, country: str = "Turkey") -> BoundaryStore:
+    """Süreç boyunca paylaşılan sınır deposu."""
+    return BoundaryStore(root, country)
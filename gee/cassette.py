@@ -0,0 +1,290 @@
+"""Earth Engine istekleri için kayıt/yanıt (record/replay) kasetleri.
+
+Canlı bir EE hesabıyla bir kez çalıştırılan iş akışının tüm sunucu
+istekleri (`getInfo` değerleri, harita kimlikleri, küçük resim URL'leri ve
+baytları, dışa aktarma görev kimlikleri) bir kaset dosyasına yazılır;
+sonraki çalıştırmalar aynı istekleri ağa çıkmadan, deterministik olarak
+kayıttan yanıtlar. Böylece `run_pipeline`, `compute_severity_areas`,
+PNG dışa aktarıcıları ve arşivdeki `GEEYorumcusu` CI'da ve
+kıyaslamalarda kimlik bilgisi olmadan çalışır.
+
+- İstek anahtarı: yöntem + EE nesnesinin serileştirilmiş ifade grafiği
+  (`obj.serialize()`) + parametreler. Sıra bağımsızdır; paralel istekler de
+  aynı yanıtı alır.
+- Kasette EE algoritma tablosu da saklanır; yanıt kipinde `ee_init`
+  (ve `GEEYorumcusu`) `ee.Initialize`'ı bu tabloyla çevrimdışı çalıştırır.
+- `latency` / `latency_scale` ile yanıtlara sabit veya kayıttaki sürelerle
+  orantılı gecikme eklenir (istek katmanının eşzamanlılık sınırı altında).
+
+Kullanım:
+    with use_cassette("tests/cassettes/karabuk.json.gz", mode="record"):
+        run_pipeline(...)            # canlı hesapla bir kez
+    with use_cassette("tests/cassettes/karabuk.json.gz"):
+        run_pipeline(...)            # ağsız
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+
+from ._lazy import is_loaded, lazy_import
+from .client import RequestLayer, default_layer
+
+ee = lazy_import("ee")
+
+MODES = ("replay", "record", "auto")
+FORMAT_VERSION = 1
+
+# Çevrimdışı başlatmada kullanılan proje adı (hiçbir isteğe gitmez; yeni
+# earthengine-api sürümleri projesiz `ee.Initialize`'ı reddeder)
+REPLAY_PROJECT = "cassette-replay"
+
+# ee.data işlevleri çevrimdışı başlatma sırasında geçici olarak değiştirilir
+_EE_PATCH_LOCK = threading.Lock()
+
+
+class CassetteMiss(LookupError):
+    """Yanıt kipinde kasette bulunmayan istek."""
+
+    def __init__(self, method: str, key: str, path: str):
+        super().__init__(f"'{path}' kasetinde kayıt yok: {method} ({key}). Kaseti mode='record' ile yenileyin.")
+        self.method = method
+        self.key = key
+
+
+def _canonical(obj: Any) -> Any:
+    """İsteği JSON ile ifade edilebilir, sıralı bir yapıya çevirir (EE nesneleri serileştirilir)."""
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    serialize = getattr(obj, "serialize", None)
+    if callable(serialize):
+        return {"$ee": serialize()}
+    return repr(obj)
+
+
+def request_key(method: str, parts: tuple) -> str:
+    """İstek için kararlı anahtar (yöntem + serileştirilmiş argümanların özeti)."""
+    payload = json.dumps([method, _canonical(parts)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    url_format = getattr(value, "url_format", None)
+    if url_format is not None:
+        # getMapId yanıtındaki ee.data.TileFetcher
+        return {"$tile_fetcher": url_format}
+    serialize = getattr(value, "serialize", None)
+    if callable(serialize):
+        return {"$ee": serialize()}
+    return repr(value)
+
+
+class _TileFetcher:
+    """Kayıttan dönen getMapId yanıtı için `url_format` taşıyıcısı."""
+
+    def __init__(self, url_format: str):
+        self.url_format = url_format
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) == 1:
+        if "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        if "$tile_fetcher" in value:
+            return _TileFetcher(value["$tile_fetcher"])
+        if "$ee" in value:
+            return ee.deserializer.fromJSON(value["$ee"])
+    return {k: _decode(v) for k, v in value.items()}
+
+
+def _open(path: str, mode: str, compressed: bool):
+    if compressed:
+        # mtime=0: aynı kayıt bayt bayt aynı dosyayı üretir
+        return io.TextIOWrapper(gzip.GzipFile(path, mode + "b", mtime=0), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """Tek bir kaset dosyası: istek anahtarı -> kaydedilmiş yanıt.
+
+    mode:
+      - "replay": yalnızca kayıttan yanıtlar; eksik istek `CassetteMiss`
+      - "record": her isteği ağa gönderir ve yanıtı kaydeder (kaset yeniden yazılır)
+      - "auto": kayıtta varsa yanıtlar, yoksa ağa gider ve ekler
+    latency: Her yanıta eklenen sabit gecikme (s)
+    latency_scale: Kayıttaki sunucu süresinin bu katı kadar ek gecikme
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: float = 0.0, latency_scale: float = 0.0):
+        if mode not in MODES:
+            raise ValueError(f"Geçersiz kaset kipi: {mode}. Seçenekler: {MODES}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.entries: Dict[str, dict] = {}
+        self.algorithms: Optional[dict] = None
+        self.hits = 0
+        self.recorded = 0
+        self._dirty = False
+        self._ee_ready = False
+        self._lock = threading.Lock()
+        if mode != "record" and os.path.exists(path):
+            self.load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Kaset bulunamadı: {path}")
+
+    @property
+    def replaying(self) -> bool:
+        """Ağa hiç çıkılmayan kip mi?"""
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ---- İstek katmanı arayüzü (gee.client.RequestLayer._request) ----
+
+    def lookup(self, method: str, parts: tuple) -> Optional[Tuple[Any, float]]:
+        """Kayıtlı yanıt ve uygulanacak gecikme; kayıt yoksa None (yanıt kipinde hata)."""
+        if self.mode == "record":
+            return None
+        key = request_key(method, parts)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+        if entry is None:
+            if self.replaying:
+                raise CassetteMiss(method, key, self.path)
+            return None
+        delay = self.latency + self.latency_scale * entry.get("seconds", 0.0)
+        return _decode(entry["value"]), delay
+
+    def record(self, method: str, parts: tuple, value: Any, seconds: float, op: Optional[str] = None) -> None:
+        entry = {"method": method, "op": op or method, "seconds": round(seconds, 4), "value": _encode(value)}
+        key = request_key(method, parts)
+        with self._lock:
+            self.entries[key] = entry
+            self.recorded += 1
+            self._dirty = True
+
+    # ---- Çevrimdışı EE başlatma ----
+
+    def capture_algorithms(self) -> None:
+        """Başlatılmış bir EE oturumundan algoritma tablosunu kasete alır."""
+        if self.algorithms is None and is_loaded(ee):
+            try:
+                self.algorithms = ee.data.getAlgorithms()
+                self._dirty = True
+            except Exception:
+                pass
+
+    def init_ee(self) -> None:
+        """`ee.Initialize`'ı kimlik bilgisi ve ağ olmadan, kasetteki algoritma tablosuyla çalıştırır.
+
+        EE nesneleri (`ee.Image(...).normalizedDifference(...)` vb.) yalnızca
+        algoritma tablosuyla kurulur; sunucuya giden her çağrı zaten kasetten
+        yanıtlanır.
+        """
+        if self._ee_ready:
+            return
+        if self.algorithms is None:
+            raise CassetteMiss("getAlgorithms", "-", self.path)
+        algorithms = self.algorithms
+        with _EE_PATCH_LOCK:
+            data = ee.data
+            saved = data.initialize, data.getAlgorithms
+            data.initialize = lambda *args, **kwargs: None
+            data.getAlgorithms = lambda: algorithms
+            try:
+                ee.Initialize(credentials=None, project=REPLAY_PROJECT)
+            finally:
+                data.initialize, data.getAlgorithms = saved
+        self._ee_ready = True
+
+    # ---- Dosya ----
+
+    def load(self) -> None:
+        with _open(self.path, "r", self.path.endswith(".gz")) as f:
+            doc = json.load(f)
+        if doc.get("version") != FORMAT_VERSION:
+            raise ValueError(f"'{self.path}': desteklenmeyen kaset sürümü {doc.get('version')}")
+        self.entries = doc.get("entries", {})
+        self.algorithms = doc.get("algorithms")
+
+    def save(self) -> None:
+        """Kaseti yazar (anahtarlar sıralı; aynı kayıt aynı dosyayı üretir)."""
+        self.capture_algorithms()
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._lock:
+            doc = {"version": FORMAT_VERSION, "algorithms": self.algorithms, "entries": self.entries}
+            tmp = self.path + ".tmp"
+            with _open(tmp, "w", self.path.endswith(".gz")) as f:
+                json.dump(doc, f, sort_keys=True, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+def active_cassette(layer: Optional[RequestLayer] = None) -> Optional[Cassette]:
+    """Varsayılan (veya verilen) istek katmanına bağlı kaset."""
+    return (layer or default_layer()).cassette
+
+
+@contextmanager
+def use_cassette(
+    path: str,
+    mode: str = "replay",
+    latency: float = 0.0,
+    latency_scale: float = 0.0,
+    layer: Optional[RequestLayer] = None,
+) -> Iterator[Cassette]:
+    """Blok süresince istek katmanını kasete bağlar; çıkışta yeni kayıtları dosyaya yazar.
+
+    Yanıt kipinde EE hemen çevrimdışı başlatılır; blok içinde `ee_init`
+    çağrıları ağa çıkmaz.
+    """
+    target = layer or default_layer()
+    cassette = Cassette(path, mode=mode, latency=latency, latency_scale=latency_scale)
+    previous = target.cassette
+    target.cassette = cassette
+    try:
+        if cassette.replaying:
+            cassette.init_ee()
+        yield cassette
+    finally:
+        target.cassette = previous
+        if layer is None and default_layer() is not target:
+            # Blok içinde client.configure() ile katman değiştirildi
+            default_layer().cassette = previous
+        if cassette.dirty:
+            cassette.save()
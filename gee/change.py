@@ -1,6 +1,27 @@
 from __future__ import annotations
 
-import ee
+from functools import partial
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
+
+from ._lazy import lazy_import
+from .raster import (
+    ScaledRaster,
+    create_raster,
+    encoding_for,
+    iter_windows,
+    map_windows,
+    raster_shape,
+    read_window,
+)
+
+ee = lazy_import("ee")
+
+# RdNBR paydasında sqrt(|preNBR|) için alt sınır (sıfıra bölmeyi önler)
+RDNBR_MIN_PRE = 0.001
 
 
 def compute_diffs(pre: ee.Image, post: ee.Image) -> dict:
@@ -9,6 +30,7 @@ def compute_diffs(pre: ee.Image, post: ee.Image) -> dict:
     dNDVI = post - pre (vejetasyon düşüşleri negatif)
     dNBR  = pre - post (yanıklık artışı pozitif)
     RBR   = dNBR / (pre_nbr + 1.001)
+    RdNBR = dNBR / sqrt(|pre_nbr|)
     """
     dndvi = post.select("NDVI").subtract(pre.select("NDVI")).rename("dNDVI")
     
@@ -19,125 +41,331 @@ def compute_diffs(pre: ee.Image, post: ee.Image) -> dict:
     
     # RBR calculation: dNBR / (PreNBR + 1.001)
     rbr = dnbr.divide(pre_nbr.add(1.001)).rename("RBR")
+
+    # RdNBR calculation: dNBR / sqrt(|PreNBR|)
+    rdnbr = dnbr.divide(pre_nbr.abs().max(RDNBR_MIN_PRE).sqrt()).rename("RdNBR")
     
-    return {"dNDVI": dndvi, "dNBR": dnbr, "RBR": rbr}
+    return {"dNDVI": dndvi, "dNBR": dnbr, "RBR": rbr, "RdNBR": rdnbr}
+
+
+def diff_arrays(
+    pre_nbr: np.ndarray,
+    post_nbr: np.ndarray,
+    pre_ndvi: Optional[np.ndarray] = None,
+    post_ndvi: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """`compute_diffs` formüllerinin NumPy karşılığı (tek pencere / bellek içi)."""
+    out: Dict[str, np.ndarray] = {}
+    if pre_ndvi is not None and post_ndvi is not None:
+        out["dNDVI"] = post_ndvi - pre_ndvi
+    dnbr = pre_nbr - post_nbr
+    out["dNBR"] = dnbr
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["RBR"] = dnbr / (pre_nbr + np.float32(1.001))
+        out["RdNBR"] = dnbr / np.sqrt(np.maximum(np.abs(pre_nbr), np.float32(RDNBR_MIN_PRE)))
+    return out
+
+
+RasterSource = Union[str, np.ndarray, ScaledRaster]
+
+
+def _diff_window(sources: Dict[str, RasterSource], outputs: Dict[str, str], window: tuple) -> None:
+    bands = {k: read_window(src, window) for k, src in sources.items()}
+    res = diff_arrays(**bands)
+    for product, path in outputs.items():
+        out = np.load(path, mmap_mode="r+")
+        out[window] = encoding_for(product).encode(res[product])
+        out.flush()
+        del out
+
+
+def compute_diffs_local(
+    pre_nbr: RasterSource,
+    post_nbr: RasterSource,
+    out_dir: str,
+    pre_ndvi: Optional[RasterSource] = None,
+    post_ndvi: Optional[RasterSource] = None,
+    window: int = 1024,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """dNDVI, dNBR, RBR ve RdNBR'yi yerel rasterlardan pencere pencere hesaplar.
+
+    Girdiler `gee.raster.save_raster` yolları, ScaledRaster veya (bellek
+    eşlemeli) diziler olabilir. Çıktılar `out_dir` altına kodlanmış `.npy`
+    olarak yazılır; tam raster hiçbir zaman belleğe alınmaz. Tüm girdiler
+    yol ise pencereler süreç havuzunda, değilse iş parçacıklarında işlenir.
+
+    Returns:
+        Ürün adı -> çıktı dosya yolu
+    """
+    sources: Dict[str, RasterSource] = {"pre_nbr": pre_nbr, "post_nbr": post_nbr}
+    products = ["dNBR", "RBR", "RdNBR"]
+    if pre_ndvi is not None and post_ndvi is not None:
+        sources.update(pre_ndvi=pre_ndvi, post_ndvi=post_ndvi)
+        products.insert(0, "dNDVI")
+
+    shape = raster_shape(pre_nbr)
+    for name, src in sources.items():
+        if raster_shape(src) != shape:
+            raise ValueError(f"compute_diffs_local: '{name}' boyutu {raster_shape(src)} != {shape}")
+
+    outputs: Dict[str, str] = {}
+    for product in products:
+        path = os.path.join(out_dir, f"{product}.npy")
+        create_raster(path, shape, product=product).flush()
+        outputs[product] = path
+
+    processes = all(isinstance(src, str) for src in sources.values())
+    map_windows(
+        partial(_diff_window, sources, outputs),
+        iter_windows(shape, window),
+        workers=workers,
+        processes=processes,
+    )
+    return outputs
+
+
+def compute_annual_diffs(composites: Mapping[int, ee.Image], cumulative: bool = True) -> ee.Image:
+    """Ardışık yıllar arası fark ürünlerini tek bir çok bantlı görüntüde toplar.
+
+    `composites` yıl -> NBR ve NDVI bantlı görüntüdür (bkz.
+    `prepare_annual_composites`); her kompozit bir kez kullanılır.
+
+    Bantlar: `dNBR_<y0>_<y1>`, `RBR_...`, `RdNBR_...`, `dNDVI_...` ve cumulative=True ise ilk yıla göre `cum_dNBR_<ilk>_<y>` /
+    `cum_dNDVI_<ilk>_<y>`.
+    """
+    years = sorted(composites)
+    if len(years) < 2:
+        raise ValueError("compute_annual_diffs: en az iki yıl gerekli.")
+
+    bands: List[ee.Image] = []
+    for y0, y1 in zip(years[:-1], years[1:]):
+        for product, img in compute_diffs(composites[y0], composites[y1]).items():
+            bands.append(img.rename(f"{product}_{y0}_{y1}"))
+
+    if cumulative:
+        first = composites[years[0]]
+        for y in years[1:]:
+            d = compute_diffs(first, composites[y])
+            bands.append(d["dNBR"].rename(f"cum_dNBR_{years[0]}_{y}"))
+            bands.append(d["dNDVI"].rename(f"cum_dNDVI_{years[0]}_{y}"))
+
+    return ee.Image.cat(bands).set("years", years)
+
+
+def _annual_window(
+    nbr: RasterSource,
+    ndvi: Optional[RasterSource],
+    outputs: Dict[str, str],
+    window: tuple,
+) -> None:
+    # Her yıl penceresi bir kez okunur; ardışık çiftler kaydırılmış görünümlerdir
+    n = read_window(nbr, window)
+    bands = {"pre_nbr": n[:-1], "post_nbr": n[1:]}
+    res: Dict[str, np.ndarray] = {}
+    if ndvi is not None:
+        v = read_window(ndvi, window)
+        bands.update(pre_ndvi=v[:-1], post_ndvi=v[1:])
+        res["cum_dNDVI"] = v[1:] - v[0]
+    res.update(diff_arrays(**bands))
+    res["cum_dNBR"] = n[0] - n[1:]
+    for product, path in outputs.items():
+        out = np.load(path, mmap_mode="r+")
+        out[window] = encoding_for(product).encode(res[product])
+        out.flush()
+        del out
+
+
+def compute_annual_diffs_local(
+    nbr: RasterSource,
+    out_dir: str,
+    ndvi: Optional[RasterSource] = None,
+    years: Optional[Sequence[int]] = None,
+    cumulative: bool = True,
+    window: int = 1024,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """`compute_annual_diffs`'in yerel karşılığı: (yıl, y, x) yığınlarından.
+
+    `nbr` / `ndvi` her yılın indeksini içeren (T, y, x) rasterlardır. Her ürün
+    `out_dir/<ürün>_annual.npy` altına (T-1, y, x) olarak yazılır; i. katman
+    `years[i] -> years[i+1]` farkı, `cum_*` katmanları ise `years[0] -> years[i+1]`
+    değişimidir. Yıllar meta dosyasına `pairs` olarak kaydedilir.
+
+    Returns:
+        Ürün adı -> çıktı dosya yolu
+    """
+    shape = raster_shape(nbr)
+    if len(shape) != 3 or shape[0] < 2:
+        raise ValueError(f"compute_annual_diffs_local: (yıl, y, x) yığını bekleniyor, boyut {shape}")
+    if ndvi is not None and raster_shape(ndvi) != shape:
+        raise ValueError(f"compute_annual_diffs_local: 'ndvi' boyutu {raster_shape(ndvi)} != {shape}")
+    years = list(years) if years is not None else list(range(shape[0]))
+    if len(years) != shape[0]:
+        raise ValueError(f"compute_annual_diffs_local: {len(years)} yıl != {shape[0]} katman")
+
+    products = ["dNBR", "RBR", "RdNBR"]
+    if ndvi is not None:
+        products.insert(0, "dNDVI")
+    if cumulative:
+        products.append("cum_dNBR")
+        if ndvi is not None:
+            products.append("cum_dNDVI")
+
+    pairs = [[int(y0), int(y1)] for y0, y1 in zip(years[:-1], years[1:])]
+    cum_pairs = [[int(years[0]), int(y)] for y in years[1:]]
+    outputs: Dict[str, str] = {}
+    for product in products:
+        path = os.path.join(out_dir, f"{product}_annual.npy")
+        meta = {"pairs": cum_pairs if product.startswith("cum_") else pairs}
+        create_raster(path, (shape[0] - 1,) + tuple(shape[1:]), product=product, meta=meta).flush()
+        outputs[product] = path
+
+    processes = isinstance(nbr, str) and (ndvi is None or isinstance(ndvi, str))
+    map_windows(
+        partial(_annual_window, nbr, ndvi, outputs),
+        iter_windows(shape, window),
+        workers=workers,
+        processes=processes,
+    )
+    return outputs
+
+
+@dataclass(frozen=True)
+class SeverityScheme:
+    """Eşik vektörü ve sınıf kodları.
+
+    `codes[i]`, `thresholds[i-1] <= x < thresholds[i]` aralığının kodudur;
+    bu yüzden len(codes) == len(thresholds) + 1 olmalıdır.
+    """
+
+    name: str
+    thresholds: Tuple[float, ...]
+    codes: Tuple[int, ...]
+
+    def __post_init__(self):
+        if len(self.codes) != len(self.thresholds) + 1:
+            raise ValueError(f"{self.name}: len(codes) = len(thresholds) + 1 olmalı.")
+        if list(self.thresholds) != sorted(self.thresholds):
+            raise ValueError(f"{self.name}: eşikler artan sırada olmalı.")
+
+
+# Kodlar vis_params()["severity"] paletine göre: 0 yeşil, 2 sarı, 3 turuncu, 4 kırmızı
+SEVERITY_SCHEMES: Dict[str, SeverityScheme] = {
+    # RBR: <0.1 yanmamış, 0.1-0.35 düşük, 0.35-0.75 orta, >0.75 yüksek
+    "RBR": SeverityScheme("RBR", (0.10, 0.35, 0.75), (0, 2, 3, 4)),
+    # USGS dNBR sınıfları (config.NBR_ESIK_DEGERLERI ile aynı)
+    "dNBR_USGS": SeverityScheme("dNBR_USGS", (0.10, 0.27, 0.44, 0.66), (0, 1, 2, 3, 4)),
+}
+
+SchemeLike = Union[str, SeverityScheme]
+
+
+def _resolve_scheme(scheme: SchemeLike) -> SeverityScheme:
+    if isinstance(scheme, SeverityScheme):
+        return scheme
+    try:
+        return SEVERITY_SCHEMES[scheme]
+    except KeyError:
+        raise KeyError(f"Bilinmeyen şema '{scheme}'. Tanımlı olanlar: {sorted(SEVERITY_SCHEMES)}") from None
+
+
+def _scheme_expression(scheme: SeverityScheme, var: str = "x") -> str:
+    """Şemayı tek bir EE ternary ifadesine çevirir."""
+    expr = str(scheme.codes[-1])
+    for t, code in reversed(list(zip(scheme.thresholds, scheme.codes))):
+        expr = f"{var} < {t!r} ? {code} : ({expr})"
+    return expr
+
+
+def classify_image(image: ee.Image, scheme: SchemeLike = "RBR", name: str = "severity") -> ee.Image:
+    """Metriği tek bir sunucu ifadesiyle (ternary zinciri) sınıflandırır (uint8)."""
+    sch = _resolve_scheme(scheme)
+    return (
+        image.expression(_scheme_expression(sch), {"x": image.select(0)})
+        .rename(name)
+        .toUint8()
+    )
+
+
+def classify_image_multi(image: ee.Image, schemes: Sequence[SchemeLike]) -> ee.Image:
+    """Birden çok şemayı aynı metrikten `severity_<şema>` bantları olarak üretir."""
+    bands = []
+    for scheme in schemes:
+        sch = _resolve_scheme(scheme)
+        bands.append(classify_image(image, sch, name=f"severity_{sch.name}"))
+    return ee.Image.cat(bands)
+
+
+def _lut_classify(values: np.ndarray, scheme: SeverityScheme) -> np.ndarray:
+    # Aralık indeksi i: thresholds[i-1] <= x < thresholds[i]; LUT i -> kod
+    t_dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    thresholds = np.asarray(scheme.thresholds, dtype=t_dtype)
+    lut = np.asarray(scheme.codes, dtype=np.uint8)
+    if len(thresholds) > 8:
+        return np.take(lut, np.digitize(values, thresholds, right=False))
+    # Az eşikte (x >= t) karşılaştırmalarını uint8 indekste biriktirmek
+    # digitize'ın ikili aramasından belirgin şekilde hızlıdır.
+    idx = np.zeros(values.shape, dtype=np.uint8)
+    hit = np.empty(values.shape, dtype=bool)
+    for t in thresholds:
+        with np.errstate(invalid="ignore"):
+            np.greater_equal(values, t, out=hit)
+        idx += hit.view(np.uint8)
+    return np.take(lut, idx)
+
+
+def classify_array(
+    values: np.ndarray,
+    scheme: SchemeLike = "RBR",
+    nodata: int = 255,
+) -> np.ndarray:
+    """Yerel dizi için aralık indeksi + LUT ile tek geçişte sınıflandırma (uint8).
+
+    NaN pikseller `nodata` olur.
+    """
+    values = np.asarray(values)
+    out = _lut_classify(values, _resolve_scheme(scheme))
+    if np.issubdtype(values.dtype, np.floating):
+        out[np.isnan(values)] = nodata
+    return out
+
+
+def classify_array_multi(
+    values: np.ndarray,
+    schemes: Sequence[SchemeLike] = ("dNBR_USGS", "RBR"),
+    nodata: int = 255,
+) -> Dict[str, np.ndarray]:
+    """Metrik bir kez okunur, her şema için sınıf dizisi döndürülür."""
+    values = np.asarray(values)
+    nan_mask = np.isnan(values) if np.issubdtype(values.dtype, np.floating) else None
+    out: Dict[str, np.ndarray] = {}
+    for scheme in schemes:
+        sch = _resolve_scheme(scheme)
+        cls = _lut_classify(values, sch)
+        if nan_mask is not None:
+            cls[nan_mask] = nodata
+        out[sch.name] = cls
+    return out
 
 
 def classify_metric(
     image: ee.Image,
-    thresholds: tuple[float, float, float, float] | None = None,
+    thresholds: tuple[float, ...] | None = None,
+    codes: tuple[int, ...] | None = None,
 ) -> ee.Image:
-    """Verilen metriği (dNBR veya RBR) şiddet sınıflarına (0..4) ayırır.
+    """Verilen metriği (dNBR veya RBR) şiddet sınıflarına ayırır.
 
-    thresholds: opsiyonel (t0, t1, t2, t3). 
-    Varsayılan (RBR için önerilen): <0.1, 0.1-0.35, 0.35-0.75, >0.75
+    thresholds: opsiyonel artan eşikler. Varsayılan RBR şeması:
+        <0.1 -> 0, 0.1-0.35 -> 2, 0.35-0.75 -> 3, >=0.75 -> 4
+    codes: eşik aralıklarının kodları (len(thresholds) + 1). Verilmezse
+        eski (t0, t1, t2, t3) çağrı biçimi korunur: t3 yok sayılır ve
+        kodlar (0, 2, 3, 4) olur.
     """
     if thresholds is None:
-        # User defined RBR thresholds
-        # < 0.1 : Unburned
-        # 0.1 - 0.35 : Low
-        # 0.35 - 0.75 : Moderate
-        # > 0.75 : High
-        t0, t1, t2, t3 = 0.10, 0.35, 0.75, 999.0 # t3 is upper bound for class 3
-        # Logic adaptation:
-        # Class 0: < t0
-        # Class 1: t0 <= x < t1
-        # Class 2: t1 <= x < t2
-        # Class 3: t2 <= x (< t3/inf)
-        # Class 4?? User only defined 4 distinct ranges (Unburned, Low, Mod, High) -> 0, 1, 2, 3?
-        # Let's map to standard severity codes if possible or follow user exactly.
-        # User list:
-        # < 0.1 (Green - Unburned) -> Code 0
-        # 0.1 - 0.35 (Yellow - Low) -> Code 1
-        # 0.35 - 0.75 (Orange - Moderate) -> Code 2
-        # > 0.75 (Red - High) -> Code 4 (Skip 3 to match intense colors?) or Code 3?
-        # Standard typically has 4 or 5 classes. Let's use 0, 1, 2, 3.
-        # But vis_params['severity'] expects 0..4 range palette usually.
-        # Let's map > 0.75 to Code 4 (High) for consistent coloring with previous logic if palette is 5 colors.
-        # Previous palette: ["#1a9850", "#a6d96a", "#fee08b", "#f46d43", "#a50026"] (5 colors)
-        # We need to map user's 4 classes to these.
-        # 0: Green -> Unburned
-        # 1: Yellow-ish -> Low
-        # 2: Orange -> Moderate
-        # 3 or 4: Red -> High
-        pass
-
-    # Let's stick to the 5-class logic structure but adapt t values.
-    # If user provided 3 boundaries (0.1, 0.35, 0.75), we have 4 zones.
-    # We can map > 0.75 to class 4, and skip class 3, or merge.
-    
-    # REVISED STRATEGY: GENERIC
-    if thresholds is None:
-        t0, t1, t2, t3 = 0.10, 0.35, 0.75, 100.0 # Just default placeholders if called without settings
+        scheme = SEVERITY_SCHEMES["RBR"]
+    elif codes is None and len(thresholds) == 4:
+        scheme = SeverityScheme("custom", tuple(thresholds[:3]), (0, 2, 3, 4))
     else:
-        t0, t1, t2, t3 = thresholds
-
-    c0 = image.lt(t0)
-    c1 = image.gte(t0).And(image.lt(t1))
-    c2 = image.gte(t1).And(image.lt(t2))
-    # For RBR specific map:
-    # 0.1 - 0.35 -> Low
-    # 0.35 - 0.75 -> Moderate
-    # > 0.75 -> High
-    # Let's assign:
-    # 0: Unburned (< 0.10)
-    # 1: Low (0.10 - 0.35)
-    # 2: Moderate (0.35 - 0.75)
-    # 3: High (> 0.75)
-    # 4: Extreme? (Not defined, so maybe merge into 3 or keep empty)
-    
-    c3 = image.gte(t2) # All above 0.75
-    # Remove c4 split if we only have 3 thresholds defining 4 classes
-    
-    classified = (
-        c0.multiply(0)
-        .add(c1.multiply(1))
-        .add(c2.multiply(2))
-        .add(c3.multiply(4)) # Jump to 4 for "High" red color? Or 3?
-        # Let's use 3 and ensure palette handles it.
-        # Old palette: 0,1,2,3,4.
-        # If we use 0, 1, 2, 4 -> It matches Green, Yellow, Orange, Dark Red. 
-        # (Assuming palette[1] is yellow-green, palette[2] yellow, palette[3] orange, palette[4] red)
-        # Wait, let's look at palette in visualize.py: 
-        # ["#1a9850", "#a6d96a", "#fee08b", "#f46d43", "#a50026"]
-        # 0: Dark Green
-        # 1: Light Green
-        # 2: Yellow
-        # 3: Orange
-        # 4: Red
-        
-        # User wants:
-        # < 0.1: Green (0/1)
-        # 0.1-0.35: Yellow (2)
-        # 0.35-0.75: Orange (3)
-        # > 0.75: Red (4)
-        
-        # So we should map:
-        # c0 -> 1 (Light Green) or 0? 0 is fine.
-        # c1 -> 2 (Yellow)
-        # c2 -> 3 (Orange)
-        # c3 -> 4 (Red)
-    )
-    # Actually, let's rewrite the logic slightly to be cleaner
-    
-    # 0: < t0
-    # 1: t0 <= x < t1
-    # 2: t1 <= x < t2
-    # 3: >= t2
-    
-    # To match palette indices:
-    # 0 -> 0 (Green)
-    # 1 -> 2 (Yellow)
-    # 2 -> 3 (Orange)
-    # 3 -> 4 (Red)
-    
-    classified = (
-        c0.multiply(0)
-        .add(c1.multiply(2))
-        .add(c2.multiply(3))
-        .add(c3.multiply(4))
-        .rename("severity")
-        .toUint8()
-    )
-    return classified
-
+        scheme = SeverityScheme("custom", tuple(thresholds), tuple(codes or range(len(thresholds) + 1)))
+    return classify_image(image, scheme)
@@ -0,0 +1,370 @@
+"""Earth Engine sunucu çağrıları için tek istek katmanı.
+
+Tüm `getInfo`, `getMapId`, `getThumbURL` ve küçük resim indirmeleri buradan
+geçer:
+
+- Hatalar sınıflandırılır (bkz. `classify_error`):
+  - rate_limit: 429 / kota / eşzamanlı istek sınırı. Yeniden denenir ve tüm
+    iş parçacıkları ortak bir bekleme süresine girer; böylece bir 429
+    dalgası çalışmayı yavaşlatır ama düşürmez.
+  - transient: 5xx, bağlantı kopması, ağ zaman aşımı. Yeniden denenir.
+  - resource: bellek sınırı, "Computation timed out", çok fazla piksel / öğe.
+    Yeniden denemek işe yaramaz; çağıran tarafın ölçeği büyütmesi gibi bir
+    geri çekilme yapabilmesi için `EEResourceError` olarak yükseltilir.
+  - fatal: kimlik doğrulama, geçersiz argüman vb. Hemen `EERequestError`.
+- Yeniden denemeler jitter'lı üstel geri çekilme ile yapılır.
+- Süreç genelinde eşzamanlı istek sayısı `RetryPolicy.max_concurrency` ile
+  sınırlanır (EE etkileşimli kota sınırının altında tutmak için).
+- İşlem başına çağrı / deneme / hata / süre ölçümleri `metrics()` ile alınır.
+- Katmana bir kaset bağlanmışsa (bkz. `gee.cassette`) istekler kaydedilir
+  veya ağa çıkmadan kayıttan yanıtlanır.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+import random
+import re
+import threading
+import time
+
+from ._lazy import lazy_import
+
+requests = lazy_import("requests")
+
+RATE_LIMIT = "rate_limit"
+TRANSIENT = "transient"
+RESOURCE = "resource"
+FATAL = "fatal"
+
+_RATE_LIMIT_MARKERS = (
+    "too many requests",
+    "quota exceeded",
+    "rate limit",
+    "resource_exhausted",
+    "too many concurrent",
+)
+_RESOURCE_MARKERS = (
+    "memory limit",
+    "computation timed out",
+    "too many pixels",
+    "is too large",
+    "limit exceeded",
+    "accumulating over",
+)
+_TRANSIENT_MARKERS = (
+    "service unavailable",
+    "internal error",
+    "backend error",
+    "bad gateway",
+    "temporarily",
+    "connection reset",
+    "connection aborted",
+    "remote end closed",
+    "deadline exceeded",
+    "timed out",
+)
+
+
+class EERequestError(RuntimeError):
+    """Yeniden denemelerden sonra başarısız olan (veya ölümcül) EE isteği."""
+
+    def __init__(self, op: str, kind: str, attempts: int, cause: BaseException):
+        super().__init__(f"{op} başarısız ({kind}, {attempts} deneme): {cause}")
+        self.op = op
+        self.kind = kind
+        self.attempts = attempts
+        self.cause = cause
+
+
+class EEResourceError(EERequestError):
+    """Sunucu kaynak sınırı (bellek / hesaplama süresi / piksel sayısı)."""
+
+
+class HTTPStatusError(RuntimeError):
+    """İndirme isteğinin 200 dışı yanıtı."""
+
+    def __init__(self, status_code: int, url: str):
+        super().__init__(f"HTTP {status_code}: {url[:120]}")
+        self.status_code = status_code
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        # googleapiclient.errors.HttpError -> exc.resp.status
+        status = getattr(getattr(exc, "resp", None), "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# Mesaj içindeki HTTP kodları yalnızca tam sözcük olarak ("Found 4290023154" veya
+# "over 5000 elements" eşleşmesin)
+_HTTP_429 = re.compile(r"\b429\b")
+_HTTP_5XX = re.compile(r"\b50[0-4]\b")
+
+
+def classify_error(exc: BaseException) -> str:
+    """Hatayı RATE_LIMIT / TRANSIENT / RESOURCE / FATAL olarak sınıflandırır.
+
+    Kaynak sınırı işaretleri, mesajdaki sayısal kodlardan önce denetlenir;
+    yalnızca açık kota / hız sınırı ifadeleri ("rate limit exceeded") kaynak
+    işaretlerinin önüne geçer.
+    """
+    status = _status_code(exc)
+    if status == 429:
+        return RATE_LIMIT
+    if status is not None and status >= 500:
+        return TRANSIENT
+    msg = str(exc).lower()
+    rate_limited = any(m in msg for m in _RATE_LIMIT_MARKERS)
+    if any(m in msg for m in _RESOURCE_MARKERS) and not rate_limited:
+        return RESOURCE
+    if rate_limited or (status is None and _HTTP_429.search(msg)):
+        return RATE_LIMIT
+    if isinstance(exc, (ConnectionError, TimeoutError)) or any(m in msg for m in _TRANSIENT_MARKERS):
+        return TRANSIENT
+    if status is None and _HTTP_5XX.search(msg):
+        return TRANSIENT
+    return FATAL
+
+
+@dataclass
+class RetryPolicy:
+    """Yeniden deneme ve eşzamanlılık ayarları.
+
+    max_attempts: Geçici hatalarda toplam deneme
+    rate_limit_attempts: 429/kota hatalarında toplam deneme (yavaşla, düşme)
+    base_delay / max_delay: Üstel geri çekilmenin başlangıç ve üst sınırı (s)
+    max_concurrency: Süreç genelinde aynı anda açık istek üst sınırı
+    """
+
+    max_attempts: int = 5
+    rate_limit_attempts: int = 30
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    max_concurrency: int = 10
+
+
+@dataclass
+class _OpStats:
+    calls: int = 0
+    ok: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+class RequestMetrics:
+    """İşlem (op) başına iş parçacığı güvenli sayaçlar."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, _OpStats] = {}
+
+    def _get(self, op: str) -> _OpStats:
+        return self._ops.setdefault(op, _OpStats())
+
+    def record(self, op: str, **delta) -> None:
+        with self._lock:
+            st = self._get(op)
+            kind = delta.pop("error", None)
+            if kind:
+                st.errors[kind] = st.errors.get(kind, 0) + 1
+            for k, v in delta.items():
+                setattr(st, k, getattr(st, k) + v)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            out = {}
+            for op, st in self._ops.items():
+                row = {k: getattr(st, k) for k in ("calls", "ok", "retries", "rate_limited", "failures", "seconds")}
+                row["errors"] = dict(st.errors)
+                row["mean_seconds"] = st.seconds / st.ok if st.ok else 0.0
+                out[op] = row
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+
+class RequestLayer:
+    """Yeniden deneme, geri çekilme, eşzamanlılık sınırı ve ölçümlerle EE çağrıcısı."""
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: Optional[int] = None,
+        cassette: Optional[Any] = None,
+    ):
+        self.policy = policy or RetryPolicy()
+        # Kayıt/yanıt kaseti (gee.cassette.Cassette); None ise her istek ağa gider
+        self.cassette = cassette
+        self.metrics = RequestMetrics()
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._slots = threading.BoundedSemaphore(max(1, self.policy.max_concurrency))
+        self._pause_lock = threading.Lock()
+        self._pause_until = 0.0
+
+    def _backoff(self, attempt: int) -> float:
+        cap = min(self.policy.max_delay, self.policy.base_delay * (2 ** attempt))
+        # "Eşit jitter": en az cap/2 bekle, gerisi rastgele (eşzamanlı yeniden denemeler dağılsın)
+        return cap / 2 + self._rng.uniform(0, cap / 2)
+
+    def _wait_for_pause(self) -> None:
+        while True:
+            with self._pause_lock:
+                remaining = self._pause_until - time.monotonic()
+            if remaining <= 0:
+                return
+            self._sleep(remaining)
+
+    def _pause_all(self, delay: float) -> None:
+        with self._pause_lock:
+            self._pause_until = max(self._pause_until, time.monotonic() + delay)
+
+    def call(self, op: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """`fn(*args, **kwargs)`'ı politika altında çalıştırır ve sonucunu döndürür."""
+        self.metrics.record(op, calls=1)
+        attempt = 0
+        while True:
+            self._wait_for_pause()
+            t0 = time.monotonic()
+            try:
+                with self._slots:
+                    result = fn(*args, **kwargs)
+            except Exception as exc:
+                kind = classify_error(exc)
+                self.metrics.record(op, error=kind)
+                attempt += 1
+                limit = self.policy.rate_limit_attempts if kind == RATE_LIMIT else self.policy.max_attempts
+                if kind in (RESOURCE, FATAL) or attempt >= limit:
+                    self.metrics.record(op, failures=1)
+                    err = EEResourceError if kind == RESOURCE else EERequestError
+                    raise err(op, kind, attempt, exc) from exc
+                delay = self._backoff(attempt - 1)
+                if kind == RATE_LIMIT:
+                    # Kota aşıldı: yalnızca bu çağrı değil tüm çağrılar yavaşlasın
+                    self.metrics.record(op, rate_limited=1)
+                    self._pause_all(delay)
+                else:
+                    self._sleep(delay)
+                self.metrics.record(op, retries=1)
+                continue
+            self.metrics.record(op, ok=1, seconds=time.monotonic() - t0)
+            return result
+
+    def _request(self, op: str, method: str, parts: tuple, fn: Callable[[], Any]) -> Any:
+        """Kısayolların ortak yolu: kaset varsa önce kayıttan yanıtla, yoksa çağır ve kaydet.
+
+        `method` + `parts` isteği tanımlar (kaset anahtarı); `op` yalnızca ölçüm etiketidir.
+        """
+        cassette = self.cassette
+        if cassette is None:
+            return self.call(op, fn)
+        hit = cassette.lookup(method, parts)
+        if hit is not None:
+            value, delay = hit
+
+            def _replay() -> Any:
+                if delay > 0:
+                    self._sleep(delay)
+                return value
+
+            return self.call(op, _replay)
+        elapsed = [0.0]
+
+        def _timed() -> Any:
+            t0 = time.monotonic()
+            result = fn()
+            elapsed[0] = time.monotonic() - t0
+            return result
+
+        result = self.call(op, _timed)
+        cassette.record(method, parts, result, elapsed[0], op=op)
+        return result
+
+    # ---- Kısayollar ----
+
+    def get_info(self, obj: Any, op: str = "getInfo") -> Any:
+        return self._request(op, "getInfo", (obj,), obj.getInfo)
+
+    def get_map_id(self, image: Any, vis: Optional[dict] = None, op: str = "getMapId") -> Any:
+        return self._request(op, "getMapId", (image, vis), lambda: image.getMapId(vis))
+
+    def get_thumb_url(self, image: Any, params: dict, op: str = "getThumbURL") -> str:
+        return self._request(op, "getThumbURL", (image, params), lambda: image.getThumbURL(params))
+
+    def download(self, url: str, timeout: float = 300, op: str = "download") -> bytes:
+        """URL içeriğini indirir; 429 ve 5xx yanıtlar yeniden denenir."""
+
+        def _get() -> bytes:
+            r = requests.get(url, timeout=timeout)
+            if r.status_code != 200:
+                raise HTTPStatusError(r.status_code, url)
+            return r.content
+
+        return self._request(op, "download", (url,), _get)
+
+    def start_task(self, task: Any, op: str = "startTask") -> Optional[str]:
+        """Dışa aktarma görevini başlatır ve görev kimliğini döndürür."""
+
+        def _start() -> Optional[str]:
+            task.start()
+            return getattr(task, "id", None)
+
+        parts = (getattr(task, "task_type", None), getattr(task, "config", None))
+        task_id = self._request(op, "startTask", parts, _start)
+        task.id = task_id
+        return task_id
+
+
+_default_layer = RequestLayer()
+
+
+def default_layer() -> RequestLayer:
+    """Süreç genelinde paylaşılan istek katmanı."""
+    return _default_layer
+
+
+def configure(policy: Optional[RetryPolicy] = None, **overrides) -> RequestLayer:
+    """Varsayılan katmanı yeni politika ile değiştirir (örn. `configure(max_concurrency=4)`)."""
+    global _default_layer
+    policy = policy or RetryPolicy()
+    for k, v in overrides.items():
+        setattr(policy, k, v)
+    _default_layer = RequestLayer(policy, cassette=_default_layer.cassette)
+    return _default_layer
+
+
+def get_info(obj: Any, op: str = "getInfo") -> Any:
+    return _default_layer.get_info(obj, op=op)
+
+
+def get_map_id(image: Any, vis: Optional[dict] = None, op: str = "getMapId") -> Any:
+    return _default_layer.get_map_id(image, vis, op=op)
+
+
+def get_thumb_url(image: Any, params: dict, op: str = "getThumbURL") -> str:
+    return _default_layer.get_thumb_url(image, params, op=op)
+
+
+def download(url: str, timeout: float = 300, op: str = "download") -> bytes:
+    return _default_layer.download(url, timeout=timeout, op=op)
+
+
+def start_task(task: Any, op: str = "startTask") -> Optional[str]:
+    return _default_layer.start_task(task, op=op)
+
+
+def metrics() -> Dict[str, dict]:
+    """Varsayılan katmanın işlem bazında ölçümleri."""
+    return _default_layer.metrics.snapshot()
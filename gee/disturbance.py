@@ -0,0 +1,191 @@
+"""Ani bozulma (yangın, kesim, maden genişlemesi) kırılma noktası tespiti.
+
+Her piksel serisi için tek kırılmalı parçalı model uydurulur (LandTrendr'ın
+sadeleştirilmiş hali):
+
+    y_t = a                  (t < t_b, bozulma öncesi kararlı düzey)
+    y_t = c + d (t - t_b)    (t >= t_b, bozulma sonrası doğrusal toparlanma)
+
+Tüm aday kırılma yılları için en küçük kareler çözümleri önek/sonek
+toplamlarından kapalı biçimde hesaplanır; düşüşü (a - c) `min_magnitude`
+ve üzeri olan adaylar arasından artık kareler toplamı en küçük olan seçilir.
+Seçilen model, ek parametreleri BIC ile cezalandırıldığında tek bir doğrusal
+trendden daha iyi uymuyorsa piksel bozulmasız sayılır; böylece yavaş düşüşler (bkz. `gee.trend`) ani
+bozulmadan ayrılır. Zaman ekseni dışında Python döngüsü yoktur, tüm
+pikseller birlikte işlenir.
+
+- detect_breakpoints: bellek içi (T, ...) dizi -> yıl / büyüklük / sonraki eğim
+- detect_breakpoints_local: (zaman, y, x) yığını -> kodlanmış rasterlar
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Dict, Optional, Sequence, Union
+import os
+
+import numpy as np
+
+from .raster import (
+    ScaledRaster,
+    create_raster,
+    encoding_for,
+    iter_windows,
+    map_windows,
+    raster_shape,
+    read_window,
+)
+
+RasterSource = Union[str, np.ndarray, ScaledRaster]
+
+DISTURBANCE_PRODUCTS = ("dist_year", "dist_magnitude", "post_slope")
+
+# NBR düşüşü için varsayılan alt sınır (USGS dNBR "düşük şiddet" eşiği)
+DEFAULT_MIN_MAGNITUDE = 0.10
+
+
+def detect_breakpoints(
+    values: np.ndarray,
+    years: Optional[Sequence[float]] = None,
+    min_magnitude: float = DEFAULT_MIN_MAGNITUDE,
+    min_pre: int = 1,
+    min_post: int = 1,
+) -> Dict[str, np.ndarray]:
+    """Zaman ekseni 0 olan dizinin her serisi için en iyi ani düşüşü bulur.
+
+    Args:
+        values: (T, ...) NBR (veya başka bir indeks) yığını; NaN atlanır
+        years: T uzunluğunda zaman ekseni (varsayılan 0..T-1)
+        min_magnitude: Bozulma sayılacak en küçük düşüş (a - c)
+        min_pre / min_post: Kırılmadan önce / sonra gereken geçerli gözlem
+
+    Returns:
+        year (bozulma yılı, yoksa NaN), magnitude (kırılmadaki düşüş),
+        post_slope (sonraki eğim, birim/yıl), pre_level ve rss
+    """
+    y = np.asarray(values, dtype=np.float64)
+    T = y.shape[0]
+    yrs = np.arange(T, dtype=np.float64) if years is None else np.asarray(years, dtype=np.float64)
+    if len(yrs) != T:
+        raise ValueError(f"years uzunluğu ({len(yrs)}) != zaman ekseni ({T})")
+    shape = y.shape[1:]
+    y = y.reshape(T, -1)
+
+    # Sayısal kararlılık için merkezlenmiş zaman
+    t = (yrs - yrs.mean())[:, None]
+    w = np.isfinite(y)
+    yv = np.where(w, y, 0.0)
+    wf = w.astype(np.float64)
+
+    # Önek (kırılma öncesi, [0, b)) ve sonek (kırılma sonrası, [b, T)) toplamları
+    pre_n = np.cumsum(wf, axis=0)[:-1]
+    pre_y = np.cumsum(yv, axis=0)[:-1]
+    pre_yy = np.cumsum(yv * yv, axis=0)[:-1]
+
+    def suffix(a):
+        return np.cumsum(a[::-1], axis=0)[::-1][1:]
+
+    post_n = suffix(wf)
+    post_t = suffix(wf * t)
+    post_tt = suffix(wf * t * t)
+    post_y = suffix(yv)
+    post_ty = suffix(yv * t)
+    post_yy = suffix(yv * yv)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = pre_y / pre_n
+        rss_pre = pre_yy - pre_y * a
+
+        den = post_n * post_tt - post_t * post_t
+        d = np.where(den > 1e-12, (post_n * post_ty - post_t * post_y) / den, 0.0)
+        c0 = (post_y - d * post_t) / post_n
+        rss_post = post_yy - c0 * post_y - d * post_ty
+        c = c0 + d * t[1:]
+
+        mag = a - c
+        # Kırılma yılı geçerli bir gözlem olmalı (NaN yıllarda aynı bölünme tekrarlanmasın)
+        ok = (pre_n >= min_pre) & (post_n >= min_post) & w[1:] & (mag >= min_magnitude)
+        rss = np.where(ok, rss_pre + rss_post, np.inf)
+
+        # Kırılmasız doğrusal model: yavaş düşüşü ani bozulmadan ayırmak için
+        n, st, stt = post_n[0] + wf[0], post_t[0] + wf[0] * t[0], post_tt[0] + wf[0] * t[0] ** 2
+        sy, sty, syy = post_y[0] + yv[0], post_ty[0] + yv[0] * t[0], post_yy[0] + yv[0] ** 2
+        den_lin = n * stt - st * st
+        d_lin = np.where(den_lin > 1e-12, (n * sty - st * sy) / den_lin, 0.0)
+        c_lin = (sy - d_lin * st) / n
+        rss_lin = syy - c_lin * sy - d_lin * sty
+
+    best = np.argmin(rss, axis=0)
+    cols = np.arange(y.shape[1])
+    best_rss = rss[best, cols]
+    # BIC: kırılmalı model (a, c, d, kırılma yılı) doğrusal modele (2 parametre)
+    # karşı ancak RSS_b < RSS_lin * n^(-2/n) ise tercih edilir
+    with np.errstate(divide="ignore", invalid="ignore"):
+        found = np.isfinite(best_rss) & (best_rss < rss_lin * n ** (-2.0 / n))
+
+    def pick(arr):
+        return np.where(found, arr[best, cols], np.nan).reshape(shape)
+
+    return {
+        "year": np.where(found, yrs[best + 1], np.nan).reshape(shape),
+        "magnitude": pick(mag),
+        "post_slope": pick(d),
+        "pre_level": pick(a),
+        "rss": np.where(found, best_rss, np.nan).reshape(shape),
+    }
+
+
+def _breakpoint_window(
+    src: RasterSource,
+    years: Sequence[float],
+    kwargs: dict,
+    outputs: Dict[str, str],
+    window: tuple,
+) -> None:
+    res = detect_breakpoints(read_window(src, window), years, **kwargs)
+    values = {"dist_year": res["year"], "dist_magnitude": res["magnitude"], "post_slope": res["post_slope"]}
+    win = window[-2:]
+    for product, path in outputs.items():
+        out = np.load(path, mmap_mode="r+")
+        out[win] = encoding_for(product).encode(values[product])
+        out.flush()
+        del out
+
+
+def detect_breakpoints_local(
+    stack: RasterSource,
+    out_dir: str,
+    years: Optional[Sequence[float]] = None,
+    min_magnitude: float = DEFAULT_MIN_MAGNITUDE,
+    min_pre: int = 1,
+    min_post: int = 1,
+    window: int = 512,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """(zaman, y, x) yığını için bozulma yılı, büyüklüğü ve sonraki eğim rasterları.
+
+    Pencereler `stack` bir yol ise süreç havuzunda, değilse iş parçacıklarında
+    işlenir. Bozulma bulunmayan pikseller nodata yazılır.
+
+    Returns:
+        Ürün adı (dist_year, dist_magnitude, post_slope) -> çıktı dosya yolu
+    """
+    shape = raster_shape(stack)
+    if len(shape) != 3:
+        raise ValueError(f"detect_breakpoints_local: (zaman, y, x) yığını bekleniyor, boyut {shape}")
+    years = list(range(shape[0])) if years is None else [float(y) for y in years]
+
+    kwargs = {"min_magnitude": min_magnitude, "min_pre": min_pre, "min_post": min_post}
+    outputs: Dict[str, str] = {}
+    for product in DISTURBANCE_PRODUCTS:
+        path = os.path.join(out_dir, f"{product}.npy")
+        create_raster(path, shape[1:], product=product, meta={"years": list(years), **kwargs}).flush()
+        outputs[product] = path
+
+    map_windows(
+        partial(_breakpoint_window, stack, years, kwargs, outputs),
+        iter_windows(shape, window),
+        workers=workers,
+        processes=isinstance(stack, str),
+    )
+    return outputs
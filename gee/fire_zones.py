@@ -0,0 +1,159 @@
+"""Ana yangın bölgelerinin (en büyük yanık kümelerinin) tespiti.
+
+- detect_fire_zones_ee: Yanık maskesi kaba ölçekte vektörleştirilir
+  (`reduceToVectors`), yakın parçalar `merge_distance_m` ile birleştirilir ve
+  en büyük N kümenin sınır kutuları tek bir `getInfo` ile alınır.
+- detect_fire_zones: Yerel `PatchLabels` sonucundan en büyük N yamanın sınır
+  kutuları (harita koordinatlarında) ve alanları.
+
+Dönen kutular, yüksek çözünürlüklü çıktıları tüm AOI yerine yalnızca bu
+bölgelerde üretmek için kullanılır (bkz. `run_pipeline(fire_zone_top_n=...)`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._lazy import lazy_import
+from .client import get_info
+from .patches import PatchLabels
+from .raster import iter_windows, raster_meta
+
+ee = lazy_import("ee")
+
+BBox = Tuple[float, float, float, float]
+
+
+@dataclass
+class FireZone:
+    """Tek bir yangın bölgesi: (xmin, ymin, xmax, ymax) kutusu ve yanık alanı."""
+
+    rank: int
+    bbox: BBox
+    area_ha: float
+    patch_id: Optional[int] = None
+
+    def to_ee(self) -> ee.Geometry:
+        """Kutuyu `ee.Geometry` olarak döndürür (coğrafi koordinatlar için)."""
+        return ee.Geometry.BBox(*self.bbox)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def detect_fire_zones_ee(
+    burned: ee.Image,
+    region: ee.Geometry,
+    top_n: int = 3,
+    scale: float = 100,
+    merge_distance_m: float = 500,
+    min_area_ha: float = 0.0,
+) -> List[FireZone]:
+    """Sunucu tarafında en büyük `top_n` yanık kümesini bulur.
+
+    Args:
+        burned: Yanık maskesi (0/1), örn. `severity.gt(0)`
+        region: Arama bölgesi (AOI)
+        scale: Vektörleştirme ölçeği (m). Kaba ölçek yeterlidir; kutu daha
+            sonra tam çözünürlükte işlenir.
+        merge_distance_m: Bu mesafeden yakın yanık parçaları tek küme sayılır.
+        min_area_ha: Bu alanın altındaki kümeler atlanır.
+    """
+    mask = burned.gt(0).unmask(0)
+    # Kümeler yakın parçaları da kapsasın diye maske genişletilir; alan ise
+    # genişletilmemiş yanık piksellerinden hesaplanır.
+    cluster = mask.focalMax(merge_distance_m, "circle", "meters") if merge_distance_m else mask
+    burned_ha = ee.Image.pixelArea().divide(10000.0).multiply(mask).rename("burned_ha")
+
+    vectors = cluster.selfMask().addBands(burned_ha).reduceToVectors(
+        geometry=region,
+        scale=scale,
+        geometryType="polygon",
+        eightConnected=True,
+        reducer=ee.Reducer.sum(),
+        maxPixels=1e10,
+        bestEffort=True,
+        tileScale=16,
+    )
+    vectors = vectors.filter(ee.Filter.gte("sum", min_area_ha)) if min_area_ha else vectors
+    top = vectors.sort("sum", False).limit(top_n)
+
+    def _bbox(f):
+        return ee.Feature(None, {
+            "area_ha": f.get("sum"),
+            "bbox": f.geometry().bounds(scale).coordinates(),
+        })
+
+    info = get_info(top.map(_bbox), op="fire_zones")
+    zones = []
+    for rank, feat in enumerate(info.get("features", []), start=1):
+        props = feat["properties"]
+        ring = props["bbox"][0]
+        xs = [p[0] for p in ring]
+        ys = [p[1] for p in ring]
+        zones.append(FireZone(rank, (min(xs), min(ys), max(xs), max(ys)), float(props.get("area_ha") or 0.0)))
+    return zones
+
+
+def _pixel_to_map(transform: Sequence[float], row: float, col: float) -> Tuple[float, float]:
+    # GDAL sırası: (c, a, b, f, d, e) -> x = c + col*a + row*b, y = f + col*d + row*e
+    c, a, b, f, d, e = transform
+    return float(c + col * a + row * b), float(f + col * d + row * e)
+
+
+def detect_fire_zones(
+    patches: PatchLabels,
+    top_n: int = 3,
+    transform: Optional[Sequence[float]] = None,
+    raster_path: Optional[str] = None,
+    min_area_ha: float = 0.0,
+) -> List[FireZone]:
+    """Yerel etiketlerden en büyük `top_n` yamanın kutusunu ve alanını döndürür.
+
+    Kutular `transform` (GDAL sırası) ile harita koordinatlarına çevrilir;
+    verilmezse `raster_path` meta dosyası denenir, o da yoksa piksel
+    koordinatları (x = sütun, y = satır) döner.
+    """
+    if transform is None and raster_path:
+        transform = raster_meta(raster_path).get("transform")
+
+    area = patches.area_ha
+    order = np.argsort(area)[::-1]
+    top = [int(i) for i in order if i > 0 and area[i] > 0 and area[i] >= min_area_ha][:top_n]
+    if not top:
+        return []
+
+    lut = np.full(len(patches.parent), -1, dtype=np.int64)
+    lut[top] = np.arange(len(top))
+    rmin = np.full(len(top), np.iinfo(np.int64).max)
+    cmin = np.full(len(top), np.iinfo(np.int64).max)
+    rmax = np.full(len(top), -1)
+    cmax = np.full(len(top), -1)
+
+    for w in iter_windows(patches.shape, patches.window):
+        k = lut[patches.read(w)]
+        rows, cols = np.nonzero(k >= 0)
+        if not len(rows):
+            continue
+        k = k[rows, cols]
+        rows = rows + w[0].start
+        cols = cols + w[1].start
+        np.minimum.at(rmin, k, rows)
+        np.maximum.at(rmax, k, rows)
+        np.minimum.at(cmin, k, cols)
+        np.maximum.at(cmax, k, cols)
+
+    zones = []
+    for j, pid in enumerate(top):
+        # Piksel kenarları: üst-sol (rmin, cmin), alt-sağ (rmax + 1, cmax + 1)
+        corners = [(int(rmin[j]), int(cmin[j])), (int(rmax[j]) + 1, int(cmax[j]) + 1)]
+        if transform is not None:
+            pts = [_pixel_to_map(transform, r, c) for r, c in corners]
+        else:
+            pts = [(float(c), float(r)) for r, c in corners]
+        xs, ys = [p[0] for p in pts], [p[1] for p in pts]
+        zones.append(FireZone(j + 1, (min(xs), min(ys), max(xs), max(ys)), float(area[pid]), patch_id=pid))
+    return zones
@@ -1,31 +1,174 @@
+"""Spektral indeks kaydı (registry) ve derleyicileri.
+
+Her indeks tek bir yerde, yansıma (reflectance) cinsinden bir ifade olarak
+tanımlanır ve istek üzerine iki hedefe derlenir:
+
+- ee_index / with_indices: `ee.Image.expression` ile sunucu tarafı bant
+- numpy_kernel / compute_indices: yerel dizilerde vektörize NumPy fonksiyonu
+
+Çağıranlar yalnızca ihtiyaç duydukları indeksleri ister; varsayılan set
+(`DEFAULT_INDICES`) değişim analizinde kullanılan NDVI ve NBR'dir.
+"""
+
 from __future__ import annotations
 
-import ee
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ._lazy import lazy_import
+
+ee = lazy_import("ee")
+
+
+# Sentinel-2 SR (L2A) DN -> yansıma çarpanı
+SR_SCALE = 1e-4
+
+# Küçük sayı ile payda stabilizasyonu
+EPS = 1e-6
 
+# Değişim analizinin (compute_diffs) ihtiyaç duyduğu indeksler
+DEFAULT_INDICES = ("NDVI", "NBR")
 
-def with_indices(img: ee.Image) -> ee.Image:
-    """Girdi Sentinel-2 görüntüsüne NDVI, NBR, NDWI, MNDWI bantlarını ekler.
 
-    Bant eşlemleri (Sentinel-2 SR):
-      - Kırmızı (Red): B4
-      - Yeşil (Green): B3
-      - NIR: B8
-      - SWIR1: B11
-      - SWIR2: B12
+@dataclass(frozen=True)
+class SpectralIndex:
+    """Tek bir spektral indeksin tanımı.
+
+    expression: EE ifade sözdizimi (Python ile de uyumlu alt küme: + - * / ** ve
+        `sqrt`, `abs`). Değişkenler `bands` anahtarları ve `EPS` sabitidir.
+    bands: ifade değişkeni -> Sentinel-2 bant adı (örn: {"NIR": "B8"})
     """
-    red = img.select("B4").toFloat()
-    green = img.select("B3").toFloat()
-    nir = img.select("B8").toFloat()
-    swir1 = img.select("B11").toFloat()
-    swir2 = img.select("B12").toFloat()
 
-    # Küçük sayı ile payda stabilizasyonu
-    eps = ee.Image.constant(1e-6)
+    name: str
+    expression: str
+    bands: Mapping[str, str]
+    description: str = ""
+
+
+_REGISTRY: Dict[str, SpectralIndex] = {}
+_KERNELS: Dict[str, Callable[..., np.ndarray]] = {}
+
+
+def register_index(index: SpectralIndex, overwrite: bool = False) -> SpectralIndex:
+    """İndeksi kayda ekler. Aynı isim varsa `overwrite=True` gerekir."""
+    if index.name in _REGISTRY and not overwrite:
+        raise ValueError(f"register_index: '{index.name}' zaten tanımlı.")
+    _REGISTRY[index.name] = index
+    _KERNELS.pop(index.name, None)
+    return index
+
+
+def get_index(name: str) -> SpectralIndex:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Bilinmeyen indeks '{name}'. Tanımlı olanlar: {sorted(_REGISTRY)}") from None
+
+
+def available_indices() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def required_bands(names: Iterable[str]) -> list[str]:
+    """İstenen indeksler için gereken Sentinel-2 bantlarını (tekrarsız) döndürür."""
+    out: list[str] = []
+    for name in names:
+        for band in get_index(name).bands.values():
+            if band not in out:
+                out.append(band)
+    return out
+
+
+# Bant eşlemleri (Sentinel-2 SR):
+#   Yeşil B3, Kırmızı B4, NIR B8, dar NIR B8A, SWIR1 B11, SWIR2 B12
+for _idx in (
+    SpectralIndex("NDVI", "(NIR - RED) / (NIR + RED + EPS)", {"NIR": "B8", "RED": "B4"},
+                  "Normalized Difference Vegetation Index"),
+    SpectralIndex("NBR", "(NIR - SWIR2) / (NIR + SWIR2 + EPS)", {"NIR": "B8", "SWIR2": "B12"},
+                  "Normalized Burn Ratio"),
+    SpectralIndex("NBR2", "(SWIR1 - SWIR2) / (SWIR1 + SWIR2 + EPS)", {"SWIR1": "B11", "SWIR2": "B12"},
+                  "Normalized Burn Ratio 2"),
+    SpectralIndex("NDMI", "(NIR - SWIR1) / (NIR + SWIR1 + EPS)", {"NIR": "B8A", "SWIR1": "B11"},
+                  "Normalized Difference Moisture Index"),
+    SpectralIndex("NDWI", "(GREEN - NIR) / (GREEN + NIR + EPS)", {"GREEN": "B3", "NIR": "B8"},
+                  "Normalized Difference Water Index (McFeeters)"),
+    SpectralIndex("MNDWI", "(GREEN - SWIR1) / (GREEN + SWIR1 + EPS)", {"GREEN": "B3", "SWIR1": "B11"},
+                  "Modified NDWI"),
+    SpectralIndex("BAI", "1 / ((0.1 - RED) ** 2 + (0.06 - NIR) ** 2 + EPS)", {"RED": "B4", "NIR": "B8"},
+                  "Burned Area Index"),
+    SpectralIndex("MSAVI", "(2 * NIR + 1 - sqrt(abs((2 * NIR + 1) ** 2 - 8 * (NIR - RED)))) / 2",
+                  {"NIR": "B8", "RED": "B4"},
+                  "Modified Soil Adjusted Vegetation Index"),
+):
+    register_index(_idx)
+
+
+def ee_index(img: ee.Image, name: str, scale: float = SR_SCALE) -> ee.Image:
+    """Kayıttaki indeksi `img` üzerinde tek bantlık `ee.Image` olarak derler.
+
+    scale: Bant değerlerini yansımaya çeviren çarpan (ölçeklenmiş girdiler için 1.0).
+    """
+    idx = get_index(name)
+    variables = {alias: img.select(band).toFloat().multiply(scale) for alias, band in idx.bands.items()}
+    variables["EPS"] = EPS
+    return img.expression(idx.expression, variables).rename(name)
+
+
+def with_indices(
+    img: ee.Image,
+    indices: Sequence[str] = DEFAULT_INDICES,
+    scale: float = SR_SCALE,
+) -> ee.Image:
+    """Girdi Sentinel-2 görüntüsüne yalnızca istenen indeks bantlarını ekler.
+
+    Varsayılan olarak NDVI ve NBR eklenir; NDWI/MNDWI gibi ek indeksler
+    gerektiğinde `indices` ile açıkça istenmelidir.
+    """
+    if not indices:
+        return img
+    return img.addBands([ee_index(img, name, scale) for name in indices])
+
+
+def numpy_kernel(name: str) -> Callable[..., np.ndarray]:
+    """İndeksin vektörize NumPy fonksiyonunu döndürür (derleme önbelleklenir).
+
+    Dönen fonksiyon, Sentinel-2 bant adlarıyla anahtar kelime argümanları alır:
+        numpy_kernel("NBR")(B8=nir, B12=swir2, scale=1e-4)
+    """
+    kernel = _KERNELS.get(name)
+    if kernel is not None:
+        return kernel
+
+    idx = get_index(name)
+    code = compile(idx.expression, f"<index {name}>", "eval")
+    aliases = dict(idx.bands)
+
+    def kernel(scale: float = SR_SCALE, **bands: np.ndarray) -> np.ndarray:
+        ns: Dict[str, object] = {"sqrt": np.sqrt, "abs": np.abs, "EPS": EPS}
+        for alias, band in aliases.items():
+            if band not in bands:
+                raise KeyError(f"{name}: '{band}' bandı eksik.")
+            ns[alias] = np.asarray(bands[band], dtype=np.float32) * np.float32(scale)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = eval(code, {"__builtins__": {}}, ns)
+        return np.asarray(out, dtype=np.float32)
 
-    ndvi = nir.subtract(red).divide(nir.add(red).add(eps)).rename("NDVI")
-    nbr = nir.subtract(swir2).divide(nir.add(swir2).add(eps)).rename("NBR")
-    ndwi = green.subtract(nir).divide(green.add(nir).add(eps)).rename("NDWI")
-    mndwi = green.subtract(swir1).divide(green.add(swir1).add(eps)).rename("MNDWI")
+    kernel.__name__ = f"{name.lower()}_kernel"
+    _KERNELS[name] = kernel
+    return kernel
 
-    return img.addBands([ndvi, nbr, ndwi, mndwi])
 
+def compute_indices(
+    bands: Mapping[str, np.ndarray],
+    indices: Sequence[str] = DEFAULT_INDICES,
+    scale: float = SR_SCALE,
+    out: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """Yerel bant dizilerinden (örn: {"B4": ..., "B8": ...}) istenen indeksleri hesaplar."""
+    out = {} if out is None else out
+    for name in indices:
+        needed = {b: bands[b] for b in get_index(name).bands.values() if b in bands}
+        out[name] = numpy_kernel(name)(scale=scale, **needed)
+    return out
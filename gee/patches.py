@@ -0,0 +1,243 @@
+"""Bağlı bileşen (yanık yaması) etiketleme ve küçük yama filtresi.
+
+Sunucu tarafı:
+- filter_small_patches_ee: `connectedPixelCount` (sınırlı komşuluk) ile
+  `min_patch_ha` altındaki yamaları kaldırır.
+
+Yerel (bellek dışı):
+- label_patches: raster karo karo `scipy.ndimage.label` ile etiketlenir,
+  karo sınırlarını geçen bileşenler union-find ile birleştirilir.
+- filter_small_patches: etiketlerden yama alanını (ha) hesaplar ve eşik
+  altındaki yamaları düşürerek uint8 yanık maskesi yazar.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, Union
+import math
+import os
+import warnings
+
+import numpy as np
+
+from ._lazy import lazy_import
+from .raster import (
+    ScaledRaster,
+    create_raster,
+    iter_windows,
+    map_windows,
+    raster_shape,
+    read_window,
+)
+from .utils import ensure_dir
+
+ee = lazy_import("ee")
+ndimage = lazy_import("scipy.ndimage")
+
+# connectedPixelCount için EE üst sınırı
+EE_MAX_PATCH_PIXELS = 1024
+
+# 10 m Sentinel-2 pikseli = 0.01 ha
+S2_PIXEL_AREA_HA = 0.01
+
+
+def filter_small_patches_ee(
+    burned: ee.Image,
+    min_patch_ha: float,
+    scale: float = 10,
+    eight_connected: bool = True,
+) -> ee.Image:
+    """`burned` (0/1) maskesinde alanı `min_patch_ha` altındaki yamaları 0 yapar.
+
+    Yama alanı `connectedPixelCount * pixelArea` ile hesaplanır; komşuluk
+    `min_patch_ha`'yı `scale` çözünürlükte kapsayacak piksel sayısıyla (en
+    fazla 1024) sınırlandırılır. Sayımı bu sınıra ulaşan yamalar alanlarına
+    bakılmadan korunur; eşik 1024 pikseli aşıyorsa (10 m'de 10.24 ha) bu
+    yamalar eşikten küçük olsa bile elenemez ve bir uyarı verilir.
+    """
+    min_pixels = math.ceil(min_patch_ha * 10000.0 / (scale * scale))
+    max_size = int(min(EE_MAX_PATCH_PIXELS, min_pixels + 1))
+    if min_pixels >= EE_MAX_PATCH_PIXELS:
+        warnings.warn(
+            f"filter_small_patches_ee: {min_patch_ha} ha, {scale} m'de {min_pixels} piksel; komşuluk "
+            f"{EE_MAX_PATCH_PIXELS} piksel ile sınırlı, en az {EE_MAX_PATCH_PIXELS} piksellik yamalar korunur.",
+            stacklevel=2,
+        )
+
+    mask = burned.gt(0)
+    count = mask.selfMask().connectedPixelCount(max_size, eight_connected)
+    patch_ha = count.multiply(ee.Image.pixelArea()).divide(10000.0)
+    # Sayım üst sınırda kesilir: sınıra ulaşan yama en az max_size pikseldir
+    keep = patch_ha.gte(min_patch_ha).Or(count.gte(max_size)).unmask(0)
+    return mask.And(keep).rename("burned")
+
+
+@dataclass
+class PatchLabels:
+    """Yerel etiketleme sonucu.
+
+    path: Genel etiket kimlikleri (int32 .npy, 0 = arka plan). Aynı yamaya ait
+        etiketler `parent` ile aynı köke eşlenir.
+    parent: etiket -> kök etiket
+    pixel_count: kök etiket -> piksel sayısı (kök olmayanlar 0)
+    """
+
+    path: str
+    shape: tuple
+    window: int
+    parent: np.ndarray
+    pixel_count: np.ndarray
+    pixel_area_ha: float = S2_PIXEL_AREA_HA
+
+    @property
+    def area_ha(self) -> np.ndarray:
+        return self.pixel_count * self.pixel_area_ha
+
+    @property
+    def patch_ids(self) -> np.ndarray:
+        return np.flatnonzero(self.pixel_count)
+
+    def read(self, window: tuple) -> np.ndarray:
+        """Pencere için kök (yama) kimliklerini döndürür."""
+        labels = np.load(self.path, mmap_mode="r")[window]
+        return self.parent[labels]
+
+
+def _burned_window(src, window: tuple) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return read_window(src, window) > 0
+
+
+def _label_window(src, labels_path: str, structure: np.ndarray, window: tuple) -> np.ndarray:
+    lab, n = ndimage.label(_burned_window(src, window), structure=structure)
+    out = np.load(labels_path, mmap_mode="r+")
+    out[window] = lab
+    out.flush()
+    return np.bincount(lab.ravel(), minlength=n + 1)[1:]
+
+
+def _offset_window(labels_path: str, offsets: dict, window: tuple) -> None:
+    out = np.load(labels_path, mmap_mode="r+")
+    block = out[window]
+    block[block > 0] += offsets[(window[0].start, window[1].start)]
+    out[window] = block
+    out.flush()
+
+
+def _seam_pairs(a: np.ndarray, b: np.ndarray, eight_connected: bool) -> np.ndarray:
+    """Komşu iki satır/sütun boyunca birleşmesi gereken (etiket, etiket) çiftleri."""
+    pairs = [np.stack([a, b], axis=1)]
+    if eight_connected:
+        pairs.append(np.stack([a[:-1], b[1:]], axis=1))
+        pairs.append(np.stack([a[1:], b[:-1]], axis=1))
+    p = np.concatenate(pairs)
+    p = p[(p[:, 0] > 0) & (p[:, 1] > 0)]
+    return np.unique(p, axis=0) if len(p) else p
+
+
+def _find(parent: np.ndarray, x: int) -> int:
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:
+        parent[x], x = root, parent[x]
+    return root
+
+
+def label_patches(
+    src: Union[str, np.ndarray, ScaledRaster],
+    out_path: str,
+    window: int = 2048,
+    eight_connected: bool = True,
+    pixel_area_ha: float = S2_PIXEL_AREA_HA,
+    workers: Optional[int] = None,
+) -> PatchLabels:
+    """Yanık pikselleri (`src > 0`) karo karo etiketler ve karolar arası birleştirir.
+
+    `src` bir `save_raster` yolu, ScaledRaster veya dizi olabilir (NaN/nodata
+    yanmamış sayılır). Etiketler `out_path` altına int32 olarak yazılır.
+    """
+    shape = raster_shape(src)[-2:]
+    structure = ndimage.generate_binary_structure(2, 2 if eight_connected else 1)
+    labels_path = out_path if out_path.endswith(".npy") else out_path + ".npy"
+    ensure_dir(os.path.dirname(labels_path))
+    np.lib.format.open_memmap(labels_path, mode="w+", dtype=np.int32, shape=shape).flush()
+
+    windows = list(iter_windows(shape, window))
+    processes = isinstance(src, str)
+    sizes = map_windows(partial(_label_window, src, labels_path, structure), windows, workers, processes)
+
+    # Karo yerel etiketlerini genel kimliklere kaydır
+    offsets, total = {}, 0
+    for w, s in zip(windows, sizes):
+        offsets[(w[0].start, w[1].start)] = total
+        total += len(s)
+    map_windows(partial(_offset_window, labels_path, offsets), windows, workers, processes=True)
+
+    pixel_count = np.zeros(total + 1, dtype=np.int64)
+    pixel_count[1:] = np.concatenate(sizes) if sizes else []
+
+    # Karo dikişleri boyunca union-find
+    parent = np.arange(total + 1, dtype=np.int64)
+    labels = np.load(labels_path, mmap_mode="r")
+    ny, nx = shape
+    seams = [_seam_pairs(labels[y - 1, :], labels[y, :], eight_connected) for y in range(window, ny, window)]
+    seams += [_seam_pairs(labels[:, x - 1], labels[:, x], eight_connected) for x in range(window, nx, window)]
+    for pairs in seams:
+        for a, b in pairs:
+            ra, rb = _find(parent, int(a)), _find(parent, int(b))
+            if ra != rb:
+                if ra < rb:
+                    ra, rb = rb, ra
+                parent[ra] = rb
+    # Yolları tamamen sıkıştır (vektörize)
+    while True:
+        nxt = parent[parent]
+        if np.array_equal(nxt, parent):
+            break
+        parent = nxt
+
+    counts = np.bincount(parent, weights=pixel_count, minlength=total + 1).astype(np.int64)
+    counts[0] = 0
+    return PatchLabels(labels_path, shape, window, parent, counts, pixel_area_ha)
+
+
+def _filter_window(src, labels_path: str, lut_path: str, out_path: str, window: tuple) -> None:
+    values = read_window(src, window)
+    lut = np.load(lut_path, mmap_mode="r")
+    mask = lut[np.load(labels_path, mmap_mode="r")[window]]
+    mask[np.isnan(values)] = 255
+    out = np.load(out_path, mmap_mode="r+")
+    out[window] = mask
+    out.flush()
+
+
+def filter_small_patches(
+    src: Union[str, np.ndarray, ScaledRaster],
+    min_patch_ha: float,
+    out_dir: str,
+    window: int = 2048,
+    eight_connected: bool = True,
+    pixel_area_ha: float = S2_PIXEL_AREA_HA,
+    workers: Optional[int] = None,
+) -> tuple[str, PatchLabels]:
+    """Alanı `min_patch_ha` altındaki yanık yamalarını düşürür (yerel, bellek dışı).
+
+    Returns:
+        (uint8 yanık maskesi yolu [1 = tutulan yama, 0 = değil, 255 = nodata], PatchLabels)
+    """
+    patches = label_patches(src, os.path.join(out_dir, "patch_labels.npy"), window,
+                            eight_connected, pixel_area_ha, workers)
+    keep = patches.area_ha >= min_patch_ha
+    keep[0] = False
+    # Etiket -> tut/düşür tablosu; işçiler diskten bellek eşlemeli okur
+    lut_path = os.path.join(out_dir, "patch_keep_lut.npy")
+    np.save(lut_path, keep[patches.parent].astype(np.uint8))
+
+    out_path = os.path.join(out_dir, "burned.npy")
+    create_raster(out_path, patches.shape, product="burned", meta={"min_patch_ha": min_patch_ha}).flush()
+    map_windows(partial(_filter_window, src, patches.path, lut_path, out_path),
+                iter_windows(patches.shape, window), workers, processes=isinstance(src, str))
+    return out_path, patches
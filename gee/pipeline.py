@@ -12,23 +12,29 @@ Kullanım (notebook içinde):
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 import os
 
-import ee
-
+from ._lazy import lazy_import
+from .client import get_info
 from .utils import ee_init
-from .aoi import get_aoi
+from .aoi import map_tiles, merge_sums, resolve_aoi, tile_aoi
 from .preprocess import prepare_composite
 from .indices import with_indices
-from .change import compute_diffs
+from .change import SEVERITY_SCHEMES, SeverityScheme, compute_diffs, classify_image
+from .patches import filter_small_patches_ee
+from .fire_zones import detect_fire_zones_ee
 from .visualize import (
     vis_params,
     save_folium,
     export_report_pngs,
     export_truecolor_pngs,
+    compute_severity_areas,
+    write_kv_csv,
 )
 
+ee = lazy_import("ee")
+
 
 def run_pipeline(
     pre_start: str,
@@ -41,9 +47,16 @@ def run_pipeline(
     area_scale: int = 10,
     dnbr_thresholds: Optional[tuple[float, float, float, float]] = None,
     min_patch_ha: Optional[float] = None,
+    compute_severity: bool = False,
     skip_severity: bool = False,
     overlay_boundary: Optional[ee.Geometry] = None,
-) -> Dict[str, str]:
+    fire_zone_top_n: int = 0,
+    fire_zone_scale: int = 100,
+    fire_zone_merge_m: float = 500,
+    aoi_work: str = "bbox",
+    tile_max_forest_ha: Optional[float] = None,
+    tile_workers: int = 4,
+) -> Dict[str, Any]:
     """Analizi çalıştır ve çıktı dosya yollarını döndür.
 
     Args:
@@ -55,14 +68,30 @@ def run_pipeline(
         out_dir: Çıktı klasörü
         project: (opsiyonel) GEE proje ID
         area_scale: Alan hesapları için çözünürlük (metre)
-        dnbr_thresholds: Opsiyonel dNBR eşikleri (t0,t1,t2,t3)
-        min_patch_ha: Opsiyonel minimum yama alanı (hektar). Bu eşik altındaki yanık yamaları kaldırılır.
-        skip_severity: Eğer True ise, bellek yoğun sınıflandırma ve severity harita üretimini atlar (sadece dNBR/dNDVI).
+        dnbr_thresholds: Opsiyonel dNBR eşikleri (t0,t1,t2,t3). USGS şemasının eşiklerinin yerine geçer;
+            sınıf kodları her durumda aynıdır (0: yanmamış ... 4: yüksek şiddet).
+        min_patch_ha: Opsiyonel minimum yama alanı (hektar). İlk dNBR eşiğini aşan ve bu alanın altında kalan
+            yanık yamaları dNDVI/dNBR haritalarında ve PNG'lerde maskelenir, şiddet ürününde yanmamış (0) sayılır.
+        compute_severity: True ise şiddet sınıflandırması yapılır ve sınıf alanları (`area_scale` ile)
+            severity_areas.csv'ye yazılır. Varsayılan kapalıdır: tüm bölgede alan indirgemesi pahalıdır.
+        skip_severity: True ise şiddet ürünü hiç üretilmez (compute_severity ve fire_zone_top_n yok sayılır).
+        fire_zone_top_n: 0'dan büyükse en büyük N yanık kümesi bulunur ve PNG çıktıları bu kutularda yüksek çözünürlükle tekrar üretilir (severity gerekir).
+        fire_zone_scale: Küme tespiti için vektörleştirme ölçeği (metre)
+        fire_zone_merge_m: Bu mesafeden yakın yanık parçaları aynı kümeye dahil edilir (metre)
+        aoi_work: Filtreleme/kırpma/indirgeme için çalışma geometrisi ("bbox", "simplified", "exact").
+            Kesin AOI sınırı her durumda yalnızca son raster maske olarak uygulanır (bkz. `gee.aoi.AOI`).
+        tile_max_forest_ha: Verilirse şiddet alanları AOI'nin orman yüküne göre dörtlü ağaç karolarında
+            (karo başına ~bu kadar orman/çalı) ayrı ayrı hesaplanıp toplanır (bkz. `gee.aoi.tile_aoi`).
+        tile_workers: Karolar için eşzamanlı istek sayısı
     Returns:
-        Üretilen haritalar ve CSV'lerin dosya yolları. Ayrıca "fire_zone_bbox" anahtarı ile ana yangın bölgesinin sınırlarını (list) döndürür.
+        Üretilen haritalar ve CSV'lerin dosya yolları. Küme tespiti açıksa "fire_zones" (kutu + alan listesi)
+        ve "fire_zone_bbox" (en büyük kümenin [xmin, ymin, xmax, ymax] kutusu) anahtarları da döner.
     """
     ee_init(project)
-    aoi = get_aoi(aoi_geojson)
+    region = resolve_aoi(aoi_geojson, work=aoi_work)
+    # Tüm istekler hafif çalışma geometrisini taşır; kesin sınır tek bir maskedir
+    aoi = region.work
+    aoi_mask = region.mask()
 
     # Medyan kompozitleri hazırla
     pre_img = prepare_composite(aoi, pre_start, pre_end)
@@ -70,15 +99,15 @@ def run_pipeline(
 
     # Görüntülerin boş olup olmadığını kontrol et (Bulut filtresi vb. nedeniyle)
     # Not: getInfo() sunucu çağrısı yapar ancak hata ayıklama için kritiktir.
-    if pre_img.bandNames().size().getInfo() == 0:
+    if get_info(pre_img.bandNames().size(), op="band_count") == 0:
         raise ValueError(f"Ön dönem ({pre_start} - {pre_end}) için belirtilen alanda uygun Sentinel-2 görüntüsü bulunamadı (Tüm görüntüler bulutlu olabilir).")
     
-    if post_img.bandNames().size().getInfo() == 0:
+    if get_info(post_img.bandNames().size(), op="band_count") == 0:
         raise ValueError(f"Son dönem ({post_start} - {post_end}) için belirtilen alanda uygun Sentinel-2 görüntüsü bulunamadı.")
 
     # İndeksleri hesapla
-    pre = with_indices(pre_img)
-    post = with_indices(post_img)
+    pre = with_indices(pre_img).updateMask(aoi_mask)
+    post = with_indices(post_img).updateMask(aoi_mask)
 
     diffs = compute_diffs(pre, post)
 
@@ -91,15 +120,33 @@ def run_pipeline(
     vegetation_mask = landcover_mask
     
 
-    severity = None
-    fire_zone_bbox_geom = None
+    scheme = SEVERITY_SCHEMES["dNBR_USGS"]
+    if dnbr_thresholds is not None:
+        # Kullanıcı eşikleri, aynı sınıf kodlarıyla (raster ve alan CSV'sinde aynı anlam)
+        scheme = SeverityScheme("dNBR_custom", tuple(float(t) for t in dnbr_thresholds), scheme.codes)
+
+    # Küçük yama filtresi: min_patch_ha altındaki yanık yamaları (ilk eşiği aşan
+    # bağlı pikseller) haritalardan, PNG'lerden ve şiddet ürünlerinden çıkarılır
+    keep_mask = None
+    speckle = None
+    if min_patch_ha:
+        burned = diffs["dNBR"].gte(scheme.thresholds[0]).updateMask(vegetation_mask)
+        kept = filter_small_patches_ee(burned, min_patch_ha)
+        speckle = burned.And(kept.Not()).unmask(0)
+        keep_mask = speckle.Not()
 
+    severity = None
 
+    if (compute_severity or fire_zone_top_n) and not skip_severity:
+        severity = classify_image(diffs["dNBR"], scheme).updateMask(vegetation_mask)
+        if speckle is not None:
+            # Elenen yamalar yanmamış (0) sayılır
+            severity = severity.where(speckle, 0)
 
     vp = vis_params()
     os.makedirs(out_dir, exist_ok=True)
 
-    outputs: Dict[str, str] = {}
+    outputs: Dict[str, Any] = {}
     pre_label = f"{pre_start}-{pre_end}"
     post_label = f"{post_start}-{post_end}"
 
@@ -112,17 +159,19 @@ def run_pipeline(
     outputs["post_rgb_map"] = os.path.join(out_dir, f"post_RGB_{post_start}_{post_end}.html")
     save_folium(post, aoi, vp["RGB"], f"Sonrasi RGB {post_label}", outputs["post_rgb_map"], boundary=overlay_boundary)
 
+    # Maskeyi harita ve PNG çıktılarına da uygula
+    diffs_masked = {k: v.updateMask(vegetation_mask) for k, v in diffs.items()}
+    if keep_mask is not None:
+        diffs_masked = {k: v.updateMask(keep_mask) for k, v in diffs_masked.items()}
+
     outputs["dndvi_map"] = os.path.join(out_dir, "dNDVI.html")
-    save_folium(diffs["dNDVI"].updateMask(vegetation_mask), aoi, vp["dNDVI"], f"dNDVI {pre_label} vs {post_label}", outputs["dndvi_map"], boundary=overlay_boundary)
+    save_folium(diffs_masked["dNDVI"], aoi, vp["dNDVI"], f"dNDVI {pre_label} vs {post_label}", outputs["dndvi_map"], boundary=overlay_boundary)
 
     outputs["dnbr_map"] = os.path.join(out_dir, "dNBR.html")
-    save_folium(diffs["dNBR"].updateMask(vegetation_mask), aoi, vp["dNBR"], f"dNBR {pre_label} vs {post_label}", outputs["dnbr_map"], boundary=overlay_boundary)
+    save_folium(diffs_masked["dNBR"], aoi, vp["dNBR"], f"dNBR {pre_label} vs {post_label}", outputs["dnbr_map"], boundary=overlay_boundary)
 
     # PNG Çıktıları
 
-    # Maskeyi PNG çıktılarına da uygula
-    diffs_masked = {k: v.updateMask(vegetation_mask) for k, v in diffs.items()}
-
     png_outs = export_report_pngs(pre=pre, post=post, diffs=diffs_masked, severity=severity, aoi=aoi, out_dir=out_dir, boundary=overlay_boundary)
     outputs.update(png_outs)
     
@@ -130,13 +179,36 @@ def run_pipeline(
 
     outputs.update(rgb_outs)
 
-   
-
-    if fire_zone_bbox_geom:
-        try:
-            outputs["fire_zone_bbox"] = fire_zone_bbox_geom.coordinates().getInfo()
-        except Exception:
-            outputs["fire_zone_bbox"] = None
-        outputs["fire_zone_bbox"] = None
+    if severity is not None and compute_severity:
+        if tile_max_forest_ha:
+            tiles = tile_aoi(region, max_forest_ha=tile_max_forest_ha)
+            outputs["area_tiles"] = len(tiles)
+            areas = map_tiles(
+                lambda t: compute_severity_areas(severity, t.to_ee(), scale=area_scale),
+                tiles,
+                workers=tile_workers,
+                merge=merge_sums,
+            )
+        else:
+            areas = compute_severity_areas(severity, aoi, scale=area_scale)
+        if areas:
+            outputs["severity_areas_csv"] = os.path.join(out_dir, "severity_areas.csv")
+            write_kv_csv(outputs["severity_areas_csv"], areas)
+
+    if severity is not None and fire_zone_top_n:
+        # Yüksek çözünürlüklü çıktıları yalnızca ana yangın kümelerinde üret
+        zones = detect_fire_zones_ee(
+            severity.gt(0), aoi, top_n=fire_zone_top_n, scale=fire_zone_scale, merge_distance_m=fire_zone_merge_m
+        )
+        outputs["fire_zones"] = [z.to_dict() for z in zones]
+        outputs["fire_zone_bbox"] = list(zones[0].bbox) if zones else None
+
+        for z in zones:
+            zone_geom = z.to_ee()
+            zone_dir = os.path.join(out_dir, f"fire_zone_{z.rank}")
+            os.makedirs(zone_dir, exist_ok=True)
+            zone_outs = export_report_pngs(pre=pre, post=post, diffs=diffs_masked, severity=severity, aoi=zone_geom, out_dir=zone_dir, boundary=overlay_boundary)
+            zone_outs.update(export_truecolor_pngs(pre=pre, post=post, aoi=zone_geom, out_dir=zone_dir, boundary=overlay_boundary))
+            outputs.update({f"fire_zone_{z.rank}_{k}": v for k, v in zone_outs.items()})
 
     return outputs
@@ -0,0 +1,255 @@
+"""Yanık/şiddet yamalarının akışlı (streaming) vektörleştirilmesi.
+
+Şiddet rasteri karo karo poligonlaştırılır; karo sınırını geçen yamaların
+parçaları, yamanın görüldüğü son karo işlenene kadar bekletilir ve sonra
+birleştirilip yazılır. Yama istatistikleri (alan, ortalama dNBR, baskın
+şiddet sınıfı) aynı geçişte biriktirilir. Özellikler GeoJSON'a satır satır
+ya da (fiona ile) GeoPackage'a tek tek yazılır; tüm geometriler hiçbir zaman
+bellekte tutulmaz.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import json
+import os
+
+import numpy as np
+
+from ._lazy import lazy_import
+from .patches import PatchLabels, label_patches
+from .raster import ScaledRaster, iter_windows, raster_meta, read_window
+from .utils import ensure_dir
+
+rio_features = lazy_import("rasterio.features")
+rio_transform = lazy_import("rasterio.transform")
+shapely = lazy_import("shapely")
+
+RasterSource = Union[str, np.ndarray, ScaledRaster]
+
+# Şiddet sınıf kodları (classify_* çıktıları 0..4)
+N_SEVERITY_CLASSES = 5
+
+GPKG_SCHEMA = {
+    "geometry": "MultiPolygon",
+    "properties": {
+        "patch_id": "int",
+        "pixel_count": "int",
+        "area_ha": "float",
+        "mean_dNBR": "float",
+        "severity": "int",
+    },
+}
+
+# Şema türetirken Python değer tipi -> fiona alan tipi (bool, int'ten önce)
+_FIELD_TYPES = ((bool, "bool"), (int, "int"), (float, "float"), (str, "str"))
+
+
+class _GeoJSONWriter:
+    """FeatureCollection'ı özellik özellik diske yazar."""
+
+    def __init__(self, path: str, crs: Optional[str] = None):
+        self._f = open(path, "w", encoding="utf-8")
+        head = {"type": "FeatureCollection"}
+        if crs:
+            head["crs"] = {"type": "name", "properties": {"name": crs}}
+        self._f.write(json.dumps(head)[:-1] + ', "features": [\n')
+        self._first = True
+
+    def write(self, feature: dict) -> None:
+        if not self._first:
+            self._f.write(",\n")
+        self._f.write(json.dumps(feature))
+        self._first = False
+
+    def close(self) -> None:
+        self._f.write("\n]}\n")
+        self._f.close()
+
+
+class _GpkgWriter:
+    def __init__(
+        self,
+        path: str,
+        crs: Optional[str] = None,
+        layer: str = "burn_patches",
+        schema: Optional[dict] = None,
+    ):
+        try:
+            import fiona
+        except ImportError as e:  # pragma: no cover - environment dependent
+            raise RuntimeError("GeoPackage çıktısı için 'fiona' gerekli (pip install fiona).") from e
+        self._dst = fiona.open(path, "w", driver="GPKG", schema=schema or GPKG_SCHEMA, crs=crs, layer=layer)
+
+    def write(self, feature: dict) -> None:
+        geom = feature["geometry"]
+        if geom["type"] == "Polygon":
+            geom = {"type": "MultiPolygon", "coordinates": [geom["coordinates"]]}
+        self._dst.write({"geometry": geom, "properties": feature["properties"]})
+
+    def close(self) -> None:
+        self._dst.close()
+
+
+def feature_schema(feature: dict, types: Optional[Dict[str, str]] = None, geometry: str = "MultiPolygon") -> dict:
+    """Bir özelliğin alanlarından fiona (GPKG) şeması türetir.
+
+    Alan tipi önce `types`'tan, yoksa değerin Python tipinden alınır (None ve
+    tanınmayan değerler "str"). Şemada yalnızca özellikte bulunan alanlar yer alır.
+    """
+    props = {}
+    for key, value in (feature.get("properties") or {}).items():
+        if types and key in types:
+            props[key] = types[key]
+        else:
+            props[key] = next((t for py, t in _FIELD_TYPES if isinstance(value, py)), "str")
+    return {"geometry": geometry, "properties": props}
+
+
+def open_writer(
+    path: str,
+    crs: Optional[str] = None,
+    driver: Optional[str] = None,
+    schema: Optional[dict] = None,
+):
+    """Özellikleri tek tek yazan GeoJSON/GPKG yazıcısı (`write(feature)`, `close()`).
+
+    `schema` yalnızca GPKG için kullanılır; verilmezse `GPKG_SCHEMA` (yama
+    özellikleri) geçerlidir.
+    """
+    driver = driver or ("GPKG" if path.lower().endswith(".gpkg") else "GeoJSON")
+    ensure_dir(os.path.dirname(path))
+    if driver == "GPKG":
+        if os.path.exists(path):
+            os.remove(path)
+        return _GpkgWriter(path, crs, schema=schema)
+    if driver == "GeoJSON":
+        return _GeoJSONWriter(path, crs)
+    raise ValueError(f"Desteklenmeyen sürücü: {driver} (GeoJSON veya GPKG)")
+
+
+def _resolve_georef(src: RasterSource, transform, crs):
+    if isinstance(src, str) and (transform is None or crs is None):
+        meta = raster_meta(src)
+        if transform is None and meta.get("transform"):
+            transform = meta["transform"]
+        crs = crs or meta.get("crs")
+    if transform is None:
+        return rio_transform.Affine.identity(), crs
+    if not isinstance(transform, rio_transform.Affine):
+        transform = rio_transform.Affine.from_gdal(*transform)
+    return transform, crs
+
+
+def _last_tile(patches: PatchLabels, windows: Sequence[tuple]) -> np.ndarray:
+    """Her yamanın görüldüğü son karo indeksi (-1: hiç)."""
+    last = np.full(len(patches.parent), -1, dtype=np.int64)
+    for i, w in enumerate(windows):
+        ids = np.unique(patches.read(w))
+        last[ids] = i
+    return last
+
+
+def iter_patch_features(
+    severity: RasterSource,
+    patches: PatchLabels,
+    dnbr: Optional[RasterSource] = None,
+    transform=None,
+    crs: Optional[str] = None,
+    min_patch_ha: Optional[float] = None,
+) -> Iterator[dict]:
+    """Yamaları, son karoları işlendiği anda GeoJSON Feature sözlüğü olarak üretir."""
+    transform, _ = _resolve_georef(severity, transform, crs)
+    windows = list(iter_windows(patches.shape, patches.window))
+    last = _last_tile(patches, windows)
+
+    n = len(patches.parent)
+    keep = patches.pixel_count > 0
+    if min_patch_ha:
+        keep &= patches.area_ha >= min_patch_ha
+    keep[0] = False
+
+    dnbr_sum = np.zeros(n, dtype=np.float64)
+    dnbr_cnt = np.zeros(n, dtype=np.int64)
+    cls_hist = np.zeros((n, N_SEVERITY_CLASSES), dtype=np.int64)
+    pending: Dict[int, List] = {}
+
+    for i, w in enumerate(windows):
+        ids = patches.read(w)
+        ids = np.where(keep[ids], ids, 0).astype(np.int32)
+        if not ids.any():
+            continue
+
+        # İstatistikler (aynı geçişte)
+        sev = read_window(severity, w)
+        valid = (ids > 0) & np.isfinite(sev) & (sev >= 0) & (sev < N_SEVERITY_CLASSES)
+        np.add.at(cls_hist, (ids[valid], sev[valid].astype(np.int64)), 1)
+        if dnbr is not None:
+            d = read_window(dnbr, w)
+            ok = (ids > 0) & np.isfinite(d)
+            dnbr_sum += np.bincount(ids[ok], weights=d[ok], minlength=n)
+            dnbr_cnt += np.bincount(ids[ok], minlength=n)
+
+        # Poligonlaştırma (karo koordinatları -> harita koordinatları)
+        tile_tf = transform * rio_transform.Affine.translation(w[1].start, w[0].start)
+        for geom, value in rio_features.shapes(ids, mask=ids > 0, connectivity=8, transform=tile_tf):
+            pending.setdefault(int(value), []).append(shapely.geometry.shape(geom))
+
+        done = [pid for pid in pending if last[pid] == i]
+        for pid in done:
+            parts = pending.pop(pid)
+            geom = parts[0] if len(parts) == 1 else shapely.union_all(parts)
+            mean_dnbr = float(dnbr_sum[pid] / dnbr_cnt[pid]) if dnbr_cnt[pid] else None
+            yield {
+                "type": "Feature",
+                "geometry": shapely.geometry.mapping(geom),
+                "properties": {
+                    "patch_id": int(pid),
+                    "pixel_count": int(patches.pixel_count[pid]),
+                    "area_ha": round(float(patches.area_ha[pid]), 4),
+                    "mean_dNBR": None if mean_dnbr is None else round(mean_dnbr, 4),
+                    "severity": int(cls_hist[pid].argmax()),
+                },
+            }
+
+
+def polygonize_patches(
+    severity: RasterSource,
+    out_path: str,
+    dnbr: Optional[RasterSource] = None,
+    patches: Optional[PatchLabels] = None,
+    window: int = 2048,
+    min_patch_ha: Optional[float] = None,
+    transform=None,
+    crs: Optional[str] = None,
+    driver: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> int:
+    """Şiddet rasterindeki yanık yamalarını vektör olarak `out_path`'e yazar.
+
+    Args:
+        severity: Şiddet sınıf rasteri (0 = yanmamış). Yol verilirse meta
+            dosyasındaki `transform`/`crs` kullanılır.
+        out_path: `.geojson` veya `.gpkg` çıktı yolu
+        dnbr: Opsiyonel dNBR rasteri (yama ortalaması için)
+        patches: `label_patches` / `filter_small_patches` sonucu; yoksa
+            `severity > 0` etiketlenir.
+        min_patch_ha: Bu alanın altındaki yamalar yazılmaz.
+
+    Returns:
+        Yazılan özellik sayısı
+    """
+    if patches is None:
+        base = os.path.splitext(out_path)[0]
+        patches = label_patches(severity, base + "_labels.npy", window=window, workers=workers)
+    transform, crs = _resolve_georef(severity, transform, crs)
+
+    writer = open_writer(out_path, crs, driver)
+    count = 0
+    try:
+        for feat in iter_patch_features(severity, patches, dnbr, transform, crs, min_patch_ha):
+            writer.write(feat)
+            count += 1
+    finally:
+        writer.close()
+    return count
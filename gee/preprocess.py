@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-import ee
+from typing import Dict, Iterable, Sequence, Tuple
+
+
+from ._lazy import lazy_import
+from .indices import with_indices
+
+ee = lazy_import("ee")
 
 
 def _mask_s2_sr(image: ee.Image) -> ee.Image:
@@ -50,3 +56,21 @@ def prepare_composite(aoi: ee.Geometry, start: str, end: str) -> ee.Image:
         "date_range": f"{start}_{end}"
     })
     return img
+
+
+def prepare_annual_composites(
+    aoi: ee.Geometry,
+    years: Iterable[int],
+    season: Tuple[str, str] = ("06-01", "09-30"),
+    indices: Sequence[str] = ("NDVI", "NBR"),
+) -> Dict[int, ee.Image]:
+    """Her yıl için mevsimlik kompoziti ve indekslerini bir kez hazırlar.
+
+    Dönen sözlük (yıl -> indeks bantları) `compute_annual_diffs` ile
+    paylaşılır; N yıl için N kompozit oluşturulur.
+    """
+    out: Dict[int, ee.Image] = {}
+    for year in years:
+        img = prepare_composite(aoi, f"{year}-{season[0]}", f"{year}-{season[1]}")
+        out[int(year)] = with_indices(img, indices).select(list(indices)).set("year", int(year))
+    return out
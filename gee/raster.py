@@ -0,0 +1,289 @@
+"""Yerel rasterlar için kompakt, ölçeklenmiş tamsayı gösterimi.
+
+İndeks ve fark ürünleri float32/float64 yerine `int16 * ölçek` olarak,
+şiddet sınıfları `uint8` olarak saklanır. Boş pikseller (NaN) bir nodata
+sentinel değerine yazılır, okurken tekrar NaN'a çevrilir.
+
+- Encoding: dtype / ölçek / nodata tanımı, `encode` / `decode` / `ee_encode`
+- ENCODINGS: ürün adı -> Encoding (NDVI, NBR, dNBR, RBR, severity ...)
+- ScaledRaster: kodlanmış dizi + Encoding; hesaplamada şeffaf float32'ye açılır
+- save_raster / load_raster: disk önbelleği ve dışa aktarım biçimi
+  (`.npy` + `.json` meta; `mmap=True` ile bellek eşlemeli okuma)
+- iter_windows / map_windows: bellek dışı (out-of-core) pencere pencere işlem
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+import json
+import os
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+from .utils import ensure_dir
+
+
+@dataclass(frozen=True)
+class Encoding:
+    """Fiziksel değer = kodlanmış değer * scale + offset."""
+
+    dtype: str
+    scale: float = 1.0
+    offset: float = 0.0
+    nodata: int = -32768
+
+    @property
+    def valid_range(self) -> tuple[int, int]:
+        """nodata hariç saklanabilen tamsayı aralığı."""
+        info = np.iinfo(self.dtype)
+        lo, hi = int(info.min), int(info.max)
+        if self.nodata == lo:
+            lo += 1
+        elif self.nodata == hi:
+            hi -= 1
+        return lo, hi
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        """Float değerleri kodlar; NaN -> nodata, aralık dışı -> kırpılır."""
+        values = np.asarray(values)
+        lo, hi = self.valid_range
+        with np.errstate(invalid="ignore"):
+            q = np.rint((values - self.offset) / self.scale)
+            np.clip(q, lo, hi, out=q)
+        q[~np.isfinite(values)] = self.nodata
+        return q.astype(self.dtype)
+
+    def decode(self, codes: np.ndarray, dtype: str = "float32") -> np.ndarray:
+        """Kodlanmış değerleri float'a açar; nodata -> NaN."""
+        codes = np.asarray(codes)
+        out = codes.astype(dtype)
+        if self.scale != 1.0:
+            out *= np.asarray(self.scale, dtype=dtype)
+        if self.offset:
+            out += np.asarray(self.offset, dtype=dtype)
+        out[codes == self.nodata] = np.nan
+        return out
+
+    def ee_encode(self, image):
+        """Aynı kodlamayı `ee.Image` üzerinde uygular (dışa aktarım için)."""
+        lo, hi = self.valid_range
+        img = image.subtract(self.offset).divide(self.scale).round().clamp(lo, hi).unmask(self.nodata)
+        return getattr(img, _EE_CAST[self.dtype])()
+
+
+_EE_CAST = {"int8": "toInt8", "uint8": "toUint8", "int16": "toInt16", "uint16": "toUint16", "int32": "toInt32"}
+
+# [-1, 1] aralığındaki normalize fark indeksleri: 1e-4 çözünürlük
+INDEX_ENCODING = Encoding("int16", scale=1e-4, nodata=-32768)
+# Fark ürünleri [-2, 2] aralığında olabilir; 1e-4 ile int16'ya sığar
+DIFF_ENCODING = Encoding("int16", scale=1e-4, nodata=-32768)
+# RdNBR paydası küçük olduğunda büyük değerler alabilir
+RDNBR_ENCODING = Encoding("int16", scale=1e-3, nodata=-32768)
+# Şiddet sınıf kodları (0..4) ve 0/1 maskeler
+SEVERITY_ENCODING = Encoding("uint8", scale=1.0, nodata=255)
+MASK_ENCODING = Encoding("uint8", scale=1.0, nodata=255)
+# Trend ürünleri (gee.trend): S tamsayı, Z 1e-3, p 2e-5, eğim 1e-7 birim/zaman
+MK_S_ENCODING = Encoding("int32", scale=1.0, nodata=-2147483648)
+MK_Z_ENCODING = Encoding("int16", scale=1e-3, nodata=-32768)
+MK_P_ENCODING = Encoding("uint16", scale=2e-5, nodata=65535)
+SLOPE_ENCODING = Encoding("int32", scale=1e-7, nodata=-2147483648)
+TREND_ENCODING = Encoding("int8", scale=1.0, nodata=-128)
+# Bozulma yılı (gee.disturbance)
+YEAR_ENCODING = Encoding("int16", scale=1.0, nodata=-32768)
+
+ENCODINGS: Dict[str, Encoding] = {
+    "NDVI": INDEX_ENCODING,
+    "NBR": INDEX_ENCODING,
+    "NBR2": INDEX_ENCODING,
+    "NDMI": INDEX_ENCODING,
+    "NDWI": INDEX_ENCODING,
+    "MNDWI": INDEX_ENCODING,
+    "MSAVI": INDEX_ENCODING,
+    "dNDVI": DIFF_ENCODING,
+    "dNBR": DIFF_ENCODING,
+    "RBR": DIFF_ENCODING,
+    "RdNBR": RDNBR_ENCODING,
+    "cum_dNBR": DIFF_ENCODING,
+    "cum_dNDVI": DIFF_ENCODING,
+    "severity": SEVERITY_ENCODING,
+    "burned": MASK_ENCODING,
+    "mk_S": MK_S_ENCODING,
+    "mk_Z": MK_Z_ENCODING,
+    "mk_p": MK_P_ENCODING,
+    "sen_slope": SLOPE_ENCODING,
+    "trend": TREND_ENCODING,
+    "dist_year": YEAR_ENCODING,
+    "dist_magnitude": DIFF_ENCODING,
+    "post_slope": DIFF_ENCODING,
+}
+
+
+def encoding_for(product: str) -> Encoding:
+    try:
+        return ENCODINGS[product]
+    except KeyError:
+        raise KeyError(f"'{product}' için tanımlı kodlama yok. Tanımlı olanlar: {sorted(ENCODINGS)}") from None
+
+
+class ScaledRaster(NDArrayOperatorsMixin):
+    """Kodlanmış tamsayı dizisi ve kodlaması.
+
+    NumPy işlemlerinde (`np.asarray`, aritmetik ufunc'lar) otomatik olarak
+    float32'ye açılır; depolama ve G/Ç kodlanmış dizi üzerinden yapılır.
+    """
+
+    def __init__(self, codes: np.ndarray, encoding: Encoding):
+        self.codes = codes
+        self.encoding = encoding
+
+    @classmethod
+    def from_float(cls, values: np.ndarray, encoding: Union[Encoding, str]) -> "ScaledRaster":
+        enc = encoding_for(encoding) if isinstance(encoding, str) else encoding
+        return cls(enc.encode(values), enc)
+
+    @property
+    def shape(self) -> tuple:
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes
+
+    def decode(self, dtype: str = "float32") -> np.ndarray:
+        return self.encoding.decode(self.codes, dtype)
+
+    def __getitem__(self, key) -> "ScaledRaster":
+        return ScaledRaster(self.codes[key], self.encoding)
+
+    def __array__(self, dtype=None, copy=None):
+        out = self.decode()
+        return out if dtype is None else out.astype(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(x.decode() if isinstance(x, ScaledRaster) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"ScaledRaster(shape={self.shape}, dtype={self.codes.dtype}, scale={self.encoding.scale})"
+
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+
+def save_raster(
+    path: str,
+    data: Union[np.ndarray, ScaledRaster],
+    product: Optional[str] = None,
+    encoding: Optional[Encoding] = None,
+    meta: Optional[dict] = None,
+) -> str:
+    """Rasteri kodlanmış olarak `.npy` (+ `.json` meta) biçiminde yazar.
+
+    `data` float dizi ise `product` ya da `encoding` ile kodlanır.
+    """
+    if not isinstance(data, ScaledRaster):
+        enc = encoding or encoding_for(product)
+        data = ScaledRaster.from_float(data, enc)
+    if not path.endswith(".npy"):
+        path += ".npy"
+    ensure_dir(os.path.dirname(path))
+    np.save(path, data.codes)
+    with open(_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump({"product": product, "encoding": asdict(data.encoding), **(meta or {})}, f, ensure_ascii=False)
+    return path
+
+
+def raster_meta(path: str) -> dict:
+    """`save_raster` / `create_raster` ile yazılan meta bilgisini okur.
+
+    Coğrafi referans için `transform` (GDAL sırası, 6 sayı) ve `crs` anahtarları
+    kullanılır.
+    """
+    if not path.endswith(".npy"):
+        path += ".npy"
+    with open(_meta_path(path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_raster(path: str, mmap: bool = True) -> ScaledRaster:
+    """`save_raster` ile yazılmış rasteri okur (varsayılan: bellek eşlemeli)."""
+    if not path.endswith(".npy"):
+        path += ".npy"
+    meta = raster_meta(path)
+    codes = np.load(path, mmap_mode="r" if mmap else None)
+    return ScaledRaster(codes, Encoding(**meta["encoding"]))
+
+
+def create_raster(
+    path: str,
+    shape: tuple,
+    product: Optional[str] = None,
+    encoding: Optional[Encoding] = None,
+    meta: Optional[dict] = None,
+) -> np.memmap:
+    """Diske nodata ile doldurulmuş, yazılabilir bellek eşlemeli raster açar.
+
+    Pencere pencere yazan akış hesaplamaları için kullanılır; tüm dizi
+    hiçbir zaman bellekte tutulmaz.
+    """
+    enc = encoding or encoding_for(product)
+    if not path.endswith(".npy"):
+        path += ".npy"
+    ensure_dir(os.path.dirname(path))
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=enc.dtype, shape=shape)
+    out[...] = enc.nodata
+    with open(_meta_path(path), "w", encoding="utf-8") as f:
+        json.dump({"product": product, "encoding": asdict(enc), **(meta or {})}, f, ensure_ascii=False)
+    return out
+
+
+def read_window(src: Union[str, np.ndarray, ScaledRaster], window: tuple) -> np.ndarray:
+    """Kaynağın (yol, ScaledRaster veya dizi) bir penceresini float32 olarak okur."""
+    if isinstance(src, str):
+        src = load_raster(src, mmap=True)
+    block = src[window]
+    if isinstance(block, ScaledRaster):
+        return block.decode()
+    return np.asarray(block, dtype=np.float32)
+
+
+def raster_shape(src: Union[str, np.ndarray, ScaledRaster]) -> tuple:
+    if isinstance(src, str):
+        return load_raster(src, mmap=True).shape
+    return tuple(src.shape)
+
+
+def iter_windows(shape: tuple, window: int = 1024) -> Iterator[tuple]:
+    """Son iki eksen (y, x) üzerinde `window` boyutlu pencereler üretir.
+
+    Öndeki eksenler (örn: zaman) her pencereye tamamen dahil edilir.
+    """
+    lead = (slice(None),) * (len(shape) - 2)
+    ny, nx = shape[-2:]
+    for y0 in range(0, ny, window):
+        for x0 in range(0, nx, window):
+            yield lead + (slice(y0, min(y0 + window, ny)), slice(x0, min(x0 + window, nx)))
+
+
+def map_windows(
+    func: Callable,
+    windows: Iterable[tuple],
+    workers: Optional[int] = None,
+    processes: bool = True,
+) -> list:
+    """`func(window)`'u pencereler üzerinde paralel çalıştırır ve sonuçları sırayla döndürür.
+
+    processes=True: ProcessPoolExecutor (func ve argümanları pickle edilebilir,
+    veriler diskten okunmalı). processes=False: ThreadPoolExecutor (bellekteki
+    dizilerle; NumPy işlemleri GIL'i bırakır). workers=1 ise seri çalışır.
+    """
+    windows = list(windows)
+    if workers == 1 or len(windows) <= 1:
+        return [func(w) for w in windows]
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        return list(pool.map(func, windows))
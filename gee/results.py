@@ -0,0 +1,321 @@
+"""İl / ilçe / meşcere × zaman adımı sonuçları için sütunlu (uzun biçim) depo.
+
+Her ölçüm tek bir satırdır:
+
+    dataset | province | district | year | month | metric | value | text | run
+
+- dataset / province / district / metric / run: kategorik (Arrow sözlük) sütunlar
+- year: Int16 (yıl bağımsız veriler için boş), month: int8 (0 = yıllık)
+- value: sayısal ölçümler (float64); text: metin ölçümler (liste değerleri JSON)
+
+Kalıcılık Parquet ile ve yalnızca ekleme yoluyladır: her `flush()` klasöre
+yeni bir `part-*.parquet` dosyası yazar, eski dosyalara dokunmaz. Aynı
+anahtar (dataset, province, district, year, month, metric) birden çok kez
+yazılmışsa en son yazılan değer geçerlidir; satır ise anahtarın ilk
+yazıldığı konumda kalır (güncelleme geniş tablonun satır ve sütun sırasını
+değiştirmez). `compact()` parçaları tek dosyada birleştirir. Okuma, süzme ve toplama işlemleri pandas ile vektöreldir.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import glob
+import json
+import numbers
+import os
+import time
+
+from ._lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+COLUMNS = ("dataset", "province", "district", "year", "month", "metric", "value", "text", "run")
+KEY = ("dataset", "province", "district", "year", "month", "metric")
+_CATEGORICAL = ("dataset", "province", "district", "metric", "run")
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:  # pragma: no cover - environment dependent
+        raise RuntimeError("Parquet kalıcılığı için 'pyarrow' gerekli (pip install pyarrow).") from e
+
+
+def _categorical(values: "pd.Series") -> "pd.Categorical":
+    # Kategoriler ilk görülme sırasında: geniş tabloda sütun sırası eklenme sırasını izler
+    codes, uniques = pd.factorize(values, sort=False)
+    categories = [str(u) for u in uniques]
+    if (codes < 0).any():
+        if "" not in categories:
+            categories.append("")
+        codes = codes.copy()
+        codes[codes < 0] = categories.index("")
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def typed_frame(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Uzun biçimli tabloyu depo şemasına (sütun sırası + tipler) çevirir."""
+    df = df.reindex(columns=list(COLUMNS))
+    out = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for col in COLUMNS:
+        values = df[col].reset_index(drop=True)
+        if col in _CATEGORICAL:
+            out[col] = _categorical(values)
+        elif col == "year":
+            out[col] = pd.to_numeric(values, errors="coerce").astype("Int16")
+        elif col == "month":
+            out[col] = pd.to_numeric(values, errors="coerce").fillna(0).astype("int8")
+        elif col == "value":
+            out[col] = pd.to_numeric(values, errors="coerce").astype("float64")
+        else:
+            out[col] = values.astype("string")
+    return out
+
+
+def _split_value(v: Any) -> tuple:
+    """Ölçüm değerini (value, text) çiftine ayırır."""
+    if v is None:
+        return float("nan"), None
+    if isinstance(v, numbers.Number):
+        return float(v), None
+    if isinstance(v, str):
+        return float("nan"), v
+    if isinstance(v, (list, tuple)):
+        return float("nan"), json.dumps(list(v), ensure_ascii=False)
+    return float("nan"), str(v)
+
+
+def _cell(value: float, text: Any) -> Any:
+    """Satırdan Python değeri (sayı, metin veya liste)."""
+    if not isinstance(text, str):
+        return None if value != value else value
+    if text.startswith("["):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+class ResultStore:
+    """Parquet destekli, yalnızca eklemeli sonuç deposu.
+
+    root: Parça dosyalarının klasörü (None: yalnızca bellekte)
+    run: Bu oturumda yazılan satırların çalıştırma etiketi (varsayılan: zaman damgası)
+    """
+
+    def __init__(self, root: Optional[str] = None, run: Optional[str] = None):
+        self.root = root
+        self.run = run or datetime.now().strftime("%Y%m%dT%H%M%S")
+        self._parts: List["pd.DataFrame"] = []
+        self._unsaved: List["pd.DataFrame"] = []
+        self._pending: Dict[str, list] = {c: [] for c in COLUMNS}
+        self._cache: Dict[bool, "pd.DataFrame"] = {}
+        if root and os.path.isdir(root):
+            self.load()
+
+    # ---- Yazma ----
+
+    def append(
+        self,
+        dataset: str,
+        province: str,
+        values: Dict[str, Any],
+        year: Optional[int] = None,
+        month: int = 0,
+        district: str = "",
+    ) -> None:
+        """Bir (il, ilçe, yıl, ay) için ölçümleri ekler."""
+        pending = self._pending
+        for metric, v in values.items():
+            value, text = _split_value(v)
+            pending["dataset"].append(dataset)
+            pending["province"].append(province)
+            pending["district"].append(district)
+            pending["year"].append(year)
+            pending["month"].append(month)
+            pending["metric"].append(metric)
+            pending["value"].append(value)
+            pending["text"].append(text)
+            pending["run"].append(self.run)
+        self._cache = {}
+
+    def append_frame(self, df: "pd.DataFrame") -> None:
+        """Uzun biçimli tabloyu toplu ekler (en az KEY sütunları + value)."""
+        missing = [c for c in KEY if c not in df.columns and c not in ("district", "year", "month")]
+        if missing or "value" not in df.columns and "text" not in df.columns:
+            raise ValueError(f"append_frame: eksik sütunlar {missing or ['value']}")
+        df = df.copy()
+        if "district" not in df.columns:
+            df["district"] = ""
+        if "run" not in df.columns:
+            df["run"] = self.run
+        # Önceki `append` satırları bu tablodan önce yazılmış sayılmalı (son yazılan geçerli)
+        self._merge_pending()
+        part = typed_frame(df)
+        self._parts.append(part)
+        self._unsaved.append(part)
+        self._cache = {}
+
+    def _pending_frame(self) -> Optional["pd.DataFrame"]:
+        if not self._pending["metric"]:
+            return None
+        return typed_frame(pd.DataFrame(self._pending))
+
+    def _merge_pending(self) -> Optional["pd.DataFrame"]:
+        part = self._pending_frame()
+        if part is not None:
+            self._parts.append(part)
+            self._unsaved.append(part)
+            self._pending = {c: [] for c in COLUMNS}
+        return part
+
+    def drop(self, dataset: str) -> None:
+        """Bir veri kümesini bellekten siler (kalıcı parçalara dokunmaz; bkz. `compact`)."""
+        self._merge_pending()
+        self._parts = [p[p["dataset"] != dataset] for p in self._parts]
+        self._unsaved = [p[p["dataset"] != dataset] for p in self._unsaved]
+        self._cache = {}
+
+    # ---- Okuma ----
+
+    def frame(self, dataset: Optional[str] = None, latest: bool = True) -> "pd.DataFrame":
+        """Tüm satırlar (varsayılan: her anahtar için en son yazılan)."""
+        if latest not in self._cache:
+            self._merge_pending()
+            if self._parts:
+                df = typed_frame(pd.concat(self._parts, ignore_index=True))
+            else:
+                df = typed_frame(pd.DataFrame(columns=list(COLUMNS)))
+            if latest and len(df):
+                df = _latest(df)
+            self._cache[latest] = df
+        df = self._cache[latest]
+        if dataset is not None:
+            df = df[df["dataset"] == dataset]
+        return df.reset_index(drop=True)
+
+    def datasets(self) -> List[str]:
+        return [str(d) for d in pd.unique(self.frame()["dataset"])]
+
+    def wide(self, dataset: str, index: Sequence[str] = ("province", "year")) -> "pd.DataFrame":
+        """Ölçümleri sütun yapan geniş tablo (sütunlar eklenme sırasında).
+
+        Sayısal ölçümler float64, metin ölçümler string sütun olur; listeler
+        ", " ile birleştirilir.
+        """
+        df = self.frame(dataset)
+        index = [c for c in index if df[c].notna().any()] if len(df) else list(index)
+        metrics = [str(m) for m in pd.unique(df["metric"])]
+        if not len(df):
+            return pd.DataFrame(columns=list(index) + metrics)
+        is_text = df["text"].notna()
+        keys = list(index) + ["metric"]
+        cols = []
+        if (~is_text).any():
+            num = df[~is_text].groupby(keys, observed=True, dropna=False, sort=False)["value"].last()
+            cols.append(num.unstack("metric"))
+        if is_text.any():
+            txt = df[is_text].assign(text=df.loc[is_text, "text"].map(_join_list))
+            cols.append(txt.groupby(keys, observed=True, dropna=False, sort=False)["text"].last().unstack("metric"))
+        out = pd.concat(cols, axis=1) if len(cols) > 1 else cols[0]
+        out.columns = [str(c) for c in out.columns]
+        out = out[[m for m in metrics if m in out.columns]]
+        return out.reset_index()
+
+    def nested(self, dataset: str) -> Dict[str, Any]:
+        """`{il: {yil: {ölçüm: değer}}}` (yıl içermeyen veri kümelerinde `{il: {ölçüm: değer}}`)."""
+        df = self.frame(dataset)
+        out: Dict[str, Any] = {}
+        has_year = bool(df["year"].notna().any()) if len(df) else False
+        years = df["year"].astype("float64").to_numpy()
+        for province, year, metric, value, text in zip(
+            df["province"].astype(str), years, df["metric"].astype(str), df["value"].tolist(), df["text"].tolist()
+        ):
+            bucket = out.setdefault(province, {})
+            if has_year:
+                bucket = bucket.setdefault(int(year), {})
+            bucket[metric] = _cell(value, text)
+        return out
+
+    def aggregate(
+        self,
+        dataset: str,
+        metrics: Optional[Iterable[str]] = None,
+        by: Sequence[str] = ("province",),
+        how: str = "sum",
+    ) -> "pd.DataFrame":
+        """Sayısal ölçümleri `by` gruplarında toplar (`how`: sum, mean, min, max, std, ...)."""
+        df = self.frame(dataset)
+        df = df[df["text"].isna()]
+        if metrics is not None:
+            df = df[df["metric"].isin(list(metrics))]
+        grouped = df.groupby(list(by) + ["metric"], observed=True)["value"].agg(how)
+        out = grouped.unstack("metric")
+        out.columns = [str(c) for c in out.columns]
+        return out
+
+    # ---- Kalıcılık ----
+
+    def _part_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.root, "part-*.parquet"))) if self.root else []
+
+    def load(self) -> None:
+        """Klasördeki tüm parçaları (yazılma sırasıyla) okur."""
+        paths = self._part_paths()
+        if not paths:
+            return
+        _require_pyarrow()
+        self._parts = [pd.read_parquet(p) for p in paths] + self._parts
+        self._cache = {}
+
+    def flush(self) -> Optional[str]:
+        """Kaydedilmemiş satırları yeni bir parça dosyasına yazar; yazılan yol (yoksa None)."""
+        self._merge_pending()
+        if not self._unsaved or not self.root:
+            return None
+        _require_pyarrow()
+        part = typed_frame(pd.concat(self._unsaved, ignore_index=True))
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"part-{time.time_ns():020d}-{self.run}.parquet")
+        tmp = path + ".tmp"
+        part.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        self._unsaved = []
+        return path
+
+    def compact(self) -> Optional[str]:
+        """Parçaları, her anahtarın en son değeriyle tek dosyada birleştirir."""
+        if not self.root:
+            return None
+        _require_pyarrow()
+        old = self._part_paths()
+        df = self.frame()
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, f"part-{time.time_ns():020d}-compact.parquet")
+        tmp = path + ".tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        for p in old:
+            os.remove(p)
+        self._parts = [df]
+        self._unsaved = []
+        self._cache = {}
+        return path
+
+
+def _latest(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Her anahtarın son yazılan satırı, anahtarın ilk görüldüğü sırada."""
+    groups = df.groupby(list(KEY), observed=True, dropna=False, sort=False)
+    last = (groups.cumcount(ascending=False) == 0).to_numpy()
+    if last.all():
+        return df.reset_index(drop=True)
+    # sort=False: grup numaraları anahtarların ilk görülme sırasıdır
+    first_seen = groups.ngroup().to_numpy()[last]
+    return df[last].iloc[first_seen.argsort(kind="stable")].reset_index(drop=True)
+
+
+def _join_list(text: str) -> str:
+    value = _cell(float("nan"), text)
+    return ", ".join(map(str, value)) if isinstance(value, list) else text
@@ -0,0 +1,220 @@
+"""Sahne bazında bölgesel zaman serisi çıkarımı (sayfalı, paralel, önbellekli).
+
+Koleksiyonun tamamı tek bir `getInfo` ile indirilmez:
+
+1. Sahne kimlikleri ve tarihleri tek hafif istekle listelenir.
+2. Önbellekte olmayan sahneler tarih aralığı sayfalarına bölünür.
+3. Sayfalar sınırlı sayıda eşzamanlı istekle çekilir.
+4. Her sayfanın sonucu, (sahne kimliği, koleksiyon/bölge/ölçek/bant
+   anahtarı) ile JSON satırları olarak önbelleğe eklenir.
+
+Böylece yarıda kalan bir çalışma kaldığı yerden devam eder. Anahtar
+koleksiyonu da kapsar: aynı `system:index` değerlerini paylaşan iki
+koleksiyon (örn. maskeli / maskesiz) birbirinin sonuçlarını kullanmaz.
+Varsayılan koleksiyon kimliği, tarih filtreleri çıkarılmış ifade grafiğidir:
+tarih filtresi yalnızca hangi sahnelerin seçileceğini belirler, sahne
+sonucunu değiştirmez. Böylece 2020–2025 serisini bir ay uzatmak yalnızca o
+ayın sahneleri için istek gönderir.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+
+
+from ._lazy import lazy_import
+from .client import get_info
+from .utils import ensure_dir
+
+ee = lazy_import("ee")
+
+_DAY_MS = 86400000
+
+
+def _expand(node, values: dict):
+    """Serileştirilmiş grafikteki değer referanslarını yerine koyar (tek ağaç)."""
+    if isinstance(node, list):
+        return [_expand(v, values) for v in node]
+    if not isinstance(node, dict):
+        return node
+    if "valueReference" in node:
+        return _expand(values[node["valueReference"]], values)
+    out = {}
+    for k, v in node.items():
+        if k == "functionDefinitionValue":
+            v = dict(v, body=_expand(values[v["body"]], values))
+        out[k] = _expand(v, values)
+    return out
+
+
+def _is_date_filter(node) -> bool:
+    """`filterDate` / `ee.Filter.date` (DateRange ya da system:time_start alanlı) filtre mi?"""
+    text = json.dumps(node)
+    return '"DateRange"' in text or '"system:time_start"' in text
+
+
+def _strip_date_filters(node):
+    if isinstance(node, list):
+        return [_strip_date_filters(v) for v in node]
+    if not isinstance(node, dict):
+        return node
+    call = node.get("functionInvocationValue")
+    if call and call.get("functionName") == "Collection.filter":
+        args = call.get("arguments", {})
+        if _is_date_filter(args.get("filter")):
+            return _strip_date_filters(args["collection"])
+    return {k: _strip_date_filters(v) for k, v in node.items()}
+
+
+def _collection_key(collection: ee.ImageCollection) -> str:
+    """Koleksiyonun tarih filtreleri çıkarılmış ifade grafiğinin (kaynak, diğer filtreler, ön işleme) özeti."""
+    graph = json.loads(collection.serialize())
+    values = graph.get("values", {})
+    tree = _strip_date_filters(_expand(values[graph["result"]], values))
+    return hashlib.sha1(json.dumps(tree, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def region_key(
+    region: ee.Geometry,
+    scale: float,
+    bands: Sequence[str],
+    reducer: str = "mean",
+    collection: str = "",
+) -> str:
+    """Koleksiyon + bölge + ölçek + bant + indirgeyici için kısa, kararlı önbellek anahtarı."""
+    payload = json.dumps([collection, region.serialize(), float(scale), list(bands), reducer], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class SceneCache:
+    """Sahne sonuçlarının JSON satırları (.jsonl) önbelleği.
+
+    Her satır bir sahnenin sonucudur; yeni sonuçlar dosyanın sonuna eklenir.
+    Bu yüzden yarıda kalan bir çalışmada o ana kadar çekilen sayfalar kaybolmaz.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.rows: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        row = json.loads(line)
+                        self.rows[row["scene_id"]] = row
+
+    def __contains__(self, scene_id: str) -> bool:
+        return scene_id in self.rows
+
+    def add(self, rows: Iterable[dict]) -> None:
+        rows = list(rows)
+        for row in rows:
+            self.rows[row["scene_id"]] = row
+        if self.path and rows:
+            ensure_dir(os.path.dirname(self.path))
+            with open(self.path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def list_scenes(collection: ee.ImageCollection) -> List[Tuple[str, int]]:
+    """Koleksiyondaki (sahne kimliği, system:time_start) çiftleri; tek istek."""
+    ids, times = get_info(ee.List([
+        collection.aggregate_array("system:index"),
+        collection.aggregate_array("system:time_start"),
+    ]), op="list_scenes")
+    return sorted(zip(ids, (int(t) for t in times)), key=lambda s: s[1])
+
+
+def page_scenes(scenes: Sequence[Tuple[str, int]], page_days: int) -> List[List[Tuple[str, int]]]:
+    """Sahneleri `page_days` günlük tarih aralıklarına böler (boş sayfalar atlanır)."""
+    pages: Dict[int, List[Tuple[str, int]]] = {}
+    for sid, t in scenes:
+        pages.setdefault(t // (page_days * _DAY_MS), []).append((sid, t))
+    return [pages[k] for k in sorted(pages)]
+
+
+def _fetch_page(
+    collection: ee.ImageCollection,
+    page: Sequence[Tuple[str, int]],
+    region: ee.Geometry,
+    bands: Sequence[str],
+    scale: float,
+) -> List[dict]:
+    ids = [sid for sid, _ in page]
+    start = min(t for _, t in page)
+    end = max(t for _, t in page) + 1
+
+    def _reduce(image):
+        stats = image.select(list(bands)).reduceRegion(
+            reducer=ee.Reducer.mean(),
+            geometry=region,
+            scale=scale,
+            maxPixels=1e9,
+        )
+        return ee.Feature(None, stats).set("scene_id", image.get("system:index"))
+
+    sub = collection.filterDate(start, end).filter(ee.Filter.inList("system:index", ids))
+    times = dict(page)
+    rows = []
+    for feat in get_info(sub.map(_reduce), op="scene_page").get("features", []):
+        props = feat.get("properties", {})
+        sid = props.get("scene_id")
+        row = {"scene_id": sid, "time_start": times.get(sid)}
+        row.update({b: props.get(b) for b in bands})
+        rows.append(row)
+    # Geçerli pikseli olmayan sahneler de önbelleğe girsin (tekrar istenmesin)
+    for sid in set(ids) - {r["scene_id"] for r in rows}:
+        rows.append({"scene_id": sid, "time_start": times[sid], **{b: None for b in bands}})
+    return rows
+
+
+def extract_time_series(
+    collection: ee.ImageCollection,
+    region: ee.Geometry,
+    bands: Sequence[str] = ("NDVI", "NBR", "NDMI"),
+    scale: float = 30,
+    page_days: int = 31,
+    workers: int = 4,
+    cache_dir: Optional[str] = None,
+    collection_key: Optional[str] = None,
+) -> List[dict]:
+    """Her sahne için bölge ortalamalarını döndürür (tarihe göre sıralı).
+
+    Args:
+        collection: İndeks bantlarını içeren görüntü koleksiyonu
+        region: Ortalama alınacak bölge
+        page_days: Bir istekte çekilecek tarih aralığı (gün)
+        workers: Eşzamanlı istek üst sınırı
+        cache_dir: Verilirse sonuçlar `<cache_dir>/<region_key>.jsonl` altında
+            saklanır ve yalnızca eksik sahneler istenir.
+        collection_key: Koleksiyonun (kaynak + maskeleme / ön işleme) sabit
+            kimliği, örn. "s2_sr_cloudmask_v2". Verilmezse koleksiyonun tarih
+            filtreleri çıkarılmış ifade grafiği kullanılır; tarih aralığı
+            değişince önbellek korunur, ön işleme değişince anahtar da değişir.
+
+    Returns:
+        [{"scene_id", "time_start", <bant>: ortalama, ...}, ...]
+    """
+    key = region_key(region, scale, bands, collection=collection_key or _collection_key(collection))
+    cache = SceneCache(os.path.join(cache_dir, f"{key}.jsonl") if cache_dir else None)
+
+    scenes = list_scenes(collection)
+    missing = [s for s in scenes if s[0] not in cache]
+    pages = page_scenes(missing, page_days)
+
+    if pages:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(_fetch_page, collection, p, region, bands, scale) for p in pages]
+            # Önbelleğe yalnızca ana iş parçacığı yazar
+            for fut in as_completed(futures):
+                cache.add(fut.result())
+
+    wanted = {sid for sid, _ in scenes}
+    rows = [row for sid, row in cache.rows.items() if sid in wanted]
+    return sorted(rows, key=lambda r: r["time_start"])
@@ -0,0 +1,547 @@
+"""Piksel bazında Mann-Kendall trend testi ve Sen's slope (yerel, vektörize).
+
+(zaman, y, x) yığınındaki her piksel için S, Var(S), Z, p-değeri ve Sen's
+slope tek seferde hesaplanır: ikili farklar zaman ekseni boyunca kaydırılmış
+dizi işlemleriyle bulunur, Python döngüsü yalnızca zaman adımları
+üzerindedir. Büyük rasterlar `trend_local` ile pencere pencere ve süreç
+havuzunda işlenir.
+
+Varyans yöntemleri (`method`):
+- "original": bağsız varyans n(n-1)(2n+5)/18
+- "tie": bağ (eşit değer) düzeltmeli varyans
+- "hamed_rao": bağ düzeltmesi + Hamed & Rao (1998) otokorelasyon düzeltmesi
+  (trendden arındırılmış serinin sıralarının anlamlı otokorelasyonları)
+- "yue_wang": bağ düzeltmesi + Yue & Wang (2004) etkin örneklem düzeltmesi
+
+Otokorelasyon çarpanı n/n* kısa ve negatif otokorelasyonlu serilerde sıfır
+veya negatif çıkabilir (negatif Var(S), sessiz NaN Z/p). Bu serilerde
+düzeltme uygulanmaz: çarpan 1 alınır, yani bağ düzeltmeli varyans kullanılır
+(çıktıdaki `n_ns` de 1 olur).
+
+p-değerleri SciPy'a bağlı olmayan normal dağılım fonksiyonuyla hesaplanır.
+
+- mann_kendall_stack: bellek içi (T, ...) dizi -> ürün sözlüğü
+- mann_kendall_batch: (seri, T) tablo (ilçe, meşcere, piksel ...) -> ürün sözlüğü
+- sens_slope: tek uzun seri için O(n log n) beklenen süreli, O(n) bellekli
+  Sen's slope (düzensiz zaman damgaları desteklenir)
+- sens_slope_batch: çok sayıda kısa seri için vektörize Sen's slope
+- trend_local: disk/bellek eşlemeli yığın -> kodlanmış trend rasterları
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from statistics import NormalDist
+from typing import Dict, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
+
+from .raster import (
+    ScaledRaster,
+    create_raster,
+    encoding_for,
+    iter_windows,
+    map_windows,
+    raster_shape,
+    read_window,
+)
+
+RasterSource = Union[str, np.ndarray, ScaledRaster]
+
+# trend_local çıktıları (ürün adları gee.raster.ENCODINGS'te tanımlı)
+TREND_PRODUCTS = ("mk_S", "mk_Z", "mk_p", "sen_slope", "trend")
+
+MK_METHODS = ("original", "tie", "hamed_rao", "yue_wang")
+
+_DAYS_PER_YEAR = 365.25
+
+# sens_slope: bu sayıya kadar gözlemde tüm ikili eğimler doğrudan hesaplanır
+SEN_DIRECT_MAX = 128
+# sens_slope_batch: bir parçada tutulacak en fazla ikili eğim sayısı (~128 MB float32)
+SEN_BATCH_MAX_PAIRS = 1 << 25
+
+# erfc için Chebyshev katsayıları (Numerical Recipes `erfcc`, bağıl hata < 1.2e-7)
+_ERFC_COEF = (
+    -1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+    0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277,
+)
+
+
+def norm_sf(z) -> np.ndarray:
+    """Standart normal üst kuyruk olasılığı P(Z > z), vektörize."""
+    x = np.asarray(z, dtype=np.float64) / np.sqrt(2.0)
+    a = np.abs(x)
+    t = 1.0 / (1.0 + 0.5 * a)
+    poly = np.zeros_like(t)
+    for c in reversed(_ERFC_COEF):
+        poly = c + t * poly
+    erfc = t * np.exp(-a * a + poly)
+    erfc = np.where(x >= 0, erfc, 2.0 - erfc)
+    return 0.5 * erfc
+
+
+def norm_cdf(z) -> np.ndarray:
+    """Standart normal dağılım fonksiyonu P(Z <= z), vektörize."""
+    return norm_sf(-np.asarray(z, dtype=np.float64))
+
+
+def _time_axis(times: Optional[Sequence], n: int) -> np.ndarray:
+    """Zaman eksenini float64'e çevirir; tarih verilirse birim yıldır."""
+    if times is None:
+        return np.arange(n, dtype=np.float64)
+    t = np.asarray(times)
+    if len(t) != n:
+        raise ValueError(f"times uzunluğu ({len(t)}) != zaman ekseni ({n})")
+    if np.issubdtype(t.dtype, np.datetime64):
+        days = (t - t[0]).astype("timedelta64[s]").astype(np.float64) / 86400.0
+        return days / _DAYS_PER_YEAR
+    return t.astype(np.float64)
+
+
+def _nan_median0(a: np.ndarray) -> np.ndarray:
+    """0. eksen boyunca NaN'ları yok sayan medyan.
+
+    `np.sort` NaN'ları sona attığı için her serinin medyanı geçerli eleman
+    sayısından doğrudan indekslenir; `np.nanmedian`'dan birkaç kat hızlıdır.
+    """
+    srt = np.sort(a, axis=0)
+    m = np.isfinite(a).sum(axis=0)
+    lo = np.maximum((m - 1) // 2, 0)[None]
+    hi = np.minimum(m // 2, max(len(a) - 1, 0))[None]
+    med = 0.5 * (np.take_along_axis(srt, lo, 0)[0] + np.take_along_axis(srt, hi, 0)[0])
+    return np.where(m > 0, med, np.nan).astype(a.dtype)
+
+
+def _pairwise_slope_median(x: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """(T, M) dizinin her sütunu için tüm ikili eğimlerin medyanı (NaN'sız).
+
+    Eğimler sütun parçaları halinde hesaplanır; bellek en fazla
+    SEN_BATCH_MAX_PAIRS eğimdir. Aynı zaman damgalı çiftler atlanır.
+    """
+    T, M = x.shape
+    P = T * (T - 1) // 2
+    out = np.full(M, np.nan, dtype=x.dtype)
+    if P == 0:
+        return out
+    ii, jj = np.triu_indices(T, k=1)
+    dt = (t[jj] - t[ii]).astype(x.dtype)[:, None]
+    same = dt[:, 0] == 0
+    step = max(1, SEN_BATCH_MAX_PAIRS // P)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for c0 in range(0, M, step):
+            blk = x[:, c0:c0 + step]
+            slopes = (blk[jj] - blk[ii]) / dt
+            slopes[same] = np.nan
+            out[c0:c0 + step] = _nan_median0(slopes)
+    return out
+
+
+def sens_slope_batch(series: np.ndarray, times: Optional[Sequence] = None) -> np.ndarray:
+    """Satır başına bir seri içeren (N, T) tablo için vektörize Sen's slope.
+
+    Kısa seriler (yıllık, mevsimlik) için uygundur: maliyet O(N T²), bellek
+    parça başına sınırlıdır. NaN gözlemler ve aynı zamanlı çiftler atlanır.
+    """
+    x = np.asarray(series)
+    x = x if x.dtype == np.float32 else x.astype(np.float64)
+    x2 = x.reshape(1, -1) if x.ndim == 1 else x.reshape(-1, x.shape[-1])
+    out = _pairwise_slope_median(np.ascontiguousarray(x2.T), _time_axis(times, x2.shape[1]))
+    return out[0] if x.ndim == 1 else out.reshape(x.shape[:-1])
+
+
+def _inversions(seq: np.ndarray) -> int:
+    """i < j ve seq[i] > seq[j] olan çift sayısı (tamsayı sıralar, O(n log n)).
+
+    Alttan yukarı birleştirme: her düzeyde komşu sıralı blok çiftleri için
+    sayım tek bir `searchsorted` ile yapılır (blok ofsetleri eklenerek tüm
+    bloklar tek sıralı dizide aranır); birleştirme kararlı sıralama ile
+    (iki sıralı koşu, doğrusal) yapılır.
+    """
+    n = len(seq)
+    if n < 2:
+        return 0
+    size = 1 << (n - 1).bit_length()
+    big = int(seq.max()) + 1
+    a = np.full(size, big, dtype=np.int64)
+    a[:n] = seq
+    total = 0
+    w = 1
+    while w < size:
+        blocks = a.reshape(-1, 2, w)
+        m = len(blocks)
+        off = (np.arange(m, dtype=np.int64) * (big + 1))[:, None]
+        left = (blocks[:, 0] + off).ravel()
+        right = blocks[:, 1] + off
+        pos = np.searchsorted(left, right.ravel(), side="right").reshape(m, w)
+        le = pos - (np.arange(m) * w)[:, None]
+        total += int((w - le).sum())
+        a = np.sort(a.reshape(m, 2 * w), axis=1, kind="stable").ravel()
+        w *= 2
+    return total
+
+
+def _theta_ranks(t: np.ndarray, y: np.ndarray, theta: float) -> np.ndarray:
+    """Noktaların y - θt değerine (eşitlikte t'ye) göre sıraları."""
+    order = np.lexsort((t, y - theta * t))
+    ranks = np.empty(len(t), dtype=np.int64)
+    ranks[order] = np.arange(len(t))
+    return ranks
+
+
+def _count_below(t: np.ndarray, y: np.ndarray, theta: float) -> int:
+    """Eğimi θ'dan küçük çift sayısı (girdi (t, y)'ye göre sıralı olmalı).
+
+    t_i < t_j için eğim < θ  <=>  y_j - θt_j < y_i - θt_i, yani t sırasında
+    y - θt dizisinin tersinme sayısı. Aynı zamanlı çiftler sıralı girdide
+    y_i <= y_j ve kararlı sıralama nedeniyle hiçbir θ için tersinme olmaz;
+    böylece `_total_pairs` ile aynı çift kümesi sayılır.
+    """
+    return _inversions(_theta_ranks(t, y, theta))
+
+
+def _slopes_between(t: np.ndarray, y: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """Eğimi [lo, hi) aralığındaki çiftlerin eğimleri, O(n + K).
+
+    θ = lo sırasından θ = hi sırasına geçerken yer değiştiren çiftler tam
+    olarak bu aralıktaki eğimlerdir; araya sokma sıralaması her yer
+    değiştirmeyi bir kez ziyaret eder.
+    """
+    lo_order = np.lexsort((t, y - lo * t))
+    seq = _theta_ranks(t, y, hi)[lo_order].tolist()
+    idx = lo_order.tolist()
+    pairs_i, pairs_j = [], []
+    for p in range(1, len(seq)):
+        v, e = seq[p], idx[p]
+        q = p - 1
+        while q >= 0 and seq[q] > v:
+            pairs_i.append(idx[q])
+            pairs_j.append(e)
+            seq[q + 1], idx[q + 1] = seq[q], idx[q]
+            q -= 1
+        seq[q + 1], idx[q + 1] = v, e
+    i = np.asarray(pairs_i, dtype=np.int64)
+    j = np.asarray(pairs_j, dtype=np.int64)
+    # (t, y) sıralı girdide aynı zamanlı çiftler yer değiştirmez; yine de sıfıra bölme olmasın
+    ok = t[i] != t[j]
+    i, j = i[ok], j[ok]
+    return (y[j] - y[i]) / (t[j] - t[i])
+
+
+def _select_slope(t: np.ndarray, y: np.ndarray, k: int, rng: np.random.Generator) -> float:
+    """k. (0 tabanlı) en küçük ikili eğim; rastgele örneklemeli aralık daraltma.
+
+    Her turda O(n) rastgele çift örneklenir, hedef sıranın çevresinden iki
+    aday sınır seçilir ve `_count_below` (O(n log n)) ile doğrulanır.
+    [lo, hi) aralığında en fazla ~4n eğim kalınca bunlar listelenir.
+    """
+    n = len(t)
+    lo, hi = -np.inf, np.inf
+    c_lo, c_hi = 0, _total_pairs(t)
+    limit = 4 * n
+    # Bağlı verilerde (aynı eğimin çok tekrarı) kullanılan göreli tolerans
+    span = (y.max() - y.min()) / max(t.max() - t.min(), np.finfo(float).tiny)
+    if span == 0:
+        return 0.0
+    for _ in range(64):
+        if c_hi - c_lo <= limit:
+            break
+        i = rng.integers(0, n, size=4 * n)
+        j = rng.integers(0, n, size=4 * n)
+        ok = t[i] != t[j]
+        cand = (y[j[ok]] - y[i[ok]]) / (t[j[ok]] - t[i[ok]])
+        cand = np.sort(cand[(cand >= lo) & (cand < hi)])
+        q = len(cand)
+        if q == 0:
+            continue
+        frac = (k - c_lo) / (c_hi - c_lo)
+        delta = 1.5 * np.sqrt(q) + 1
+        a = int(np.floor(frac * q - delta))
+        b = int(np.ceil(frac * q + delta))
+        if a >= 0:
+            c = _count_below(t, y, cand[a])
+            if c <= k:
+                lo, c_lo = float(cand[a]), c
+        if b < q:
+            c = _count_below(t, y, cand[b])
+            if c > k:
+                hi, c_hi = float(cand[b]), c
+        if lo == cand[min(max(a, 0), q - 1)] == cand[min(b, q - 1)]:
+            # Aday aralık tek bir değere çöktü (bağlı veriler): hedef = lo mu?
+            if _count_below(t, y, lo + 1e-9 * (abs(lo) + span)) > k:
+                return lo
+    between = np.sort(_slopes_between(t, y, lo, hi))
+    if not len(between):
+        return lo
+    return float(between[min(max(k - c_lo, 0), len(between) - 1)])
+
+
+def _total_pairs(t: np.ndarray) -> int:
+    """Zaman damgası farklı çift sayısı."""
+    n = len(t)
+    _, counts = np.unique(t, return_counts=True)
+    return n * (n - 1) // 2 - int((counts * (counts - 1) // 2).sum())
+
+
+def sens_slope(
+    values: Sequence[float],
+    times: Optional[Sequence] = None,
+    seed: Optional[int] = 0,
+) -> float:
+    """Tek seri için Sen's slope (ikili eğimlerin medyanı).
+
+    `times` düzensiz olabilir (tarih verilirse eğim 1/yıl); NaN gözlemler ve
+    aynı zamanlı çiftler atlanır. SEN_DIRECT_MAX gözleme kadar eğimler
+    doğrudan hesaplanır; daha uzun serilerde medyan, tersinme sayımıyla
+    rastgele seçilir: beklenen süre O(n log n), bellek O(n).
+    """
+    y = np.asarray(values, dtype=np.float64)
+    t = _time_axis(times, len(y))
+    ok = np.isfinite(y) & np.isfinite(t)
+    y, t = y[ok], t[ok]
+    if len(y) <= SEN_DIRECT_MAX:
+        return float(_pairwise_slope_median(y[:, None], t)[0])
+
+    N = _total_pairs(t)
+    if N == 0:
+        return float("nan")
+    # Seçim yolu (t, y) sıralı girdi varsayar (bkz. _count_below)
+    order = np.lexsort((y, t))
+    t, y = t[order], y[order]
+    rng = np.random.default_rng(seed)
+    k_lo, k_hi = (N - 1) // 2, N // 2
+    a = _select_slope(t, y, k_lo, rng)
+    b = a if k_hi == k_lo else _select_slope(t, y, k_hi, rng)
+    return 0.5 * (a + b)
+
+
+def _sorted_runs(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """0. eksende sıralama indeksi, sıralı dizi ve ardışık eşitlik maskesi (T-1, ...)."""
+    order = np.argsort(x, axis=0, kind="stable")
+    srt = np.take_along_axis(x, order, 0)
+    return order, srt, srt[1:] == srt[:-1]
+
+
+def _tie_term(eq: np.ndarray) -> np.ndarray:
+    """Her seri için bağ grupları üzerinden toplam t(t-1)(2t+5)."""
+
+    def f(t):
+        return t * (t - 1.0) * (2.0 * t + 5.0)
+
+    run = np.ones(eq.shape[1:])
+    acc = np.zeros(eq.shape[1:])
+    for k in range(len(eq)):
+        run = np.where(eq[k], run + 1.0, 1.0)
+        acc += f(run) - f(run - 1.0)
+    return acc
+
+
+def _average_ranks(x: np.ndarray) -> np.ndarray:
+    """0. eksen boyunca ortalama sıralar (bağlar ortalanır, NaN -> NaN)."""
+    order, _, eq = _sorted_runs(x)
+    T = len(x)
+    start = np.empty(x.shape, dtype=np.float64)
+    end = np.empty(x.shape, dtype=np.float64)
+    start[0] = 0.0
+    for k in range(1, T):
+        start[k] = np.where(eq[k - 1], start[k - 1], k)
+    end[T - 1] = T - 1.0
+    for k in range(T - 2, -1, -1):
+        end[k] = np.where(eq[k], end[k + 1], k)
+    ranks = np.empty(x.shape, dtype=np.float64)
+    np.put_along_axis(ranks, order, 0.5 * (start + end) + 1.0, 0)
+    ranks[~np.isfinite(x)] = np.nan
+    return ranks
+
+
+def _acf(y: np.ndarray, nlags: int) -> np.ndarray:
+    """NaN'ları atlayan otokorelasyon, gecikme 1..nlags -> (nlags, ...)."""
+    ok = np.isfinite(y)
+    cnt = ok.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(ok, y, 0.0).sum(axis=0) / cnt
+        d = np.where(ok, y - mean, 0.0)
+        den = (d * d).sum(axis=0)
+        rho = np.empty((nlags,) + y.shape[1:])
+        for k in range(1, nlags + 1):
+            rho[k - 1] = (d[:-k] * d[k:]).sum(axis=0) / den
+    return rho
+
+
+def _autocorr_factor(
+    x: np.ndarray,
+    t: np.ndarray,
+    slope: np.ndarray,
+    n: np.ndarray,
+    method: str,
+    alpha: float,
+    lag: Optional[int],
+) -> np.ndarray:
+    """Varyans çarpanı n/n* (Hamed-Rao veya Yue-Wang); pozitif olmayan çarpan 1 olur."""
+    T = len(x)
+    nlags = T - 1 if lag is None else min(int(lag), T - 1)
+    bshape = (-1,) + (1,) * (x.ndim - 1)
+    # Sen's slope ile trendden arındır
+    detrended = x.astype(np.float64) - slope[None].astype(np.float64) * (t - t[0]).reshape(bshape)
+    k = np.arange(1, nlags + 1, dtype=np.float64).reshape(bshape)
+
+    if method == "hamed_rao":
+        rho = _acf(_average_ranks(detrended), nlags)
+        z_crit = NormalDist().inv_cdf(1.0 - alpha / 2.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sig = np.abs(rho) > z_crit / np.sqrt(n)
+            w = (n - k) * (n - k - 1.0) * (n - k - 2.0)
+            total = np.where(sig & (w > 0), w * rho, 0.0).sum(axis=0)
+            factor = 1.0 + 2.0 * total / (n * (n - 1.0) * (n - 2.0))
+    else:
+        rho = _acf(detrended, nlags)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = np.where(k < n, (1.0 - k / n) * np.nan_to_num(rho), 0.0).sum(axis=0)
+        factor = 1.0 + 2.0 * total
+    # Negatif / sıfır çarpan geçersiz varyans verir: düzeltmesiz (bağ düzeltmeli) varyansa dön
+    with np.errstate(invalid="ignore"):
+        return np.where(factor > 0, factor, 1.0)
+
+
+def mann_kendall_stack(
+    values: np.ndarray,
+    times: Optional[Sequence] = None,
+    alpha: float = 0.05,
+    method: str = "tie",
+    lag: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Zaman ekseni 0 olan dizinin her serisi için MK testi ve Sen's slope.
+
+    NaN gözlemler ilgili çiftlerden çıkarılır; `n` piksel başına geçerli
+    gözlem sayısıdır. Eğim `times` birimindedir (tarih verilirse 1/yıl).
+    `method` varyans düzeltmesini seçer (bkz. MK_METHODS); `lag`
+    otokorelasyon düzeltmelerinde kullanılacak en büyük gecikmedir.
+
+    Returns:
+        n, S, var_S, Z, p, slope ve trend (-1/0/1: `alpha` düzeyinde anlamlı
+        azalış / yok / artış) dizileri; otokorelasyon yöntemlerinde ayrıca
+        varyans çarpanı `n_ns` (n/n*)
+    """
+    if method not in MK_METHODS:
+        raise ValueError(f"Bilinmeyen MK yöntemi: {method!r}. Seçenekler: {MK_METHODS}")
+    # Raster pencereleri float32 kalır; diğer girdiler (alan, tablo) float64
+    x = np.asarray(values)
+    x = x if x.dtype == np.float32 else x.astype(np.float64)
+    T = x.shape[0]
+    t = _time_axis(times, T)
+
+    n = np.isfinite(x).sum(axis=0)
+    s = np.zeros(x.shape[1:], dtype=np.int64)
+    with np.errstate(invalid="ignore"):
+        for i in range(T - 1):
+            sign = np.sign(x[i + 1:] - x[i])
+            sign[np.isnan(sign)] = 0
+            s += sign.sum(axis=0, dtype=np.int64)
+
+    slope = _pairwise_slope_median(x.reshape(T, -1), t).reshape(x.shape[1:])
+
+    var_s = n * (n - 1.0) * (2.0 * n + 5.0)
+    if method != "original":
+        var_s = var_s - _tie_term(_sorted_runs(x)[2])
+    var_s = var_s / 18.0
+
+    res: Dict[str, np.ndarray] = {}
+    if method in ("hamed_rao", "yue_wang"):
+        n_ns = _autocorr_factor(x, t, slope, n, method, alpha, lag)
+        var_s = var_s * n_ns
+        res["n_ns"] = n_ns
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sd = np.sqrt(var_s)
+        z = np.where(s > 0, (s - 1) / sd, np.where(s < 0, (s + 1) / sd, 0.0))
+    z[~(var_s > 0)] = np.nan
+    p = 2.0 * norm_sf(np.abs(z))
+
+    with np.errstate(invalid="ignore"):
+        trend = np.where(p < alpha, np.sign(z), 0).astype(np.int8)
+    res.update({"n": n, "S": s, "var_S": var_s, "Z": z, "p": p, "slope": slope, "trend": trend})
+    return res
+
+
+def mann_kendall_batch(
+    series: np.ndarray,
+    times: Optional[Sequence] = None,
+    alpha: float = 0.05,
+    method: str = "tie",
+    lag: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Satır başına bir seri içeren (N, T) tablo için `mann_kendall_stack`.
+
+    İlçe / meşcere / piksel serileri gibi binlerce seri tek çağrıda işlenir;
+    tek seri (T,) de verilebilir (sonuçlar skaler dizi olur).
+    """
+    x = np.asarray(series)
+    return mann_kendall_stack(x.T if x.ndim > 1 else x, times, alpha, method, lag)
+
+
+def _trend_window(
+    src: RasterSource,
+    times: Optional[Sequence],
+    alpha: float,
+    method: str,
+    min_obs: int,
+    outputs: Dict[str, str],
+    window: tuple,
+) -> None:
+    res = mann_kendall_stack(read_window(src, window), times, alpha, method)
+    few = res["n"] < min_obs
+    values = {
+        "mk_S": res["S"].astype(np.float64),
+        "mk_Z": res["Z"],
+        "mk_p": res["p"],
+        "sen_slope": res["slope"],
+        "trend": res["trend"].astype(np.float32),
+    }
+    win = window[-2:]
+    for product, path in outputs.items():
+        v = values[product]
+        v[few] = np.nan
+        out = np.load(path, mmap_mode="r+")
+        out[win] = encoding_for(product).encode(v)
+        out.flush()
+        del out
+
+
+def trend_local(
+    stack: RasterSource,
+    out_dir: str,
+    times: Optional[Sequence] = None,
+    alpha: float = 0.05,
+    method: str = "tie",
+    min_obs: int = 4,
+    window: int = 512,
+    workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """(zaman, y, x) yığını için piksel bazında MK + Sen's slope rasterları üretir.
+
+    Yığın pencere pencere okunur (tüm zaman ekseni dahil) ve pencereler
+    `stack` bir yol ise süreç havuzunda, değilse iş parçacıklarında işlenir.
+    Geçerli gözlemi `min_obs`'tan az pikseller nodata yazılır.
+
+    Returns:
+        Ürün adı (mk_S, mk_Z, mk_p, sen_slope, trend) -> çıktı dosya yolu
+    """
+    shape = raster_shape(stack)
+    if len(shape) != 3:
+        raise ValueError(f"trend_local: (zaman, y, x) yığını bekleniyor, boyut {shape}")
+    t = _time_axis(times, shape[0])
+
+    outputs: Dict[str, str] = {}
+    meta = {"times": t.tolist(), "alpha": alpha, "method": method}
+    for product in TREND_PRODUCTS:
+        path = os.path.join(out_dir, f"{product}.npy")
+        create_raster(path, shape[1:], product=product, meta=meta).flush()
+        outputs[product] = path
+
+    map_windows(
+        partial(_trend_window, stack, t, alpha, method, min_obs, outputs),
+        iter_windows(shape, window),
+        workers=workers,
+        processes=isinstance(stack, str),
+    )
+    return outputs
@@ -1,6 +1,6 @@
 """Genel yardımcılar ve GEE başlatma (initialize) işlevleri.
 
-- ee_init: Google Earth Engine oturumu açar (kullanıcı OAuth)
+- ee_init: Google Earth Engine oturumu açar (kullanıcı OAuth, süreç/proje başına bir kez)
 - ensure_dir: Klasör yoksa oluşturur
 - load_aoi_geojson: GeoJSON dosyasını ee.Geometry olarak yükler
 """
@@ -9,17 +9,40 @@ from __future__ import annotations
 
 import os
 import json
+import threading
 from typing import Optional
 
-import ee
+from ._lazy import lazy_import
+from .client import default_layer
 
+ee = lazy_import("ee")
 
-def ee_init(project: Optional[str] = None) -> None:
+# Bu boyuttan büyük AOI dosyaları akışla okunup yerelde birleştirilir (bkz. gee.vectors)
+LARGE_GEOJSON_BYTES = 16 << 20
+
+
+# Bu süreçte başarıyla başlatılan proje (None: varsayılan proje); bkz. ee_init
+_INIT_LOCK = threading.Lock()
+_initialized_project: Optional[str] = None
+_initialized = False
+
+
+def ee_init(project: Optional[str] = None, force: bool = False) -> None:
     """Earth Engine'i kullanıcı OAuth ile başlat.
 
     Parametre olarak yalnızca Project ID kabul edilir (örn: "your-gcp-project").
     Servis hesabı ve ortam değişkenleri bu basit yordamda kullanılmaz.
+
+    Süreç ve proje başına bir kez çalışır: aynı proje için tekrar çağrılar
+    hiçbir şey yapmaz (`force=True` yeniden başlatır). Böylece kimlik
+    bilgisi denetimi ve olası `Authenticate` akışı her `run_pipeline`
+    çağrısında tekrarlanmaz. Eşzamanlı çağrılar kilitle sıralanır.
+
+    İstek katmanına yanıt kipinde bir kaset bağlıysa (bkz. `gee.cassette`)
+    EE kasetteki algoritma tablosuyla çevrimdışı başlatılır.
     """
+    global _initialized, _initialized_project
+
     project_id = project
     if project_id is not None:
         if not isinstance(project_id, str):
@@ -27,25 +50,37 @@ def ee_init(project: Optional[str] = None) -> None:
         if project_id.isdigit():
             raise ValueError("ee_init: received a numeric-looking value. Pass Project ID, not project number.")
 
+    cassette = default_layer().cassette
+    if cassette is not None and cassette.replaying:
+        cassette.init_ee()
+        return
+
+    if _initialized and _initialized_project == project_id and not force:
+        return
+
     def _init() -> None:
         if project_id:
             ee.Initialize(project=project_id)
         else:
             ee.Initialize()
 
-    try:
+    with _INIT_LOCK:
+        if _initialized and _initialized_project == project_id and not force:
+            return
         try:
-            _init()
-        except Exception:
-            ee.Authenticate()
-            _init()
-    except Exception as e:  # pragma: no cover - environment dependent
-        if not project_id:
-            raise RuntimeError(
-                "Earth Engine init failed: Proje ID yok. 'project' parametresi geçin. Orijinal hata: "
-                + str(e)
-            )
-        raise RuntimeError(f"Earth Engine init failed for project '{project_id}': {e}")
+            try:
+                _init()
+            except Exception:
+                ee.Authenticate()
+                _init()
+        except Exception as e:  # pragma: no cover - environment dependent
+            if not project_id:
+                raise RuntimeError(
+                    "Earth Engine init failed: Proje ID yok. 'project' parametresi geçin. Orijinal hata: "
+                    + str(e)
+                )
+            raise RuntimeError(f"Earth Engine init failed for project '{project_id}': {e}")
+        _initialized, _initialized_project = True, project_id
 
 
 def ensure_dir(path: str) -> None:
@@ -63,9 +98,20 @@ def load_aoi_geojson(path: str) -> Optional[ee.Geometry]:
     - Polygon/MultiPolygon (doğrudan geometri)
     - Sadece `bbox`: dikdörtgen oluşturulur
     Hata durumunda None döner (çağıran taraf varsayılan bbox kullanır).
+
+    `LARGE_GEOJSON_BYTES`'tan büyük dosyalar (örn. meşcere katmanları) tek
+    `json.load` ve dev bir `ee.FeatureCollection` yerine akışla okunur;
+    geometriler yerelde birleştirilip tek `ee.Geometry` olarak döner.
     """
     if not path or not os.path.exists(path):
         return None
+    if os.path.getsize(path) > LARGE_GEOJSON_BYTES:
+        from shapely.geometry import mapping
+
+        from .vectors import load_union
+
+        union = load_union(path)
+        return ee.Geometry(mapping(union)) if union is not None else None
     with open(path, "r", encoding="utf-8") as f:
         gj = json.load(f)
 
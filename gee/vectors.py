@@ -0,0 +1,278 @@
+"""Büyük vektör katmanları (meşcere, ruhsat, AOI) için akışlı okuma ve parçalı EE aktarımı.
+
+Yüz binlerce poligonluk GeoJSON dosyaları hiçbir zaman tek seferde
+`json.load` ile okunmaz:
+
+- iter_geojson_features: `features` dizisini sabit boyutlu okuma tamponuyla
+  öğe öğe çözer (bellek kullanımı en büyük tek öğe kadardır)
+- clean_geometries: geçersiz geometrileri onarır / atar, opsiyonel sadeleştirir
+- VectorLayer: geometri dizisi + özellikler + STRtree uzamsal indeksi
+- ee_chunks: öğe ve köşe sayısı sınırlı `ee.FeatureCollection` parçaları
+  (istek boyutu sınırına takılmadan sunucu tarafı indirgemeler için)
+- reduce_regions_chunked: parçaları sınırlı eşzamanlılıkla `reduceRegions`'a sokar
+- export_chunks_to_assets: parçaları EE tablo varlıklarına yükler
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+import json
+import re
+
+from ._lazy import lazy_import
+from .client import get_info, start_task
+
+ee = lazy_import("ee")
+np = lazy_import("numpy")
+shapely = lazy_import("shapely")
+
+_FEATURES_ARRAY = re.compile(r'"features"\s*:\s*\[')
+_SEPARATOR = re.compile(r"[\s,]*")
+
+GeomProps = Tuple[object, dict]
+
+
+def iter_geojson_features(path: str, chunk_size: int = 1 << 20) -> Iterator[dict]:
+    """GeoJSON dosyasındaki Feature'ları sırayla, dosyayı bütünüyle okumadan üretir.
+
+    FeatureCollection dışındaki dosyalar (tek Feature / çıplak geometri)
+    küçük kabul edilip doğrudan okunur ve tek bir Feature olarak döner.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        while True:
+            chunk = f.read(chunk_size)
+            buf += chunk
+            m = _FEATURES_ARRAY.search(buf)
+            if m:
+                buf = buf[m.end():]
+                break
+            if not chunk:
+                yield from _single_feature(path)
+                return
+
+        pos, need = 0, chunk_size
+        while True:
+            pos = _SEPARATOR.match(buf, pos).end()
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                if pos == len(buf):
+                    raise json.JSONDecodeError("tampon bitti", buf, pos)
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Öğe tampona sığmadı: daha fazla oku (büyük öğeler için okuma boyu ikiye katlanır)
+                chunk = f.read(need)
+                if not chunk:
+                    raise ValueError(f"'{path}': features dizisi beklenmedik şekilde bitti")
+                buf, pos, need = buf[pos:] + chunk, 0, need * 2
+                continue
+            need = chunk_size
+            yield obj
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+def _single_feature(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        gj = json.load(f)
+    if gj.get("type") == "Feature":
+        yield gj
+    elif gj.get("type"):
+        yield {"type": "Feature", "geometry": gj, "properties": {}}
+
+
+def iter_vector_features(path: str, layer: Optional[str] = None) -> Iterator[dict]:
+    """GeoJSON'u akışla, GeoPackage/Shapefile'ı (fiona ile) öğe öğe okur."""
+    if path.lower().endswith((".geojson", ".json")):
+        yield from iter_geojson_features(path)
+        return
+    try:
+        import fiona
+    except ImportError as e:  # pragma: no cover - environment dependent
+        raise RuntimeError(f"'{path}' okumak için 'fiona' gerekli (pip install fiona).") from e
+    with fiona.open(path, layer=layer) as src:
+        for feat in src:
+            geom = feat["geometry"]
+            yield {
+                "type": "Feature",
+                "geometry": geom.__geo_interface__ if hasattr(geom, "__geo_interface__") else geom,
+                "properties": dict(feat["properties"]),
+            }
+
+
+def _polygonal(geom):
+    parts = [g for g in shapely.get_parts(geom) if g.geom_type in ("Polygon", "MultiPolygon")]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else shapely.union_all(parts)
+
+
+def clean_geometries(
+    features: Iterable[dict],
+    simplify: float = 0.0,
+    fix: bool = True,
+    where: Optional[Callable[[dict], bool]] = None,
+) -> Iterator[GeomProps]:
+    """Feature'ları (shapely geometri, özellikler) çiftlerine çevirir.
+
+    Boş / okunamayan geometriler atlanır. Geçersiz poligonlar `fix` ise
+    `make_valid` ile onarılır (yalnızca poligon parçaları tutulur), değilse
+    atlanır. `simplify` > 0 ise topoloji korunarak sadeleştirilir.
+    """
+    for feat in features:
+        props = feat.get("properties") or {}
+        if not feat.get("geometry") or (where is not None and not where(props)):
+            continue
+        try:
+            geom = shapely.geometry.shape(feat["geometry"])
+        except (AttributeError, KeyError, TypeError, ValueError, shapely.errors.GEOSException):
+            continue
+        if geom.is_empty:
+            continue
+        if not geom.is_valid:
+            if not fix:
+                continue
+            polygonal = geom.geom_type in ("Polygon", "MultiPolygon")
+            geom = shapely.make_valid(geom)
+            geom = _polygonal(geom) if polygonal else geom
+            if geom is None or geom.is_empty:
+                continue
+        if simplify:
+            geom = geom.simplify(simplify, preserve_topology=True)
+        yield geom, props
+
+
+@dataclass
+class VectorLayer:
+    """Geometri dizisi + özellikler + STRtree uzamsal indeksi."""
+
+    geoms: np.ndarray
+    props: List[dict]
+
+    def __post_init__(self):
+        self.tree = shapely.STRtree(self.geoms)
+
+    def __len__(self) -> int:
+        return len(self.geoms)
+
+    @classmethod
+    def from_features(
+        cls,
+        features: Iterable[dict],
+        where: Optional[Callable[[dict], bool]] = None,
+        simplify: float = 0.0,
+        fix: bool = True,
+    ) -> "VectorLayer":
+        """GeoJSON Feature sözlüklerinden katman (`where(props)` ile süzülebilir)."""
+        geoms, props = [], []
+        for geom, p in clean_geometries(features, simplify=simplify, fix=fix, where=where):
+            geoms.append(geom)
+            props.append(p)
+        return cls(np.asarray(geoms, dtype=object), props)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        layer: Optional[str] = None,
+        where: Optional[Callable[[dict], bool]] = None,
+        simplify: float = 0.0,
+        fix: bool = True,
+    ) -> "VectorLayer":
+        """GeoJSON (akışla) veya fiona ile GeoPackage/Shapefile dosyasından katman okur."""
+        return cls.from_features(iter_vector_features(path, layer), where=where, simplify=simplify, fix=fix)
+
+    def query(self, geom, predicate: Optional[str] = "intersects") -> np.ndarray:
+        """`geom` ile eşleşen öğe indeksleri."""
+        return self.tree.query(geom, predicate=predicate)
+
+
+def load_union(path: str, simplify: float = 0.0, layer: Optional[str] = None):
+    """Dosyadaki tüm geometrilerin birleşimi (AOI için); dosya akışla okunur."""
+    geoms = [g for g, _ in clean_geometries(iter_vector_features(path, layer), simplify=simplify)]
+    if not geoms:
+        return None
+    return geoms[0] if len(geoms) == 1 else shapely.union_all(geoms)
+
+
+def ee_chunks(
+    items: Iterable[GeomProps],
+    max_features: int = 2000,
+    max_vertices: int = 100000,
+) -> Iterator[ee.FeatureCollection]:
+    """(geometri, özellik) çiftlerini boyutu sınırlı `ee.FeatureCollection` parçalarına böler.
+
+    Bir parça `max_features` öğeyi veya `max_vertices` köşeyi aşmaz (tek başına
+    sınırı aşan bir öğe kendi parçasında gider). İstek boyutu köşe sayısıyla
+    orantılı olduğundan bu, EE istek sınırlarına takılmayı önler.
+    """
+    batch: List[ee.Feature] = []
+    vertices = 0
+    for geom, props in items:
+        n = int(shapely.get_num_coordinates(geom))
+        if batch and (len(batch) >= max_features or vertices + n > max_vertices):
+            yield ee.FeatureCollection(batch)
+            batch, vertices = [], 0
+        batch.append(ee.Feature(ee.Geometry(shapely.geometry.mapping(geom)), props))
+        vertices += n
+    if batch:
+        yield ee.FeatureCollection(batch)
+
+
+def reduce_regions_chunked(
+    image: ee.Image,
+    chunks: Iterable[ee.FeatureCollection],
+    reducer: Optional[ee.Reducer] = None,
+    scale: float = 30,
+    workers: int = 4,
+    tile_scale: float = 4,
+) -> Iterator[dict]:
+    """Her parçada `reduceRegions` çalıştırır ve öğe özelliklerini sırayla üretir.
+
+    Geometriler sunucuda düşürülür (yanıt yalnızca özellikleri taşır). En fazla
+    `workers` istek eşzamanlı çalışır; parçalar tüketildikçe üretildiği için
+    bellek kullanımı parça sayısından bağımsızdır.
+    """
+    reducer = reducer or ee.Reducer.mean()
+
+    def _reduce(fc: ee.FeatureCollection) -> List[dict]:
+        out = image.reduceRegions(collection=fc, reducer=reducer, scale=scale, tileScale=tile_scale)
+        info = get_info(out.select([".*"], None, False), op="reduce_regions")
+        return [feat.get("properties", {}) for feat in info.get("features", [])]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+        for fc in chunks:
+            pending.append(pool.submit(_reduce, fc))
+            if len(pending) >= 2 * max(1, workers):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def export_chunks_to_assets(
+    chunks: Iterable[ee.FeatureCollection],
+    asset_prefix: str,
+    description: str = "vector_chunk",
+) -> List[ee.batch.Task]:
+    """Parçaları `<asset_prefix>_0000`, `_0001`, ... tablo varlıklarına yükler.
+
+    Görevler başlatılıp döndürülür. Yüklenen varlıklar daha sonra
+    `ee.FeatureCollection([...]).flatten()` ile tek koleksiyon olarak kullanılabilir.
+    """
+    tasks = []
+    for k, fc in enumerate(chunks):
+        task = ee.batch.Export.table.toAsset(
+            collection=fc,
+            description=f"{description}_{k:04d}",
+            assetId=f"{asset_prefix}_{k:04d}",
+        )
+        start_task(task, op="export_table")
+        tasks.append(task)
+    return tasks
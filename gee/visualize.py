@@ -1,20 +1,21 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 import os
 import csv
-import requests
 import json
 
-import ee
-import folium
-from branca.colormap import LinearColormap
-
+from ._lazy import lazy_import
+from .client import EEResourceError, EERequestError, HTTPStatusError, download, get_info, get_map_id, get_thumb_url
 from .utils import ensure_dir
 
+ee = lazy_import("ee")
+folium = lazy_import("folium")
+
 
 def _center_of(aoi: ee.Geometry):
-    c = aoi.centroid(10).coordinates().getInfo()
+    c = get_info(aoi.centroid(10).coordinates(), op="centroid")
     return [c[1], c[0]]  # lat, lon
 
 
@@ -32,7 +33,7 @@ def vis_params() -> Dict[str, dict]:
 
 
 def _ee_tile_url(image: ee.Image, vis: dict) -> str:
-    info = image.getMapId(vis)
+    info = get_map_id(image, vis)
     if isinstance(info, dict):
         tf = info.get("tile_fetcher")
         if tf is not None and hasattr(tf, "url_format"):
@@ -88,19 +89,133 @@ def save_folium_overlay(base_image: ee.Image, base_vis: dict, overlay_image: ee.
 
 
 def reduce_mean(image: ee.Image, region: ee.Geometry, band_name: str, scale: int = 10) -> float:
+    """Bölge ortalaması; geçerli piksel yoksa 0.0.
+
+    Geçici hatalar istek katmanında yeniden denenir; kalıcı hatalar
+    (`EERequestError`) sessizce 0.0'a çevrilmez, çağırana yükseltilir.
+    """
+    val = get_info(image.select(band_name).reduceRegion(
+        reducer=ee.Reducer.mean(),
+        geometry=region,
+        scale=scale,
+        maxPixels=1e9,
+        tileScale=16,
+        bestEffort=True
+    ).get(band_name), op="reduce_mean")
+    return float(val) if val is not None else 0.0
+
+
+# Birleşik indirgeyicinin istatistikleri: (çıktı soneki, BandStats alanı)
+_STATS = (("mean", "mean"), ("min", "min"), ("max", "max"), ("stdDev", "std"), ("count", "count"))
+
+
+@dataclass
+class BandStats:
+    """Tek bandın bölge istatistikleri; `error` doluysa değerler eksiktir."""
+
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    std: Optional[float] = None
+    count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class RegionStats:
+    """`region_stats` sonucu: band adı -> `BandStats` (görüntüdeki band sırasıyla)."""
+
+    bands: Dict[str, BandStats] = field(default_factory=dict)
+    scale: Optional[float] = None
+    requests: int = 0
+
+    def __getitem__(self, band: str) -> BandStats:
+        return self.bands[band]
+
+    def __len__(self) -> int:
+        return len(self.bands)
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        return {b: st.error for b, st in self.bands.items() if st.error is not None}
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Düz `{band}_{istatistik}` sözlüğü (CSV / `write_kv_csv` için)."""
+        out: Dict[str, Optional[float]] = {}
+        for band, st in self.bands.items():
+            for _, attr in _STATS:
+                out[f"{band}_{attr}"] = getattr(st, attr)
+        return out
+
+
+def _stats_reducer() -> ee.Reducer:
+    reducer = ee.Reducer.mean()
+    for extra in (ee.Reducer.minMax(), ee.Reducer.stdDev(), ee.Reducer.count()):
+        reducer = reducer.combine(extra, sharedInputs=True)
+    return reducer
+
+
+def _band_stats(values: dict, band: str, single: bool) -> BandStats:
+    def pick(suffix: str):
+        key = f"{band}_{suffix}"
+        # Tek bantlı görüntüde indirgeyici çıktıları band adıyla öneklenmez
+        return values.get(key, values.get(suffix) if single else None)
+
+    raw = {attr: pick(suffix) for suffix, attr in _STATS}
+    count = int(raw.pop("count") or 0)
+    if not count or raw["mean"] is None:
+        return BandStats(count=count, error="bölgede geçerli piksel yok")
+    return BandStats(count=count, **{k: float(v) if v is not None else None for k, v in raw.items()})
+
+
+def region_stats(
+    image: ee.Image,
+    region: ee.Geometry,
+    scale: float = 30,
+    max_pixels: float = 1e9,
+    tile_scale: int = 1,
+    best_effort: bool = False,
+) -> RegionStats:
+    """Tüm bantlar için ortalama, min, maks, std ve piksel sayısı; tek sunucu isteği.
+
+    Band adları ve birleşik indirgeyicinin `reduceRegion` sonucu tek bir
+    `ee.Dictionary` içinde istenir (band başına ayrı istek yok). Geçerli
+    pikseli olmayan bantlar `BandStats.error` ile işaretlenir. Birleşik istek
+    kalıcı olarak başarısız olursa her band ayrı istenir ve hatası kendi
+    `BandStats.error` alanına yazılır.
+    """
+    kwargs = dict(geometry=region, scale=scale, maxPixels=max_pixels, tileScale=tile_scale, bestEffort=best_effort)
+    reducer = _stats_reducer()
+    request = ee.Dictionary({
+        "bands": image.bandNames(),
+        "stats": image.reduceRegion(reducer=reducer, **kwargs),
+    })
     try:
-        val = image.select(band_name).reduceRegion(
-            reducer=ee.Reducer.mean(),
-            geometry=region,
-            scale=scale,
-            maxPixels=1e9,
-            tileScale=16,
-            bestEffort=True
-        ).get(band_name).getInfo()
-        return float(val) if val is not None else 0.0
-    except Exception as e:
-        print(f"Error in reduce_mean: {e}")
-        return 0.0
+        info = get_info(request, op="region_stats")
+    except EERequestError as e:
+        print(f"⚠️ region_stats: birleşik istek başarısız ({e.kind}); bantlar tek tek deneniyor.")
+        return _region_stats_per_band(image, reducer, kwargs, scale)
+
+    bands: List[str] = info.get("bands") or []
+    values = info.get("stats") or {}
+    single = len(bands) == 1
+    return RegionStats({b: _band_stats(values, b, single) for b in bands}, scale=scale, requests=1)
+
+
+def _region_stats_per_band(image: ee.Image, reducer: ee.Reducer, kwargs: dict, scale: float) -> RegionStats:
+    bands = get_info(image.bandNames(), op="band_names")
+    out = RegionStats(scale=scale, requests=1 + len(bands))
+    for band in bands:
+        try:
+            values = get_info(image.select([band]).reduceRegion(reducer=reducer, **kwargs), op="band_stats")
+            out.bands[band] = _band_stats(values or {}, band, single=True)
+        except EERequestError as e:
+            out.bands[band] = BandStats(error=str(e))
+    return out
 
 
 def compute_severity_areas(severity: ee.Image, region: ee.Geometry, scale: int = 10) -> dict:
@@ -109,14 +224,14 @@ def compute_severity_areas(severity: ee.Image, region: ee.Geometry, scale: int =
     
     for current_scale in scales_to_try:
         try:
-            hist = severity.reduceRegion(
+            hist = get_info(severity.reduceRegion(
                 reducer=ee.Reducer.frequencyHistogram(),
                 geometry=region,
                 scale=current_scale,
                 maxPixels=1e9,
                 tileScale=16,
                 bestEffort=True
-            ).get("severity").getInfo()
+            ).get("severity"), op="severity_areas")
             
             out = {}
             if not hist:
@@ -136,15 +251,15 @@ def compute_severity_areas(severity: ee.Image, region: ee.Geometry, scale: int =
             # Başarılı olursa döngüden çık
             return out
 
-        except Exception as e:
-            # Sadece Time out veya Memory hatalarında scale artırıp tekrar dene
-            if "timed out" in str(e) or "memory" in str(e).lower():
-                print(f"⚠️ compute_severity_areas (scale={current_scale}) zaman aşımı/bellek hatası. Scale={scales_to_try[scales_to_try.index(current_scale)+1] if scales_to_try.index(current_scale)+1 < len(scales_to_try) else 'N/A'} ile tekrar deneniyor...")
-                continue
-            else:
-                # Başka bir hataysa (örn: authentication) direkt bildir
-                print(f"Error in compute_severity_areas: {e}")
-                return {}
+        except EEResourceError:
+            # Yalnızca sunucu kaynak sınırlarında (zaman aşımı / bellek) scale artırıp tekrar dene;
+            # kota ve geçici hatalar istek katmanında zaten yeniden denendi
+            print(f"⚠️ compute_severity_areas (scale={current_scale}) zaman aşımı/bellek hatası. Scale={scales_to_try[scales_to_try.index(current_scale)+1] if scales_to_try.index(current_scale)+1 < len(scales_to_try) else 'N/A'} ile tekrar deneniyor...")
+            continue
+        except EERequestError as e:
+            # Başka bir hataysa (örn: authentication) direkt bildir
+            print(f"Error in compute_severity_areas: {e}")
+            return {}
     
     print("❌ compute_severity_areas: Tüm denemeler başarısız oldu.")
     return {}
@@ -171,17 +286,16 @@ def write_kv_csv(path: str, data: dict):
 def _download_url(url: str, path: str) -> bool:
     ensure_dir(os.path.dirname(path))
     try:
-        r = requests.get(url, timeout=300)
-        if r.status_code == 200:
-            with open(path, "wb") as f:
-                f.write(r.content)
-            return True
+        content = download(url, timeout=300)
+    except EERequestError as e:
+        if isinstance(e.cause, HTTPStatusError):
+            print(f"⚠️ İndirme uyarısı (Status {e.cause.status_code}): {os.path.basename(path)} indirilemedi. (Veri boş olabilir, atlanıyor)")
         else:
-            print(f"⚠️ İndirme uyarısı (Status {r.status_code}): {os.path.basename(path)} indirilemedi. (Veri boş olabilir, atlanıyor)")
-            return False
-    except Exception as e:
-        print(f"Failed to download {url}: {e}")
+            print(f"Failed to download {url}: {e}")
         return False
+    with open(path, "wb") as f:
+        f.write(content)
+    return True
 
 
 def _get_thumb_url(image: ee.Image, aoi: ee.Geometry, vis: dict, boundary: Optional[ee.Geometry] = None) -> str:
@@ -191,7 +305,7 @@ def _get_thumb_url(image: ee.Image, aoi: ee.Geometry, vis: dict, boundary: Optio
          line_img = line_fc.style(color="FF00FF", width=2, fillColor="00000000")
          img_vis = img_vis.blend(line_img)
     
-    return img_vis.getThumbURL({
+    return get_thumb_url(img_vis, {
         'dimensions': 1024,
         'region': aoi.bounds(), 
         'format': 'png'
@@ -277,7 +391,7 @@ def export_report_pngs(pre, post, diffs, severity, aoi, out_dir, boundary=None)
          line_img = line_fc.style(color="FF00FF", width=2, fillColor="00000000")
          combined = combined.blend(line_img)
     
-    url = combined.getThumbURL({
+    url = get_thumb_url(combined, {
         'dimensions': 2048,
         'region': aoi.bounds(),
         'format': 'png'
@@ -80,6 +80,7 @@ nb_content = {
     "# Yardımcı modüllerimiz\n",
     "from gee.utils import ee_init\n",
     "from gee.aoi import get_aoi\n",
+    "from gee.indices import with_indices\n",
     "\n",
     "MY_PROJECT = 'tubitak-478716'\n",
     "\n",
@@ -127,9 +128,8 @@ nb_content = {
     "    # İndeks Hesaplama (NBR = (NIR-SWIR)/(NIR+SWIR))\n",
     "    # Sentinel-2: NIR=B8, SWIR=B12\n",
     "    def add_indices(image):\n",
-    "        nbr = image.normalizedDifference(['B8', 'B12']).rename('NBR')\n",
-    "        ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')\n",
-    "        return image.addBands([nbr, ndvi]).set('year', year).set('system:time_start', ee.Date(start).millis())\n",
+    "        # Bantlar yukarıda 0-1 aralığına ölçeklendi (scale=1.0)\n",
+    "        return with_indices(image, ['NBR', 'NDVI'], scale=1.0).set('year', year).set('system:time_start', ee.Date(start).millis())\n",
     "\n",
     "    return dataset.map(add_indices).median().clip(geometry).set('year', year)\n",
     "\n",
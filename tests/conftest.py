@@ -0,0 +1,35 @@
+"""Ortak test ayarları: depo kökü içe aktarma yolunda, ağsız `ee` başlatma."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def ee_offline():
+    """İfade grafiği kurmak için `ee`'yi earthengine-api'nin statik algoritma tablosuyla başlatır.
+
+    Sunucuya istek gönderilmez; testler yalnızca grafikleri (serileştirilmiş
+    biçimde) inceler.
+    """
+    ee = pytest.importorskip("ee")
+    from ee import apitestcase
+
+    from gee.cassette import REPLAY_PROJECT
+
+    data = ee.data
+    saved = data.initialize, data.getAlgorithms
+    data.initialize = lambda *args, **kwargs: None
+    data.getAlgorithms = apitestcase.GetAlgorithms
+    try:
+        ee.Initialize(credentials=None, project=REPLAY_PROJECT)
+    finally:
+        data.initialize, data.getAlgorithms = saved
+    return ee
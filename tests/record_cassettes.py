@@ -0,0 +1,212 @@
+"""Replay testlerinin kasetlerini (yeniden) kaydeder.
+
+Canlı kayıt (gerçek değerler):
+    python tests/record_cassettes.py --project my-gcp-project
+
+Sentetik kayıt (hesap ve ağ olmadan, CI'daki kasetin kaynağı):
+    python tests/record_cassettes.py --synthetic
+
+Sentetik kipte istekler aynı `gee` kod yolundan geçer ve aynı ifade
+grafikleri kaydedilir, ancak yanıtlar yerel, deterministik bir yanıtlayıcıdan
+gelir. Algoritma tablosu earthengine-api ile gelen statik tablodur
+(`ee.apitestcase.GetAlgorithms`). Bu kaset istemci tarafını (grafik kurma,
+kaset anahtarları, yanıtların işlenmesi, dosya çıktıları) sınar; değerler
+gerçek uydu sonuçları değildir. Gerçek değerler için kaset `--project` ile
+yeniden kaydedilmelidir.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import replay_scenarios as sc  # noqa: E402
+from gee.cassette import REPLAY_PROJECT, use_cassette  # noqa: E402
+
+# Sentetik yanıtlar
+BAND_COUNT = 12
+SEVERITY_HISTOGRAM = {"0": 41250, "1": 1630, "2": 742, "3": 318, "4": 95}
+FIRE_ZONES = (
+    (412.5, (32.70, 41.02, 32.81, 41.09)),
+    (138.0, (32.90, 41.15, 32.96, 41.20)),
+)
+REGION_STATS = {"mean": 0.31, "min": -0.42, "max": 0.88, "stdDev": 0.17, "count": 15873}
+FOREST_HA = 18342.75
+SCENES_PER_MONTH = 3
+
+
+def _png(size: int = 8) -> bytes:
+    """Deterministik, geçerli küçük bir RGBA PNG."""
+    raw = b"".join(b"\x00" + b"".join(bytes((x * 31 % 256, y * 31 % 256, 96, 255)) for x in range(size)) for y in range(size))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 9)) + chunk(b"IEND", b"")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+class SyntheticBackend:
+    """`ee.data` ve indirme çağrılarını ifade grafiğine göre yanıtlayan yerel sunucu."""
+
+    def __init__(self):
+        self.png = _png()
+        self.calls = {}
+
+    def _count(self, kind: str) -> None:
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+
+    def compute_value(self, obj):
+        graph = obj.serialize()
+        if '"reduceToVectors"' in graph or "Image.reduceToVectors" in graph:
+            self._count("fire_zones")
+            feats = []
+            for area, (x0, y0, x1, y1) in FIRE_ZONES:
+                ring = [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+                feats.append({"type": "Feature", "geometry": None, "properties": {"area_ha": area, "bbox": [ring]}})
+            return {"type": "FeatureCollection", "features": feats}
+        if "frequencyHistogram" in graph:
+            self._count("severity_areas")
+            return dict(SEVERITY_HISTOGRAM)
+        if '"scene_id"' in graph:
+            return self._scene_page(graph)
+        if "aggregate_array" in graph or "AggregateFeatureCollection.array" in graph:
+            return self._scene_list(graph)
+        if "Reducer.sum" in graph and "Image.pixelArea" in graph:
+            self._count("forest_area")
+            return FOREST_HA
+        if "Reducer.combine" in graph:
+            self._count("region_stats")
+            bands = ["NBR", "NDVI", "NDMI"]
+            stats = {f"{b}_{k}": v for b in bands for k, v in REGION_STATS.items()}
+            return {"bands": bands, "stats": stats}
+        if "Geometry.centroid" in graph:
+            self._count("centroid")
+            return [32.83, 41.09]
+        if "Image.bandNames" in graph:
+            self._count("band_count")
+            return BAND_COUNT
+        raise NotImplementedError(f"Sentetik yanıt yok: {graph[:300]}")
+
+    # Zaman serisi: ayda SCENES_PER_MONTH sahne, değerler sahne kimliğinden türetilir
+    def _scenes(self):
+        from datetime import datetime, timezone
+
+        start = datetime.fromisoformat(sc.SERI[0]).replace(tzinfo=timezone.utc)
+        end = datetime.fromisoformat(sc.SERI[1]).replace(tzinfo=timezone.utc)
+        t0, t1 = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+        step = 30 * 86400000 // SCENES_PER_MONTH
+        return [(f"S2_{t // 86400000}", t) for t in range(t0, t1, step)]
+
+    def _scene_list(self, graph: str):
+        self._count("list_scenes")
+        scenes = self._scenes()
+        return [[s for s, _ in scenes], [t for _, t in scenes]]
+
+    def _scene_page(self, graph: str):
+        self._count("scene_page")
+        feats = []
+        for sid, _ in self._scenes():
+            if json.dumps(sid) not in graph:
+                continue
+            h = int(_digest(sid), 16)
+            props = {"scene_id": sid, "NDVI": 0.5 + (h % 200) / 1000, "NBR": 0.3 + (h % 150) / 1000, "NDMI": 0.1 + (h % 90) / 1000}
+            feats.append({"type": "Feature", "geometry": None, "properties": props})
+        return {"type": "FeatureCollection", "features": feats}
+
+    def get_map_id(self, params):
+        import ee
+
+        self._count("getMapId")
+        name = f"projects/{REPLAY_PROJECT}/maps/{_digest(ee.serializer.toJSON(params['image']))}"
+        return {"mapid": name, "token": "", "tile_fetcher": ee.data.TileFetcher(f"https://earthengine.googleapis.com/v1/{name}/tiles/{{z}}/{{x}}/{{y}}")}
+
+    def get_thumb_id(self, params, thumbType=None):
+        import ee
+
+        self._count("getThumbId")
+        return {"thumbid": f"projects/{REPLAY_PROJECT}/thumbnails/{_digest(ee.serializer.toJSON(params['image']))}", "token": ""}
+
+    @staticmethod
+    def make_thumb_url(thumb_id):
+        return f"https://earthengine.googleapis.com/v1/{thumb_id['thumbid']}:getPixels"
+
+    def http_get(self, url, timeout=None, **kwargs):
+        self._count("download")
+
+        class _Response:
+            status_code = 200
+            content = self.png
+
+        return _Response()
+
+    def install(self):
+        """`ee.data` ve `requests.get`'i bu yanıtlayıcıya yönlendirir; geri alma işlevini döndürür."""
+        import ee
+        import requests
+        from ee import apitestcase
+
+        data = ee.data
+        saved = {name: getattr(data, name) for name in (
+            "initialize", "get_persistent_credentials", "getAlgorithms", "computeValue", "getMapId", "getThumbId", "makeThumbUrl",
+        )}
+        saved_get = requests.get
+        data.initialize = lambda *args, **kwargs: None
+        data.get_persistent_credentials = lambda: None
+        data.getAlgorithms = apitestcase.GetAlgorithms
+        data.computeValue = self.compute_value
+        data.getMapId = self.get_map_id
+        data.getThumbId = self.get_thumb_id
+        data.makeThumbUrl = self.make_thumb_url
+        requests.get = self.http_get
+        ee.Initialize(credentials=None, project=REPLAY_PROJECT)
+
+        def restore():
+            for name, fn in saved.items():
+                setattr(data, name, fn)
+            requests.get = saved_get
+
+        return restore
+
+
+def record(path: str, project=None, synthetic: bool = False) -> None:
+    restore = None
+    if synthetic:
+        restore = SyntheticBackend().install()
+        project = REPLAY_PROJECT
+    try:
+        with use_cassette(path, mode="record") as cas:
+            with tempfile.TemporaryDirectory() as d:
+                sc.karabuk_pipeline(os.path.join(d, "out"), project=project)
+                sc.karabuk_yorumcu(os.path.join(d, "cache"), project=project)
+        print(f"{path}: {len(cas)} istek kaydedildi")
+    finally:
+        if restore:
+            restore()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    group = ap.add_mutually_exclusive_group(required=True)
+    group.add_argument("--project", help="Canlı kayıt için GEE proje kimliği")
+    group.add_argument("--synthetic", action="store_true", help="Yerel, deterministik yanıtlayıcıyla kaydet")
+    ap.add_argument("--cassette", default=sc.KARABUK_CASSETTE)
+    args = ap.parse_args()
+    record(args.cassette, project=args.project, synthetic=args.synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Kaset kayıt/yanıt senaryoları (bkz. `gee.cassette`).
+
+Kaset anahtarı isteğin ifade grafiğidir; bu yüzden kayıt
+(`tests/record_cassettes.py`) ve yanıt (`tests/test_cassette_replay.py`)
+aynı senaryo işlevlerini aynı argümanlarla çağırmalıdır.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS_DIR)
+CASSETTE_DIR = os.path.join(TESTS_DIR, "cassettes")
+KARABUK_CASSETTE = os.path.join(CASSETTE_DIR, "karabuk.json.gz")
+
+# Karabük merkez kutusu (gee/aoi.geojson)
+AOI_GEOJSON = os.path.join(ROOT, "gee", "aoi.geojson")
+PRE = ("2021-06-01", "2021-07-28")
+POST = ("2021-08-05", "2021-09-30")
+
+# GEEYorumcusu senaryosu: küçük bir kutu ve iki aylık seri
+BOLGE = {"kuzey": 41.23, "guney": 40.95, "dogu": 33.02, "bati": 32.64}
+SERI = ("2021-06-01", "2021-08-01")
+
+
+def karabuk_pipeline(out_dir: str, project=None) -> dict:
+    """`run_pipeline`: şiddet alanları, küçük yama filtresi ve iki yangın kümesiyle."""
+    from gee.pipeline import run_pipeline
+
+    return run_pipeline(
+        PRE[0], PRE[1], POST[0], POST[1],
+        aoi_geojson=AOI_GEOJSON,
+        out_dir=out_dir,
+        project=project,
+        area_scale=100,
+        min_patch_ha=5,
+        compute_severity=True,
+        fire_zone_top_n=2,
+    )
+
+
+def archive_path() -> None:
+    """Arşivdeki `src` paketini depo kökündeki `gee` ile içe aktarılabilir yapar."""
+    archive = os.path.join(ROOT, "archieve")
+    for path in (archive, ROOT):
+        if path in sys.path:
+            sys.path.remove(path)
+    # Depo kökü önde olmalı: archieve/gee eski kopyayı gölgelemesin
+    sys.path[:0] = [ROOT, archive]
+
+
+def karabuk_yorumcu(cache_dir: str, project=None) -> dict:
+    """Arşivdeki `GEEYorumcusu`: bölge istatistikleri, orman alanı ve zaman serisi."""
+    archive_path()
+    from src.gee_pipeline import GEEYorumcusu
+
+    gee = GEEYorumcusu(project=project)
+    bolge = gee.bolge_sinirlari_olustur(BOLGE)
+    koleksiyon = gee.sentinel2_koleksiyonu_yukle(SERI[0], SERI[1], bolge)
+    goruntu = gee.spektral_indeksler_hesapla(koleksiyon.median())
+    istatistik = gee.istatistik_hesapla(goruntu.select(["NBR", "NDVI", "NDMI"]), bolge, scale=100)
+    orman_ha = gee.orman_alani_hesapla(goruntu, bolge)
+    seri = gee.zaman_serisi_analizi(
+        koleksiyon.map(gee.spektral_indeksler_hesapla),
+        bolge,
+        scale=100,
+        onbellek_klasoru=cache_dir,
+    )
+    return {"istatistik": istatistik, "orman_ha": orman_ha, "seri": seri}
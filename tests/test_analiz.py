@@ -0,0 +1,109 @@
+"""Arşivdeki `OrmanAnalizi`: gruplanmış tablolarla yeniden yazımın eski çıktılarla eşliği.
+
+`data/orman_analizi_baseline.json`, aynı girdilerle gruplanmış tablolara
+geçişten önceki (il il döngüler) `OrmanAnalizi`'nin çıktılarıdır.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import warnings
+
+import pandas as pd
+import pytest
+
+import replay_scenarios as sc
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "orman_analizi_baseline.json")
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(BASELINE, encoding="utf-8") as f:
+        doc = json.load(f)
+
+    def years(d):
+        return {il: {int(y): v for y, v in yillar.items()} for il, yillar in d.items()}
+
+    girdi = doc["girdi"]
+    return years(girdi["orman"]), years(girdi["nbr"]), girdi["maden"], doc["beklenen"]
+
+
+@pytest.fixture(scope="module")
+def analiz_mod():
+    sc.archive_path()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # geemap / folium eksik uyarıları
+        from src import analiz
+    return analiz
+
+
+def _frame(split: dict) -> pd.DataFrame:
+    return pd.DataFrame(split["data"], columns=split["columns"])
+
+
+def _check_frame(got: pd.DataFrame, expected: dict) -> None:
+    exp = _frame(expected)
+    got = got.reset_index(drop=True)
+    assert list(got.columns) == list(exp.columns)
+    pd.testing.assert_frame_equal(got, exp, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+TABLES = ("bolgesel_nbr_ozeti", "bolgesel_kayip_ozeti", "tum_iller_risk_analizi", "yillik_degisim_analizi")
+
+
+@pytest.mark.parametrize("method", TABLES)
+def test_tables_match_baseline(analiz_mod, baseline, method):
+    orman, nbr, maden, expected = baseline
+    analiz = analiz_mod.OrmanAnalizi(orman, nbr, maden)
+    _check_frame(getattr(analiz, method)(), expected[method])
+
+
+def test_trends_match_baseline(analiz_mod, baseline):
+    orman, nbr, maden, expected = baseline
+    got = analiz_mod.OrmanAnalizi(orman, nbr, maden).tum_iller_trend_analizi()
+    assert list(got) == list(expected["tum_iller_trend_analizi"])
+    for il, sonuc in got.items():
+        exp = expected["tum_iller_trend_analizi"][il]
+        for key, value in dataclasses.asdict(sonuc).items():
+            assert value == pytest.approx(exp[key], rel=1e-9) if isinstance(value, float) else value == exp[key]
+
+
+def test_summary_matches_baseline(analiz_mod, baseline):
+    orman, nbr, maden, expected = baseline
+    got = analiz_mod.OrmanAnalizi(orman, nbr, maden).karsilastirmali_analiz()
+    exp = expected["karsilastirmali_analiz"]
+    assert list(got) == list(exp)
+    for key, value in got.items():
+        assert value == (exp[key] if isinstance(exp[key], str) else pytest.approx(exp[key], rel=1e-9))
+
+
+def test_store_input_matches_dicts(analiz_mod, baseline):
+    from gee.results import ResultStore
+
+    orman, nbr, maden, expected = baseline
+    depo = ResultStore(run="test")
+    for veri_tipi, veri in (("orman", orman), ("nbr", nbr)):
+        for il, yillar in veri.items():
+            for yil, degerler in yillar.items():
+                depo.append(veri_tipi, il, degerler, year=yil)
+    for il, degerler in maden.items():
+        depo.append("maden", il, degerler)
+
+    analiz = analiz_mod.OrmanAnalizi(depo=depo)
+    for method in ("bolgesel_kayip_ozeti", "tum_iller_risk_analizi", "yillik_degisim_analizi"):
+        _check_frame(getattr(analiz, method)(), expected[method])
+
+
+def test_yenile_recomputes_after_source_change(analiz_mod, baseline):
+    orman, nbr, maden, _ = baseline
+    orman = {il: {y: dict(v) for y, v in yillar.items()} for il, yillar in orman.items()}
+    analiz = analiz_mod.OrmanAnalizi(orman, nbr, maden)
+    il = analiz.iller[0]
+    once = analiz.kayip_analizi(il)["yangin_kaybi"]
+    analiz.orman_verileri[il][analiz.yillar[0]]["yangin_kaybi"] += 100.0
+    assert analiz.kayip_analizi(il)["yangin_kaybi"] == once
+    analiz.yenile()
+    assert analiz.kayip_analizi(il)["yangin_kaybi"] == pytest.approx(once + 100.0)
@@ -0,0 +1,101 @@
+"""`gee.attribution`: neden atama kuralları ve etiketlenmiş yamaların yazımı."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+shapely = pytest.importorskip("shapely")
+
+from gee.attribution import (  # noqa: E402
+    ATTRIBUTION_FIELDS,
+    AttributionRules,
+    attribute_patches,
+    attribution_summary,
+    write_attributed,
+)
+from gee.polygonize import GPKG_SCHEMA  # noqa: E402
+from gee.vectors import VectorLayer  # noqa: E402
+
+
+def _square(x0, y0, size, **props):
+    geom = shapely.geometry.box(x0, y0, x0 + size, y0 + size)
+    return {"type": "Feature", "geometry": shapely.geometry.mapping(geom), "properties": props}
+
+
+def _point(x, y):
+    return {"type": "Feature", "geometry": {"type": "Point", "coordinates": [x, y]}, "properties": {}}
+
+
+@pytest.fixture
+def layers():
+    # Metrik koordinatlar (m); yamalar polygonize çıktısının alanlarını taşır
+    patches = [
+        _square(0, 0, 100, patch_id=1, pixel_count=100, area_ha=1.0, mean_dNBR=0.55, severity=4),
+        _square(1000, 0, 100, patch_id=2, pixel_count=100, area_ha=1.0, mean_dNBR=0.2, severity=2),
+        _square(2000, 0, 100, patch_id=3, pixel_count=100, area_ha=1.0, mean_dNBR=None, severity=1),
+        _square(3000, 0, 100, patch_id=4, pixel_count=100, area_ha=1.0, mean_dNBR=0.15, severity=1),
+    ]
+    mining = VectorLayer.from_features([_square(1050, 0, 100, license="IR-1")])  # yama 2'nin %50'si
+    stands = VectorLayer.from_features([
+        _square(2000, 0, 100, plan="kesim"),
+        _square(3000, 0, 100, plan="koruma"),
+    ])
+    hotspots = VectorLayer.from_features([_point(150, 50), _point(5000, 5000)])
+    return patches, mining, hotspots, stands
+
+
+def test_causes_follow_rule_order(layers):
+    patches, mining, hotspots, stands = layers
+    logging = VectorLayer.from_features(
+        [{"type": "Feature", "geometry": s.__geo_interface__, "properties": p} for s, p in zip(stands.geoms, stands.props)],
+        where=lambda p: p.get("plan") == "kesim",
+    )
+    out = list(attribute_patches(patches, mining=mining, hotspots=hotspots, stands=logging))
+    assert [f["properties"]["cause"] for f in out] == ["fire", "mining", "logging", "unknown"]
+
+    p = [f["properties"] for f in out]
+    assert p[0]["fire_hotspots"] == 1
+    assert p[1]["mining_overlap"] == pytest.approx(0.5) and p[1]["mining_index"] == 0
+    assert p[2]["logging_overlap"] == pytest.approx(1.0) and p[2]["stand_index"] == 0
+    assert p[3]["stand_index"] == -1 and p[3]["mining_index"] == -1
+    # Yama özellikleri korunur
+    assert p[0]["patch_id"] == 1 and p[0]["mean_dNBR"] == 0.55
+
+    summary = attribution_summary(out)
+    assert summary == {"fire": 1.0, "mining": 1.0, "logging": 1.0, "unknown": 1.0}
+
+
+def test_fire_dnbr_rule(layers):
+    patches, *_ = layers
+    out = list(attribute_patches(patches, rules=AttributionRules(fire_dnbr=0.5)))
+    # mean_dNBR None olan yama yangın sayılmaz
+    assert [f["properties"]["cause"] for f in out] == ["fire", "unknown", "unknown", "unknown"]
+
+
+def test_write_attributed_gpkg(tmp_path, layers):
+    fiona = pytest.importorskip("fiona")
+    patches, mining, hotspots, stands = layers
+    out = str(tmp_path / "attributed.gpkg")
+    feats = attribute_patches(patches, mining=mining, hotspots=hotspots, stands=stands)
+    assert write_attributed(feats, out, crs="EPSG:32636") == 4
+
+    with fiona.open(out) as layer:
+        schema = dict(layer.schema["properties"])
+        rows = [dict(f["properties"]) for f in layer]
+    assert list(schema) == list(GPKG_SCHEMA["properties"]) + list(ATTRIBUTION_FIELDS)
+    for name, kind in ATTRIBUTION_FIELDS.items():
+        assert schema[name].split(":")[0] == kind
+    assert [r["cause"] for r in rows] == ["fire", "mining", "logging", "logging"]
+    assert rows[1]["mining_overlap"] == pytest.approx(0.5)
+    assert rows[2]["mean_dNBR"] is None
+
+
+def test_write_attributed_geojson_and_empty(tmp_path, layers):
+    patches, *_ = layers
+    out = str(tmp_path / "attributed.geojson")
+    assert write_attributed(attribute_patches(patches), out) == 4
+    with open(out, encoding="utf-8") as f:
+        assert [x["properties"]["cause"] for x in json.load(f)["features"]] == ["unknown"] * 4
+    assert write_attributed(iter(()), str(tmp_path / "empty.geojson")) == 0
@@ -0,0 +1,93 @@
+"""`run_pipeline` ve arşivdeki `GEEYorumcusu`'nun kasetten, ağsız yanıtlanması.
+
+Kaset `tests/record_cassettes.py` ile kaydedilir. Beklenen değerler
+kasetteki yanıtlardan okunur; kaset canlı bir hesapla yeniden kaydedilse de
+testler değişmeden çalışır.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+
+import pytest
+
+ee = pytest.importorskip("ee")
+pytest.importorskip("folium")
+
+import replay_scenarios as sc  # noqa: E402
+from gee import client  # noqa: E402
+from gee.cassette import CassetteMiss, use_cassette  # noqa: E402
+
+
+def _responses(op: str) -> list:
+    with gzip.open(sc.KARABUK_CASSETTE, "rt", encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    return [e["value"] for e in entries.values() if e["op"] == op]
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    """Kasetten yanıtlanmayan her sunucu / HTTP çağrısı testi düşürür."""
+    import requests
+
+    def _network(*args, **kwargs):
+        raise AssertionError("kaset yanıt kipinde ağa çıkıldı")
+
+    for name in ("computeValue", "getMapId", "getThumbId", "getInfo"):
+        monkeypatch.setattr(ee.data, name, _network)
+    monkeypatch.setattr(requests, "get", _network)
+    client.default_layer().metrics.reset()
+
+
+def test_run_pipeline_replays_offline(tmp_path):
+    with use_cassette(sc.KARABUK_CASSETTE) as cas:
+        outputs = sc.karabuk_pipeline(str(tmp_path / "out"))
+    assert cas.recorded == 0 and cas.hits > 0
+
+    for key in ("pre_rgb_map", "post_rgb_map", "dnbr_map", "dndvi_map"):
+        with open(outputs[key], encoding="utf-8") as f:
+            assert "googleapis.com" in f.read()
+    for key in ("dnbr_png", "dndvi_png", "pre_rgb_png", "post_rgb_png"):
+        with open(outputs[key], "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    # area_scale=100 m -> piksel başına 1 ha
+    (hist,) = _responses("severity_areas")
+    with open(outputs["severity_areas_csv"], encoding="utf-8") as f:
+        areas = {k: float(v) for k, v in list(csv.reader(f))[1:]}
+    assert areas == {f"alan_ha_sinif_{int(float(k))}": float(v) for k, v in hist.items()}
+
+    (zones,) = _responses("fire_zones")
+    assert [z["area_ha"] for z in outputs["fire_zones"]] == [f["properties"]["area_ha"] for f in zones["features"]]
+    assert outputs["fire_zone_bbox"] == list(outputs["fire_zones"][0]["bbox"])
+    for z in outputs["fire_zones"]:
+        assert outputs[f"fire_zone_{z['rank']}_dnbr_png"].endswith(f"fire_zone_{z['rank']}/dNBR.png")
+
+
+def test_geeyorumcusu_replays_offline(tmp_path):
+    cache = str(tmp_path / "cache")
+    with use_cassette(sc.KARABUK_CASSETTE) as cas:
+        first = sc.karabuk_yorumcu(cache)
+        pages = client.metrics()["scene_page"]["calls"]
+        # Önbellek dolu: ikinci çağrı sahne sayfası istemez
+        second = sc.karabuk_yorumcu(cache)
+    assert cas.recorded == 0
+    assert client.metrics()["scene_page"]["calls"] == pages
+
+    (scenes,) = _responses("list_scenes")
+    assert list(first["seri"]["scene_id"]) == scenes[0]
+    assert first["seri"].equals(second["seri"])
+    assert first["seri"][["NDVI", "NBR", "NDMI"]].notna().all().all()
+
+    (forest,) = _responses("forest_area")
+    assert first["orman_ha"] == forest
+    stats = first["istatistik"]
+    assert not stats.errors and set(stats.bands) == {"NBR", "NDVI", "NDMI"}
+
+
+def test_unrecorded_request_raises(tmp_path):
+    with use_cassette(sc.KARABUK_CASSETTE):
+        with pytest.raises(CassetteMiss):
+            client.get_info(ee.Number(41).add(1))
@@ -0,0 +1,119 @@
+"""`gee.change`: aralık indeksi + LUT sınıflandırıcısı ve eski maske-topla yöntemi."""
+
+from __future__ import annotations
+
+import json
+import re
+
+import numpy as np
+import pytest
+
+from gee.change import (
+    SEVERITY_SCHEMES,
+    SeverityScheme,
+    _scheme_expression,
+    classify_array,
+    classify_array_multi,
+    classify_image,
+    classify_metric,
+    diff_arrays,
+)
+
+
+def masks_and_add(x: np.ndarray, scheme: SeverityScheme) -> np.ndarray:
+    """Eski yaklaşım: her aralık için boolean maske, kodla çarp, topla."""
+    edges = (-np.inf,) + tuple(scheme.thresholds) + (np.inf,)
+    out = np.zeros(x.shape, dtype=np.int64)
+    for code, lo, hi in zip(scheme.codes, edges[:-1], edges[1:]):
+        out += ((x >= lo) & (x < hi)) * code
+    return out.astype(np.uint8)
+
+
+@pytest.fixture
+def metric():
+    rng = np.random.default_rng(29)
+    x = rng.uniform(-0.5, 1.5, (128, 96)).astype(np.float32)
+    # Eşiklerin tam üstündeki değerler üst aralığa düşer
+    flat = x.reshape(-1)
+    for i, t in enumerate(sorted({t for s in SEVERITY_SCHEMES.values() for t in s.thresholds})):
+        flat[i] = np.float32(t)
+    return x
+
+
+@pytest.mark.parametrize("name", sorted(SEVERITY_SCHEMES))
+def test_lut_matches_masks(metric, name):
+    scheme = SEVERITY_SCHEMES[name]
+    got = classify_array(metric, name)
+    assert got.dtype == np.uint8
+    np.testing.assert_array_equal(got, masks_and_add(metric, scheme))
+
+
+def test_many_thresholds_use_digitize_path():
+    scheme = SeverityScheme("fine", tuple(np.round(np.linspace(-0.4, 1.2, 12), 3)), tuple(range(13)))
+    x = np.random.default_rng(3).uniform(-1, 2, 5000)
+    x[:12] = scheme.thresholds
+    np.testing.assert_array_equal(classify_array(x, scheme), masks_and_add(x, scheme))
+
+
+def test_nan_is_nodata(metric):
+    metric[3, 3] = np.nan
+    assert classify_array(metric, "RBR")[3, 3] == 255
+    assert classify_array(metric, "RBR", nodata=254)[3, 3] == 254
+    multi = classify_array_multi(metric, ("RBR", "dNBR_USGS"))
+    assert multi["RBR"][3, 3] == multi["dNBR_USGS"][3, 3] == 255
+
+
+def test_integer_metric():
+    scheme = SeverityScheme("int", (10, 20), (0, 1, 2))
+    x = np.array([5, 10, 19, 20, 300], dtype=np.int16)
+    np.testing.assert_array_equal(classify_array(x, scheme), [0, 1, 1, 2, 2])
+
+
+def test_multi_matches_single(metric):
+    multi = classify_array_multi(metric, ("RBR", "dNBR_USGS"))
+    for name, cls in multi.items():
+        np.testing.assert_array_equal(cls, classify_array(metric, name))
+
+
+def test_scheme_validation():
+    with pytest.raises(ValueError):
+        SeverityScheme("bad", (0.1, 0.2), (0, 1))
+    with pytest.raises(ValueError):
+        SeverityScheme("bad", (0.3, 0.2), (0, 1, 2))
+    with pytest.raises(KeyError):
+        classify_array(np.zeros(2), "nope")
+
+
+def test_diff_arrays():
+    pre = {"NBR": np.array([0.6, 0.5, np.nan], dtype=np.float32), "NDVI": np.array([0.7, 0.7, 0.7], dtype=np.float32)}
+    post = {"NBR": np.array([0.1, 0.5, 0.2], dtype=np.float32), "NDVI": np.array([0.2, 0.8, 0.7], dtype=np.float32)}
+    out = diff_arrays(pre["NBR"], post["NBR"], pre["NDVI"], post["NDVI"])
+    np.testing.assert_allclose(out["dNBR"][:2], [0.5, 0.0], atol=1e-6)
+    np.testing.assert_allclose(out["dNDVI"], [-0.5, 0.1, 0.0], atol=1e-6)
+    np.testing.assert_allclose(out["RBR"][0], 0.5 / 1.601, rtol=1e-5)
+    assert np.isnan(out["dNBR"][2]) and np.isnan(out["RBR"][2])
+
+
+def _ternary(expr: str, x: float) -> int:
+    """`_scheme_expression` çıktısını ("x < t ? c : (...)") Python'da değerlendirir."""
+    m = re.fullmatch(r"x < (\S+) \? (\d+) : \((.*)\)", expr)
+    if m is None:
+        return int(expr)
+    return int(m.group(2)) if x < float(m.group(1)) else _ternary(m.group(3), x)
+
+
+def test_ee_expression_matches_lut(ee_offline):
+    ee = ee_offline
+    for scheme in SEVERITY_SCHEMES.values():
+        expr = _scheme_expression(scheme)
+        text = classify_image(ee.Image(0), scheme).serialize()
+        assert json.dumps(expr)[1:-1] in text and "Image.toUint8" in text
+        xs = np.array([-1.0, *scheme.thresholds, *(np.array(scheme.thresholds) - 1e-6), 5.0])
+        assert [_ternary(expr, v) for v in xs] == classify_array(xs, scheme).tolist()
+
+
+def test_classify_metric_custom_thresholds_keep_codes(ee_offline):
+    ee = ee_offline
+    usgs = SEVERITY_SCHEMES["dNBR_USGS"]
+    text = classify_metric(ee.Image(0), usgs.thresholds, usgs.codes).serialize()
+    assert json.dumps(_scheme_expression(SeverityScheme("custom", usgs.thresholds, usgs.codes)))[1:-1] in text
@@ -0,0 +1,127 @@
+"""`gee.indices`: kayıttaki ifadelerin NumPy ve EE derlemeleri."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from gee.indices import (
+    EPS,
+    SpectralIndex,
+    available_indices,
+    compute_indices,
+    ee_index,
+    get_index,
+    numpy_kernel,
+    register_index,
+    required_bands,
+    with_indices,
+)
+
+BANDS = ("B3", "B4", "B8", "B8A", "B11", "B12")
+
+
+@pytest.fixture
+def bands():
+    rng = np.random.default_rng(26)
+    # Sentinel-2 SR DN (ölçek 1e-4) ve birkaç sıfır piksel
+    out = {b: rng.integers(0, 6000, (32, 32)).astype(np.uint16) for b in BANDS}
+    for b in BANDS:
+        out[b][0, :4] = 0
+    return out
+
+
+def _nd(a, b):
+    a = a.astype(np.float64) * 1e-4
+    b = b.astype(np.float64) * 1e-4
+    return (a - b) / (a + b + EPS)
+
+
+# Kayıttan bağımsız, elle yazılmış formüller
+REFERENCE = {
+    "NDVI": lambda d: _nd(d["B8"], d["B4"]),
+    "NBR": lambda d: _nd(d["B8"], d["B12"]),
+    "NBR2": lambda d: _nd(d["B11"], d["B12"]),
+    "NDMI": lambda d: _nd(d["B8A"], d["B11"]),
+    "NDWI": lambda d: _nd(d["B3"], d["B8"]),
+    "MNDWI": lambda d: _nd(d["B3"], d["B11"]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REFERENCE))
+def test_normalized_difference_kernels(bands, name):
+    got = numpy_kernel(name)(**{b: bands[b] for b in get_index(name).bands.values()})
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, REFERENCE[name](bands), atol=1e-6)
+    # Sıfır bantlarda EPS payda sıfırını önler
+    assert np.isfinite(got).all()
+
+
+def test_bai_and_msavi_kernels(bands):
+    red = bands["B4"].astype(np.float64) * 1e-4
+    nir = bands["B8"].astype(np.float64) * 1e-4
+    bai = 1 / ((0.1 - red) ** 2 + (0.06 - nir) ** 2 + EPS)
+    msavi = (2 * nir + 1 - np.sqrt(np.abs((2 * nir + 1) ** 2 - 8 * (nir - red)))) / 2
+    np.testing.assert_allclose(numpy_kernel("BAI")(B4=bands["B4"], B8=bands["B8"]), bai, rtol=1e-5)
+    np.testing.assert_allclose(numpy_kernel("MSAVI")(B4=bands["B4"], B8=bands["B8"]), msavi, atol=1e-6)
+
+
+def test_compute_indices_matches_kernels(bands):
+    out = compute_indices(bands, available_indices())
+    assert set(out) == set(available_indices())
+    for name, values in out.items():
+        need = {b: bands[b] for b in get_index(name).bands.values()}
+        np.testing.assert_array_equal(values, numpy_kernel(name)(**need))
+
+
+def test_reflectance_inputs_with_unit_scale(bands):
+    refl = {b: bands[b] * 1e-4 for b in BANDS}
+    np.testing.assert_allclose(
+        compute_indices(refl, ["NBR"], scale=1.0)["NBR"],
+        compute_indices(bands, ["NBR"])["NBR"],
+        atol=1e-6,
+    )
+
+
+def test_missing_band_is_reported():
+    with pytest.raises(KeyError, match="B12"):
+        numpy_kernel("NBR")(B8=np.ones(3))
+
+
+def test_required_bands_deduplicates():
+    assert required_bands(["NDVI", "NBR", "NDMI"]) == ["B8", "B4", "B12", "B8A", "B11"]
+
+
+def test_register_index_refuses_silent_overwrite():
+    with pytest.raises(ValueError):
+        register_index(get_index("NDVI"))
+    idx = SpectralIndex("_TEST_SR", "NIR / (RED + EPS)", {"NIR": "B8", "RED": "B4"})
+    try:
+        register_index(idx)
+        first = numpy_kernel("_TEST_SR")
+        register_index(SpectralIndex("_TEST_SR", "NIR - RED", idx.bands), overwrite=True)
+        # Derleme önbelleği yeniden kayıtta geçersiz kılınır
+        assert numpy_kernel("_TEST_SR") is not first
+        np.testing.assert_allclose(numpy_kernel("_TEST_SR")(B8=np.array([3.0]), B4=np.array([1.0]), scale=1.0), [2.0])
+    finally:
+        from gee import indices
+
+        indices._REGISTRY.pop("_TEST_SR", None)
+        indices._KERNELS.pop("_TEST_SR", None)
+
+
+def test_ee_index_graph(ee_offline):
+    ee = ee_offline
+    img = ee.Image("COPERNICUS/S2_SR_HARMONIZED/20210801T083601_20210801T084539_T36TVK")
+    graph = json.loads(ee_index(img, "NBR").serialize())
+    text = json.dumps(graph)
+    assert "Image.parseExpression" in text
+    assert json.dumps(get_index("NBR").expression) in text
+    assert '"B8"' in text and '"B12"' in text
+    assert '"NBR"' in text  # rename
+
+    names = json.dumps(json.loads(with_indices(img, ["NDVI", "NDMI"]).serialize()))
+    assert "Image.addBands" in names and '"NDVI"' in names and '"NDMI"' in names
+    assert with_indices(img, []) is img
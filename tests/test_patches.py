@@ -0,0 +1,187 @@
+"""`gee.patches`: karo karo etiketleme / birleştirme ve küçük yama filtreleri."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from gee.patches import EE_MAX_PATCH_PIXELS, filter_small_patches, filter_small_patches_ee, label_patches
+from gee.raster import load_raster, save_raster
+
+
+def burned_scene(shape=(150, 170), seed=30) -> np.ndarray:
+    """Karo sınırlarını geçen, içi boş ve yalnızca köşeden bağlı yamalar içeren sahne."""
+    rng = np.random.default_rng(seed)
+    x = (rng.random(shape) < 0.08).astype(np.float32)
+    x[10:90, 20:26] = 1          # dikey şerit, yatay dikişleri geçer
+    x[60:64, 5:160] = 1          # yatay şerit, dikey dikişleri geçer
+    x[100:140, 100:140] = 1      # halka (iç boşluk)
+    x[110:130, 110:130] = 0
+    x[31, 31] = x[32, 32] = 1    # yalnızca köşeden bağlı çift (dikiş üzerinde)
+    x[31, 32] = x[32, 31] = 0
+    x[0, :] = np.nan
+    return x
+
+
+def _global_components(x: np.ndarray, eight_connected: bool) -> tuple:
+    structure = ndimage.generate_binary_structure(2, 2 if eight_connected else 1)
+    with np.errstate(invalid="ignore"):
+        return ndimage.label(x > 0, structure=structure)
+
+
+def _same_partition(a: np.ndarray, b: np.ndarray) -> bool:
+    """İki etiket dizisi aynı bileşenleri (etiket numaralarından bağımsız) tanımlıyor mu?"""
+    if not np.array_equal(a > 0, b > 0):
+        return False
+    pairs = np.unique(np.stack([a[a > 0], b[b > 0]]), axis=1)
+    return len(np.unique(pairs[0])) == len(np.unique(pairs[1])) == pairs.shape[1]
+
+
+@pytest.mark.parametrize("eight_connected", [True, False])
+@pytest.mark.parametrize("window", [32, 64, 1024])
+def test_tiled_labels_match_global_label(tmp_path, window, eight_connected):
+    x = burned_scene()
+    ref, n = _global_components(x, eight_connected)
+    patches = label_patches(x, str(tmp_path / "labels"), window=window, eight_connected=eight_connected, workers=1)
+
+    roots = patches.read((slice(None), slice(None)))
+    assert _same_partition(roots, ref)
+    assert len(patches.patch_ids) == n
+    # Kök başına piksel sayısı, global etiket boyutlarıyla aynı küme
+    sizes = np.bincount(ref.ravel())[1:]
+    assert sorted(patches.pixel_count[patches.patch_ids]) == sorted(sizes)
+    np.testing.assert_allclose(patches.area_ha[patches.patch_ids].sum(), (ref > 0).sum() * 0.01)
+
+
+def test_label_from_saved_raster(tmp_path):
+    x = burned_scene()
+    path = save_raster(str(tmp_path / "sev"), x, product="severity")
+    patches = label_patches(path, str(tmp_path / "labels"), window=48, workers=2)
+    ref, _ = _global_components(x, True)
+    assert _same_partition(patches.read((slice(None), slice(None))), ref)
+
+
+def test_filter_small_patches_matches_global_sizes(tmp_path):
+    x = burned_scene()
+    ref, _ = _global_components(x, True)
+    sizes = np.bincount(ref.ravel())
+    min_patch_ha = 0.5  # 50 piksel
+    out_path, patches = filter_small_patches(x, min_patch_ha, str(tmp_path), window=40, workers=1)
+
+    mask = load_raster(out_path).codes
+    keep = sizes * patches.pixel_area_ha >= min_patch_ha
+    keep[0] = False
+    expected = keep[ref].astype(np.uint8)
+    expected[np.isnan(x)] = 255
+    np.testing.assert_array_equal(mask, expected)
+    assert json.load(open(str(tmp_path / "burned.json")))["min_patch_ha"] == min_patch_ha
+
+
+# ---- Sunucu tarafı filtre: ifade grafiğinin yerel değerlendirmesi ----
+
+PIXEL_M = 10.0
+
+
+def _binary(fn):
+    def op(image1, image2):
+        v1, m1 = image1
+        v2, m2 = image2
+        return fn(v1, v2), m1 & m2
+    return op
+
+
+def _connected_pixel_count(input, maxSize, eightConnected=True):
+    v, m = input
+    structure = ndimage.generate_binary_structure(2, 2 if eightConnected else 1)
+    labels, _ = ndimage.label(m, structure=structure)
+    count = np.minimum(np.bincount(labels.ravel())[labels], maxSize).astype(float)
+    return count, m.copy()
+
+
+def _const(shape):
+    return lambda value: (np.full(shape, float(value)), np.ones(shape, dtype=bool))
+
+
+def evaluate(image, inputs: dict) -> tuple:
+    """`filter_small_patches_ee` grafiğinin kullandığı işlevleri NumPy ile değerlendirir.
+
+    Görüntüler (değer, geçerlilik maskesi) çiftidir; `ee.Image(<kimlik>)`
+    girdileri `inputs`'tan okunur, piksel alanı `PIXEL_M` karesidir.
+    """
+    doc = json.loads(image.serialize())
+    shape = next(iter(inputs.values())).shape
+    ops = {
+        "Image.load": lambda id, **_: (inputs[id].astype(float), np.ones(shape, dtype=bool)),
+        "Image.constant": _const(shape),
+        "Image.pixelArea": lambda: (np.full(shape, PIXEL_M * PIXEL_M), np.ones(shape, dtype=bool)),
+        "Image.gt": _binary(lambda a, b: (a > b).astype(float)),
+        "Image.gte": _binary(lambda a, b: (a >= b).astype(float)),
+        "Image.and": _binary(lambda a, b: ((a != 0) & (b != 0)).astype(float)),
+        "Image.or": _binary(lambda a, b: ((a != 0) | (b != 0)).astype(float)),
+        "Image.multiply": _binary(np.multiply),
+        "Image.divide": _binary(np.divide),
+        "Image.selfMask": lambda image: (image[0], image[1] & (image[0] != 0)),
+        "Image.unmask": lambda input, value: (np.where(input[1], input[0], value[0]), np.ones(shape, dtype=bool)),
+        "Image.connectedPixelCount": _connected_pixel_count,
+        "Image.rename": lambda input, names: input,
+    }
+    memo = {}
+
+    def ev(node):
+        if "valueReference" in node:
+            ref = node["valueReference"]
+            if ref not in memo:
+                memo[ref] = ev(doc["values"][ref])
+            return memo[ref]
+        if "constantValue" in node:
+            return node["constantValue"]
+        if "arrayValue" in node:
+            return [ev(v) for v in node["arrayValue"]["values"]]
+        call = node["functionInvocationValue"]
+        args = {k: ev(v) for k, v in call["arguments"].items()}
+        return ops[call["functionName"]](**args)
+
+    return ev({"valueReference": doc["result"]})
+
+
+@pytest.fixture
+def ee_patches(ee_offline):
+    # 0.01 ha piksellerle: 2500 (25 ha), 600 (6 ha) ve 400 piksellik (4 ha) yamalar
+    x = np.zeros((120, 140), dtype=np.uint8)
+    x[0:50, 0:50] = 1
+    x[70:90, 0:30] = 1
+    x[100:120, 60:80] = 1
+    return ee_offline, x
+
+
+def _kept_patches(keep: np.ndarray, x: np.ndarray) -> list:
+    labels, n = ndimage.label(x > 0)
+    return [int((labels == i).sum()) for i in range(1, n + 1) if keep[labels == i].all()]
+
+
+def test_ee_filter_drops_small_patches(ee_patches):
+    ee, x = ee_patches
+    out, valid = evaluate(filter_small_patches_ee(ee.Image("burned"), 5, scale=PIXEL_M), {"burned": x})
+    assert valid.all()
+    assert sorted(_kept_patches(out, x)) == [600, 2500]
+    assert out[x == 0].sum() == 0
+
+
+def test_ee_filter_keeps_patches_at_the_count_cap(ee_patches):
+    ee, x = ee_patches
+    # 20 ha = 2000 piksel > 1024: sayım sınırda kesilir, büyük yama yine de korunur
+    with pytest.warns(UserWarning, match=str(EE_MAX_PATCH_PIXELS)):
+        image = filter_small_patches_ee(ee.Image("burned"), 20, scale=PIXEL_M)
+    assert f'"maxSize": {{"constantValue": {EE_MAX_PATCH_PIXELS}}}' in image.serialize()
+    out, _ = evaluate(image, {"burned": x})
+    assert _kept_patches(out, x) == [2500]
+
+
+def test_ee_filter_no_warning_below_cap(ee_patches, recwarn):
+    ee, _ = ee_patches
+    image = filter_small_patches_ee(ee.Image("burned"), 5, scale=PIXEL_M)
+    assert '"maxSize": {"constantValue": 501}' in image.serialize()
+    assert not [w for w in recwarn if issubclass(w.category, UserWarning)]
@@ -0,0 +1,103 @@
+"""`gee.polygonize`: akışlı yama poligonları, özellik sayıları ve GPKG/GeoJSON çıktısı."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+pytest.importorskip("rasterio")
+shapely = pytest.importorskip("shapely")
+
+from gee.patches import label_patches  # noqa: E402
+from gee.polygonize import GPKG_SCHEMA, feature_schema, iter_patch_features, polygonize_patches  # noqa: E402
+from gee.raster import save_raster  # noqa: E402
+
+# 10 m pikseller, UTM 36N
+TRANSFORM = (500000.0, 10.0, 0.0, 4550000.0, 0.0, -10.0)
+CRS = "EPSG:32636"
+
+
+@pytest.fixture
+def scene():
+    """Şiddet sınıfları (0..4), dNBR ve global 8-bağlantılı etiketler."""
+    rng = np.random.default_rng(31)
+    sev = np.zeros((90, 110), dtype=np.float32)
+    sev[5:70, 10:16] = 3                      # karo dikişlerini geçen şerit
+    sev[40:44, 2:100] = 2
+    sev[60:85, 60:95] = 4                     # halka
+    sev[66:79, 68:87] = 0
+    sev[20, 80] = sev[21, 81] = 1             # köşeden bağlı çift
+    sev[(rng.random(sev.shape) < 0.01) & (sev == 0)] = 1
+    dnbr = np.where(sev > 0, 0.1 + 0.15 * sev, 0.0).astype(np.float32)
+    labels, n = ndimage.label(sev > 0, structure=np.ones((3, 3)))
+    return sev, dnbr, labels, n
+
+
+def test_one_feature_per_patch(tmp_path, scene):
+    sev, dnbr, labels, n = scene
+    patches = label_patches(sev, str(tmp_path / "labels"), window=32, workers=1)
+    feats = list(iter_patch_features(sev, patches, dnbr=dnbr, transform=TRANSFORM))
+    assert len(feats) == n
+    assert len({f["properties"]["patch_id"] for f in feats}) == n
+
+    sizes = np.bincount(labels.ravel())[1:]
+    assert sorted(f["properties"]["pixel_count"] for f in feats) == sorted(sizes)
+    for f in feats:
+        p = f["properties"]
+        geom = shapely.geometry.shape(f["geometry"])
+        # Karo parçaları birleşmiş: geometri alanı = piksel sayısı x 100 m²
+        assert geom.area == pytest.approx(p["pixel_count"] * 100.0)
+        assert p["area_ha"] == pytest.approx(p["pixel_count"] * 0.01)
+        assert p["severity"] in (1, 2, 3, 4)
+        assert p["mean_dNBR"] == pytest.approx(0.1 + 0.15 * p["severity"], abs=0.15)
+
+    # Halkanın iç boşluğu korunur
+    ring = shapely.geometry.shape(next(f for f in feats if f["properties"]["severity"] == 4)["geometry"])
+    assert any(len(p.interiors) for p in shapely.get_parts(ring))
+
+
+def test_min_patch_ha_filters_features(tmp_path, scene):
+    sev, _, labels, _ = scene
+    sizes = np.bincount(labels.ravel())[1:]
+    patches = label_patches(sev, str(tmp_path / "labels"), window=32, workers=1)
+    feats = list(iter_patch_features(sev, patches, transform=TRANSFORM, min_patch_ha=1.0))
+    assert sorted(f["properties"]["pixel_count"] for f in feats) == sorted(s for s in sizes if s >= 100)
+    assert all(f["properties"]["mean_dNBR"] is None for f in feats)
+
+
+@pytest.mark.parametrize("ext", ["geojson", "gpkg"])
+def test_polygonize_writes_every_patch(tmp_path, scene, ext):
+    if ext == "gpkg":
+        pytest.importorskip("fiona")
+    sev, dnbr, _, n = scene
+    src = save_raster(str(tmp_path / "severity"), sev, product="severity", meta={"transform": TRANSFORM, "crs": CRS})
+    out = str(tmp_path / f"patches.{ext}")
+    assert polygonize_patches(src, out, dnbr=dnbr, window=40, workers=1) == n
+
+    if ext == "geojson":
+        with open(out, encoding="utf-8") as f:
+            doc = json.load(f)
+        assert doc["crs"]["properties"]["name"] == CRS
+        feats = doc["features"]
+    else:
+        import fiona
+
+        with fiona.open(out) as layer:
+            assert dict(layer.schema["properties"]).keys() == GPKG_SCHEMA["properties"].keys()
+            assert layer.crs.to_epsg() == 32636
+            feats = [{"properties": dict(f["properties"])} for f in layer]
+    assert len({f["properties"]["patch_id"] for f in feats}) == n
+    assert sum(f["properties"]["pixel_count"] for f in feats) == int((sev > 0).sum())
+
+
+def test_feature_schema_types():
+    feat = {"properties": {"a": True, "b": 3, "c": 0.5, "d": "x", "e": None, "f": [1]}}
+    assert feature_schema(feat) == {
+        "geometry": "MultiPolygon",
+        "properties": {"a": "bool", "b": "int", "c": "float", "d": "str", "e": "str", "f": "str"},
+    }
+    # Açık tipler değer tipinden önce gelir (None değerli float alan)
+    assert feature_schema({"properties": {"mean_dNBR": None}}, {"mean_dNBR": "float"})["properties"] == {"mean_dNBR": "float"}
@@ -0,0 +1,129 @@
+"""`gee.raster`: ölçeklenmiş tamsayı kodlaması ve disk gidiş-dönüşleri."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from gee.raster import (
+    ENCODINGS,
+    Encoding,
+    ScaledRaster,
+    create_raster,
+    encoding_for,
+    iter_windows,
+    load_raster,
+    map_windows,
+    raster_meta,
+    read_window,
+    save_raster,
+)
+
+# Ürün başına örnek değer aralığı (kodlamanın hedeflediği fiziksel aralık)
+RANGES = {
+    "NDVI": (-1, 1),
+    "dNBR": (-2, 2),
+    "RdNBR": (-30, 30),
+    "mk_Z": (-30, 30),
+    "mk_p": (0, 1),
+    "sen_slope": (-0.2, 0.2),
+}
+
+
+@pytest.mark.parametrize("product", sorted(RANGES))
+def test_round_trip_within_half_step(product):
+    enc = encoding_for(product)
+    rng = np.random.default_rng(27)
+    x = rng.uniform(*RANGES[product], 10000)
+    back = enc.decode(enc.encode(x), "float64")
+    assert np.abs(back - x).max() <= enc.scale / 2 + 1e-9
+
+
+def test_nan_maps_to_nodata_and_back():
+    enc = encoding_for("NBR")
+    x = np.array([0.25, np.nan, -0.5, np.inf, -np.inf])
+    codes = enc.encode(x)
+    assert codes.dtype == np.int16
+    assert codes[1] == codes[3] == codes[4] == enc.nodata
+    back = enc.decode(codes)
+    assert np.isnan(back[[1, 3, 4]]).all()
+    np.testing.assert_allclose(back[[0, 2]], [0.25, -0.5])
+
+
+def test_out_of_range_is_clipped_not_wrapped():
+    enc = Encoding("int16", scale=1e-4, nodata=-32768)
+    lo, hi = enc.valid_range
+    assert (lo, hi) == (-32767, 32767)
+    codes = enc.encode(np.array([10.0, -10.0]))
+    np.testing.assert_array_equal(codes, [hi, lo])
+    # Kırpılan değer nodata ile karışmaz
+    assert not np.isnan(enc.decode(codes)).any()
+
+
+def test_uint8_classes_are_exact():
+    enc = encoding_for("severity")
+    x = np.array([0, 1, 2, 3, 4, np.nan])
+    codes = enc.encode(x)
+    assert codes.dtype == np.uint8
+    np.testing.assert_array_equal(codes, [0, 1, 2, 3, 4, 255])
+    np.testing.assert_array_equal(enc.decode(codes)[:5], x[:5])
+
+
+def test_offset_encoding():
+    enc = Encoding("uint16", scale=0.5, offset=100.0, nodata=65535)
+    x = np.array([100.0, 150.5, 200.0])
+    np.testing.assert_allclose(enc.decode(enc.encode(x)), x)
+
+
+def test_every_product_encoding_is_consistent():
+    for product, enc in ENCODINGS.items():
+        info = np.iinfo(enc.dtype)
+        assert info.min <= enc.nodata <= info.max, product
+        lo, hi = enc.valid_range
+        assert not lo <= enc.nodata <= hi, product
+
+
+def test_scaled_raster_decodes_in_numpy_ops():
+    x = np.linspace(-1, 1, 12, dtype=np.float32).reshape(3, 4)
+    r = ScaledRaster.from_float(x, "NDVI")
+    assert r.nbytes == x.nbytes // 2
+    np.testing.assert_allclose(np.asarray(r), x, atol=5e-5)
+    np.testing.assert_allclose(r * 2, x * 2, atol=1e-4)
+    np.testing.assert_allclose(np.asarray(r[1:, 2:]), x[1:, 2:], atol=5e-5)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(1)
+    x = rng.uniform(-1, 1, (64, 48)).astype(np.float32)
+    x[5, 5] = np.nan
+    path = save_raster(str(tmp_path / "dnbr"), x, product="dNBR", meta={"crs": "EPSG:32636"})
+    assert path.endswith(".npy")
+    meta = raster_meta(path)
+    assert meta["product"] == "dNBR" and meta["crs"] == "EPSG:32636"
+
+    r = load_raster(path)
+    assert isinstance(r.codes, np.memmap)
+    back = r.decode()
+    assert np.isnan(back[5, 5])
+    np.testing.assert_allclose(back, x, atol=5e-5, equal_nan=True)
+
+    win = (slice(10, 20), slice(30, 48))
+    np.testing.assert_allclose(read_window(path, win), x[win], atol=5e-5)
+
+
+def test_create_raster_starts_as_nodata(tmp_path):
+    out = create_raster(str(tmp_path / "sev.npy"), (8, 8), product="severity")
+    assert (np.asarray(out) == 255).all()
+    assert np.isnan(load_raster(str(tmp_path / "sev.npy")).decode()).all()
+
+
+def test_windows_cover_the_raster_once():
+    shape = (3, 70, 45)
+    seen = np.zeros(shape[-2:], dtype=int)
+    for w in iter_windows(shape, 32):
+        assert w[0] == slice(None)
+        seen[w[1:]] += 1
+    assert (seen == 1).all()
+    assert map_windows(lambda w: w[1].start, iter_windows(shape, 32), workers=2, processes=False) == [
+        w[1].start for w in iter_windows(shape, 32)
+    ]
@@ -0,0 +1,111 @@
+"""`gee.results.ResultStore`: son yazılan değer, ilk görülme sırası ve Parquet parçaları."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from gee.results import COLUMNS, ResultStore
+
+pytest.importorskip("pyarrow")
+
+
+def _store(root=None, run="r1") -> ResultStore:
+    store = ResultStore(root, run=run)
+    store.append("orman", "Karabük", {"toplam_alan": 100.0, "yangin_kaybi": 5.0}, year=2020)
+    store.append("orman", "Bartın", {"toplam_alan": 80.0, "yangin_kaybi": 1.0}, year=2020)
+    store.append("orman", "Karabük", {"toplam_alan": 99.0, "yangin_kaybi": 2.0}, year=2021)
+    store.append("maden", "Karabük", {"aktif_maden": 12, "tur": ["Demir", "Manganez"]})
+    return store
+
+
+def test_last_write_wins_in_first_seen_position():
+    store = _store()
+    wide_before = store.wide("orman")
+    store.append("orman", "Karabük", {"yangin_kaybi": 7.5}, year=2020)
+    df = store.frame("orman")
+    assert list(zip(df["province"], df["year"], df["metric"])) == [
+        ("Karabük", 2020, "toplam_alan"),
+        ("Karabük", 2020, "yangin_kaybi"),
+        ("Bartın", 2020, "toplam_alan"),
+        ("Bartın", 2020, "yangin_kaybi"),
+        ("Karabük", 2021, "toplam_alan"),
+        ("Karabük", 2021, "yangin_kaybi"),
+    ]
+    assert df.loc[1, "value"] == 7.5
+    assert len(store.frame("orman", latest=False)) == 7
+
+    wide = store.wide("orman")
+    assert list(wide.columns) == ["province", "year", "toplam_alan", "yangin_kaybi"]
+    # Güncelleme satır / sütun sırasını değiştirmez (iller ilk görülme sırasında)
+    pd.testing.assert_frame_equal(wide[["province", "year"]], wide_before[["province", "year"]])
+    assert list(wide["province"]) == ["Karabük", "Karabük", "Bartın"]
+    assert wide.loc[0, "yangin_kaybi"] == 7.5
+
+
+def test_repeated_rewrites_keep_latest_value():
+    store = ResultStore(run="r")
+    for v in range(5):
+        store.append("nbr", "Zonguldak", {"delta_nbr": float(v), "yangin_siddeti": f"s{v}"}, year=2022)
+        store.frame()  # ara okumalar önbelleği doldurur; sonraki yazma geçersiz kılmalı
+    assert store.nested("nbr") == {"Zonguldak": {2022: {"delta_nbr": 4.0, "yangin_siddeti": "s4"}}}
+
+
+def test_text_and_list_values():
+    store = _store()
+    assert store.nested("maden") == {"Karabük": {"aktif_maden": 12.0, "tur": ["Demir", "Manganez"]}}
+    wide = store.wide("maden", index=("province",))
+    assert wide.loc[0, "tur"] == "Demir, Manganez"
+
+
+def test_later_parts_override_earlier_ones(tmp_path):
+    root = str(tmp_path / "store")
+    first = _store(root, run="r1")
+    assert first.flush() is not None
+    assert first.flush() is None  # kaydedilmemiş satır yok
+
+    second = ResultStore(root, run="r2")
+    second.append("orman", "Bartın", {"yangin_kaybi": 3.0}, year=2020)
+    second.flush()
+
+    reloaded = ResultStore(root)
+    df = reloaded.frame("orman")
+    row = df[(df["province"] == "Bartın") & (df["year"] == 2020) & (df["metric"] == "yangin_kaybi")]
+    assert row["value"].tolist() == [3.0] and row["run"].tolist() == ["r2"]
+    # Güncellenen satır, ilk parçadaki yerinde kalır
+    assert df["province"].tolist()[:4] == ["Karabük", "Karabük", "Bartın", "Bartın"]
+    assert df["metric"].tolist()[3] == "yangin_kaybi"
+
+    before = reloaded.frame()
+    reloaded.compact()
+    assert len(list((tmp_path / "store").glob("part-*.parquet"))) == 1
+    pd.testing.assert_frame_equal(ResultStore(root).frame(), before)
+
+
+def test_append_frame_after_pending_appends():
+    store = _store()
+    store.append_frame(pd.DataFrame({
+        "dataset": ["orman"] * 2,
+        "province": ["Bartın"] * 2,
+        "year": [2021, 2020],
+        "metric": ["yangin_kaybi", "yangin_kaybi"],
+        "value": [4.0, 9.0],
+    }))
+    store.append("orman", "Bartın", {"yangin_kaybi": 6.0}, year=2021)
+    df = store.frame()
+    assert list(df.columns) == list(COLUMNS)
+    # Yazma sırası: append (1.0) < append_frame (9.0); append_frame (4.0) < append (6.0)
+    agg = store.aggregate("orman", ["yangin_kaybi"])
+    assert agg.loc["Bartın", "yangin_kaybi"] == 15.0
+    assert agg.loc["Karabük", "yangin_kaybi"] == 7.0
+
+
+def test_append_frame_requires_key_columns():
+    with pytest.raises(ValueError):
+        ResultStore().append_frame(pd.DataFrame({"dataset": ["x"]}))
+
+
+def test_drop_dataset():
+    store = _store()
+    store.drop("maden")
+    assert store.datasets() == ["orman"]
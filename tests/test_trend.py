@@ -0,0 +1,139 @@
+"""`gee.trend`: Mann-Kendall / Sen's slope, pymannkendall ve kaba kuvvet karşılaştırmaları."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from gee.raster import load_raster, save_raster
+from gee.trend import (
+    SEN_DIRECT_MAX,
+    mann_kendall_batch,
+    mann_kendall_stack,
+    norm_sf,
+    sens_slope,
+    sens_slope_batch,
+    trend_local,
+)
+
+pmk = pytest.importorskip("pymannkendall")
+
+TREND = {"increasing": 1, "decreasing": -1, "no trend": 0}
+
+
+def brute_sens(y: np.ndarray, t: np.ndarray) -> float:
+    """Tüm ikili eğimlerin medyanı (NaN ve aynı zamanlı çiftler hariç)."""
+    ok = np.isfinite(y)
+    y, t = y[ok], t[ok]
+    i, j = np.triu_indices(len(y), 1)
+    keep = t[i] != t[j]
+    return float(np.median((y[j] - y[i])[keep] / (t[j] - t[i])[keep]))
+
+
+def brute_s(y: np.ndarray) -> int:
+    i, j = np.triu_indices(len(y), 1)
+    d = np.sign(y[j] - y[i])
+    return int(np.nansum(d))
+
+
+@pytest.fixture
+def tied_series():
+    # Yuvarlanmış rastgele yürüyüşler: bol bağ (eşit değer)
+    rng = np.random.default_rng(35)
+    return np.round(rng.normal(0.2, 1, (40, 24)).cumsum(axis=1), 1)
+
+
+@pytest.mark.parametrize("method, reference", [("tie", "original_test"), ("yue_wang", "yue_wang_modification_test")])
+def test_matches_pymannkendall_with_ties(tied_series, method, reference):
+    res = mann_kendall_batch(tied_series, method=method)
+    ref = [getattr(pmk, reference)(x) for x in tied_series]
+    np.testing.assert_array_equal(res["S"], [r.s for r in ref])
+    np.testing.assert_allclose(res["var_S"], [r.var_s for r in ref], rtol=1e-9)
+    np.testing.assert_allclose(res["Z"], [r.z for r in ref], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(res["p"], [r.p for r in ref], atol=1e-6)
+    np.testing.assert_allclose(res["slope"], [r.slope for r in ref], rtol=1e-12)
+    np.testing.assert_array_equal(res["trend"], [TREND[r.trend] for r in ref])
+
+
+def test_hamed_rao_matches_pymannkendall():
+    # Sürekli değerler: trendden arındırılmış sıralarda kayan nokta bağı oluşmaz
+    rng = np.random.default_rng(36)
+    x = rng.normal(0.1, 1, (40, 25)).cumsum(axis=1)
+    res = mann_kendall_batch(x, method="hamed_rao")
+    ref = [pmk.hamed_rao_modification_test(s) for s in x]
+    ok = np.array([r.var_s > 0 for r in ref])
+    np.testing.assert_allclose(res["var_S"][ok], [r.var_s for r in ref if r.var_s > 0], rtol=1e-9)
+    np.testing.assert_allclose(res["p"][ok], [r.p for r in ref if r.var_s > 0], atol=1e-6)
+    assert (res["n_ns"] > 0).all()
+
+
+def test_original_variance_without_tie_correction():
+    y = np.array([1.0, 2.0, 2.0, 3.0, 5.0, 5.0, 4.0])
+    n = len(y)
+    res = mann_kendall_stack(y, method="original")
+    assert res["var_S"] == pytest.approx(n * (n - 1) * (2 * n + 5) / 18)
+    assert res["S"] == brute_s(y)
+
+
+def test_stack_with_nan_matches_per_series(tied_series):
+    x = tied_series.T.reshape(24, 5, 8).copy()
+    x[3, 0, 0] = x[10, 2, 5] = np.nan
+    res = mann_kendall_stack(x)
+    for r, c in [(0, 0), (2, 5), (4, 7)]:
+        y = x[:, r, c]
+        assert res["n"][r, c] == np.isfinite(y).sum()
+        assert res["S"][r, c] == brute_s(y)
+        assert res["slope"][r, c] == pytest.approx(brute_sens(y, np.arange(24.0)))
+
+
+def test_short_negatively_autocorrelated_series_keep_finite_variance():
+    x = np.array([[1.0, 3.0, 2.0, 4.0, 3.0, 5.0], [5.0, 1.0, 4.0, 2.0, 3.0, 0.0]])
+    for method in ("hamed_rao", "yue_wang"):
+        res = mann_kendall_batch(x, method=method)
+        assert np.isfinite(res["Z"]).all() and (res["var_S"] > 0).all()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_long_sens_slope_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(SEN_DIRECT_MAX + 1, 3 * SEN_DIRECT_MAX))
+    cases = {
+        "sırasız": rng.permutation(n).astype(float),
+        "tekrarlı": rng.integers(0, n // 4, n).astype(float),
+    }
+    for t in cases.values():
+        for y in (0.3 * t + rng.normal(0, 5, n), rng.integers(0, 4, n).astype(float)):
+            y[rng.integers(0, n, 3)] = np.nan
+            assert sens_slope(y, t) == pytest.approx(brute_sens(y, t))
+
+
+def test_sens_slope_dates_are_per_year():
+    times = np.array(["2020-01-01", "2021-01-01", "2022-01-01", "2023-01-01"], dtype="datetime64[D]")
+    assert sens_slope([1.0, 2.0, 3.0, 4.0], times) == pytest.approx(1.0, rel=2e-3)
+
+
+def test_sens_slope_batch_matches_brute_force(tied_series):
+    t = np.cumsum(np.random.default_rng(2).integers(1, 40, tied_series.shape[1])).astype(float)
+    got = sens_slope_batch(tied_series, t)
+    np.testing.assert_allclose(got, [brute_sens(y, t) for y in tied_series])
+
+
+def test_norm_sf_accuracy():
+    from statistics import NormalDist
+
+    z = np.linspace(-6, 6, 97)
+    ref = np.array([1 - NormalDist().cdf(v) for v in z])
+    np.testing.assert_allclose(norm_sf(z), ref, atol=2e-7)
+
+
+def test_trend_local_matches_stack(tmp_path):
+    rng = np.random.default_rng(5)
+    stack = (rng.normal(0, 0.05, (7, 40, 30)) + np.linspace(0, 0.3, 7)[:, None, None]).astype(np.float32)
+    stack[:, 0, 0] = np.nan
+    src = save_raster(str(tmp_path / "nbr_stack"), stack, product="NBR")
+    outputs = trend_local(src, str(tmp_path / "trend"), window=16, workers=1)
+
+    ref = mann_kendall_stack(load_raster(src).decode())
+    np.testing.assert_array_equal(load_raster(outputs["mk_S"]).decode()[1:], ref["S"][1:])
+    np.testing.assert_array_equal(load_raster(outputs["trend"]).decode()[1:], ref["trend"][1:])
+    np.testing.assert_allclose(load_raster(outputs["sen_slope"]).decode(), ref["slope"], atol=1e-6, equal_nan=True)
@@ -0,0 +1,92 @@
+"""`gee.vectors`: akışlı GeoJSON okuyucu ve geometri temizliği."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gee.vectors import iter_geojson_features, iter_vector_features
+
+
+def _features(n: int) -> list:
+    feats = []
+    for i in range(n):
+        ring = [[i + k * 1e-3, 40 + (k % 7) * 1e-3] for k in range(1 + (i * 37) % 400)] + [[i, 40]]
+        feats.append({
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [[[i, 40]] + ring]},
+            # Ayraç benzeri karakterler ve Türkçe metin tampon sınırlarında çözülmeli
+            "properties": {"id": i, "ad": 'Meşcere ]}{,\\" ' + str(i), "alan": i * 1.5, "etiket": None},
+        })
+    return feats
+
+
+def _write(path, doc, **dump):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, **dump)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 4096, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_stream_matches_json_load(tmp_path, chunk_size, indent):
+    feats = _features(60)
+    doc = {"type": "FeatureCollection", "name": "test", "crs": {"type": "name"}, "features": feats, "son": [1, 2]}
+    path = _write(tmp_path / "fc.geojson", doc, indent=indent)
+    assert list(iter_geojson_features(path, chunk_size=chunk_size)) == feats
+
+
+def test_features_key_after_other_members(tmp_path):
+    feats = _features(3)
+    # "features" başka bir üyenin içinde metin olarak geçse de gerçek dizi bulunur
+    doc = {"type": "FeatureCollection", "aciklama": "features listesi", "features": feats}
+    path = _write(tmp_path / "fc.geojson", doc)
+    assert list(iter_geojson_features(path, chunk_size=5)) == feats
+
+
+def test_empty_collection(tmp_path):
+    path = _write(tmp_path / "empty.geojson", {"type": "FeatureCollection", "features": []})
+    assert list(iter_geojson_features(path, chunk_size=3)) == []
+
+
+def test_single_feature_and_bare_geometry(tmp_path):
+    feat = _features(1)[0]
+    assert list(iter_geojson_features(_write(tmp_path / "f.geojson", feat))) == [feat]
+    geom = feat["geometry"]
+    assert list(iter_geojson_features(_write(tmp_path / "g.geojson", geom))) == [
+        {"type": "Feature", "geometry": geom, "properties": {}}
+    ]
+
+
+def test_truncated_file_raises(tmp_path):
+    path = _write(tmp_path / "fc.geojson", {"type": "FeatureCollection", "features": _features(5)})
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text[: len(text) // 2])
+    with pytest.raises(ValueError, match="beklenmedik"):
+        list(iter_geojson_features(path, chunk_size=16))
+
+
+def test_layer_cleans_invalid_and_empty_geometries(tmp_path):
+    shapely = pytest.importorskip("shapely")
+    from gee.vectors import VectorLayer, load_union
+
+    bowtie = {"type": "Polygon", "coordinates": [[[0, 0], [2, 2], [2, 0], [0, 2], [0, 0]]]}
+    square = {"type": "Polygon", "coordinates": [[[3, 0], [4, 0], [4, 1], [3, 1], [3, 0]]]}
+    feats = [
+        {"type": "Feature", "geometry": bowtie, "properties": {"k": 1}},
+        {"type": "Feature", "geometry": None, "properties": {"k": 2}},
+        {"type": "Feature", "geometry": square, "properties": {"k": 3}},
+    ]
+    path = _write(tmp_path / "layer.geojson", {"type": "FeatureCollection", "features": feats})
+
+    layer = VectorLayer.from_file(path)
+    assert [p["k"] for p in layer.props] == [1, 3]
+    assert all(g.is_valid for g in layer.geoms)
+    assert layer.geoms[0].area == pytest.approx(2.0)
+    assert list(layer.query(shapely.geometry.Point(3.5, 0.5))) == [1]
+    assert len(VectorLayer.from_file(path, where=lambda p: p["k"] == 3)) == 1
+    assert load_union(path).area == pytest.approx(3.0)
+    assert [f["properties"]["k"] for f in iter_vector_features(path)] == [1, 2, 3]